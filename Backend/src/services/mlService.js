@@ -17,6 +17,14 @@ const mlClient = axios.create({
   }
 })
 
+// Send our timeout along so ML service can drop requests we have stopped waiting for
+mlClient.interceptors.request.use((config) => {
+  if (config.timeout) {
+    config.headers['X-Request-Timeout-Ms'] = String(config.timeout)
+  }
+  return config
+})
+
 /**
  * Call ML API to predict diabetes
  * @param {Object} data - Patient health data (21 questions)
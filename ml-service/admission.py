@@ -0,0 +1,240 @@
+"""
+Admission Control for ML Service
+Bounds concurrent work per endpoint and sheds excess load quickly
+
+Each endpoint budget admits up to ``limit`` concurrent requests and lets at
+most ``max_queue`` more wait briefly for a slot. Anything beyond that fails
+fast so the requests already admitted keep a predictable latency. With
+adaptive limits enabled, the concurrency limit follows observed latency
+while the budget is saturated: it shrinks multiplicatively when latency
+rises above the target and grows additively while latency stays healthy.
+Below saturation the limit is left alone, since latency there says nothing
+about how much concurrency the service can take.
+
+The latency target is either configured explicitly or derived from a
+percentile of recent latencies of requests admitted while the budget was
+lightly loaded, so ordinary jitter around a healthy baseline does not read
+as overload. Until enough such requests have been seen the limit is not
+decreased; set an explicit target for services that start under overload.
+
+Requests carrying a deadline leave the queue as soon as they could no
+longer finish in time (judged from the smoothed latency) instead of taking
+a slot to compute an answer nobody will read.
+"""
+
+import math
+import time
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed by admission control"""
+
+    def __init__(self, budget: str, reason: str, retry_after: int):
+        super().__init__(f"Server overloaded ({budget}: {reason})")
+        self.budget = budget
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Concurrency limit and bounded wait queue for one endpoint budget
+
+    Args:
+        name: Budget name (for reporting)
+        max_concurrency: Upper bound for concurrently executing requests
+        max_queue: Maximum number of requests waiting for a slot
+        queue_timeout_ms: Longest a queued request waits before being shed
+        adaptive: Adjust the concurrency limit from observed latency
+        min_concurrency: Lower bound for the adaptive limit
+        target_latency_ms: Latency target; 0 derives it from the healthy baseline
+        tolerance: Allowed ratio of smoothed latency to the baseline when target is 0
+    """
+
+    SMOOTHING = 0.2            # EWMA weight of the newest latency sample
+    DECREASE_FACTOR = 0.9      # Multiplicative decrease when latency is too high
+    BASELINE_WINDOW = 256      # Recent unsaturated latencies the baseline is taken from
+    BASELINE_PERCENTILE = 0.9  # Percentile of that window used as the baseline
+    BASELINE_MIN_SAMPLES = 20  # Samples needed before a derived target is trusted
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout_ms: float = 1000,
+        adaptive: bool = True,
+        min_concurrency: int = 1,
+        target_latency_ms: float = 0,
+        tolerance: float = 2.0
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout_ms / 1000
+        self.adaptive = adaptive
+        self.min_concurrency = min(min_concurrency, max_concurrency)
+        self.target_latency_ms = target_latency_ms
+        self.tolerance = tolerance
+
+        self._limit = float(max_concurrency)
+        self._active = 0
+        self._waiting = 0
+        self._latency_ewma = None
+        self._baseline_samples = deque(maxlen=self.BASELINE_WINDOW)
+        self._baseline_ms = None
+        self._samples_since_baseline = 0
+        self._samples_since_decrease = 0
+        self._condition = threading.Condition()
+        self._stats = {
+            'admitted': 0,
+            'queued': 0,
+            'shed_queue_full': 0,
+            'shed_timeout': 0,
+            'shed_deadline': 0,
+            'limit_decreases': 0
+        }
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_concurrency, int(self._limit))
+
+    def retry_after(self) -> int:
+        """Suggested Retry-After in whole seconds based on current backlog"""
+        latency_s = (self._latency_ewma or 0) / 1000
+        backlog = (self._active + self._waiting) / max(self.limit, 1)
+        return max(1, math.ceil(latency_s * backlog))
+
+    def acquire(self, timeout: Optional[float] = None, deadline: Optional[float] = None):
+        """
+        Take a concurrency slot or raise AdmissionRejected
+
+        Returns the number of requests in flight including this one, to be
+        passed back to release().
+
+        Args:
+            timeout: Maximum wait in seconds (defaults to the queue timeout)
+            deadline: time.monotonic() value by which the request must finish;
+                it is shed with reason 'deadline' once the smoothed latency no
+                longer fits before it
+        """
+        with self._condition:
+            start_by = None
+            if deadline is not None:
+                start_by = deadline - (self._latency_ewma or 0) / 1000
+                if start_by <= time.monotonic():
+                    self._stats['shed_deadline'] += 1
+                    raise AdmissionRejected(self.name, 'deadline', self.retry_after())
+
+            if self._active < self.limit:
+                self._active += 1
+                self._stats['admitted'] += 1
+                return self._active
+
+            if self._waiting >= self.max_queue:
+                self._stats['shed_queue_full'] += 1
+                raise AdmissionRejected(self.name, 'queue full', self.retry_after())
+
+            self._waiting += 1
+            self._stats['queued'] += 1
+            queue_deadline = time.monotonic() + (self.queue_timeout if timeout is None else timeout)
+            try:
+                while self._active >= self.limit:
+                    now = time.monotonic()
+                    if start_by is not None and start_by <= now:
+                        self._stats['shed_deadline'] += 1
+                        raise AdmissionRejected(self.name, 'deadline', self.retry_after())
+                    if queue_deadline <= now:
+                        self._stats['shed_timeout'] += 1
+                        raise AdmissionRejected(self.name, 'queue timeout', self.retry_after())
+                    wake_at = queue_deadline if start_by is None else min(queue_deadline, start_by)
+                    self._condition.wait(wake_at - now)
+            except AdmissionRejected:
+                # Pass on a wake-up this waiter may have consumed
+                if self._active < self.limit:
+                    self._condition.notify()
+                raise
+            finally:
+                self._waiting -= 1
+
+            self._active += 1
+            self._stats['admitted'] += 1
+            return self._active
+
+    def release(self, latency_ms: float, in_flight: Optional[int] = None):
+        """
+        Return a slot and feed the observed latency to the adaptive limit
+
+        Args:
+            latency_ms: Time the request held its slot
+            in_flight: Value returned by acquire(); requests admitted into a
+                lightly loaded budget feed the healthy latency baseline
+        """
+        with self._condition:
+            self._active -= 1
+            if self.adaptive:
+                self._adapt(latency_ms, in_flight)
+            self._condition.notify()
+
+    def _adapt(self, latency_ms: float, in_flight: Optional[int] = None):
+        if self._latency_ewma is None:
+            self._latency_ewma = latency_ms
+        else:
+            self._latency_ewma += self.SMOOTHING * (latency_ms - self._latency_ewma)
+        self._samples_since_decrease += 1
+
+        # The releasing request was still counted as active when it ran
+        saturated = self._active + 1 >= self.limit or self._waiting > 0
+        if not saturated:
+            if in_flight is None or in_flight <= max(1, self.limit // 4):
+                self._observe_baseline(latency_ms)
+            return
+
+        target = self._target_latency()
+        if target is None:
+            return
+        if self._latency_ewma > target:
+            # Decrease at most once per limit's worth of samples
+            if self._samples_since_decrease >= self.limit:
+                self._limit = max(self.min_concurrency, self._limit * self.DECREASE_FACTOR)
+                self._samples_since_decrease = 0
+                self._stats['limit_decreases'] += 1
+        else:
+            self._limit = min(self.max_concurrency, self._limit + 1 / self._limit)
+
+    def _observe_baseline(self, latency_ms: float):
+        """Add an unsaturated latency sample; refresh the percentile every few samples"""
+        self._baseline_samples.append(latency_ms)
+        self._samples_since_baseline += 1
+        warming_up = len(self._baseline_samples) <= self.BASELINE_MIN_SAMPLES
+        if warming_up or self._samples_since_baseline >= self.BASELINE_WINDOW // 8:
+            ordered = sorted(self._baseline_samples)
+            self._baseline_ms = ordered[min(len(ordered) - 1, int(len(ordered) * self.BASELINE_PERCENTILE))]
+            self._samples_since_baseline = 0
+
+    def _target_latency(self) -> Optional[float]:
+        """Configured target, else tolerance times the healthy baseline (None until known)"""
+        if self.target_latency_ms:
+            return self.target_latency_ms
+        if len(self._baseline_samples) < self.BASELINE_MIN_SAMPLES:
+            return None
+        return self._baseline_ms * self.tolerance
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current limit, occupancy and shed counters"""
+        with self._condition:
+            target = self._target_latency()
+            return {
+                'limit': self.limit,
+                'max_concurrency': self.max_concurrency,
+                'max_queue': self.max_queue,
+                'active': self._active,
+                'waiting': self._waiting,
+                'latency_ewma_ms': round(self._latency_ewma, 3) if self._latency_ewma is not None else None,
+                'target_latency_ms': round(target, 3) if target is not None else None,
+                'shed_total': self._stats['shed_queue_full'] + self._stats['shed_timeout'] + self._stats['shed_deadline'],
+                **self._stats
+            }
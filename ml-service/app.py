@@ -3,23 +3,39 @@ Flask API Server for Diabetes Prediction ML Service
 Provides HTTP endpoints for diabetes prediction using trained ML model
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, g
 from flask_cors import CORS
 import joblib
 import numpy as np
-import pandas as pd
 import os
 import json
+import hmac
 from datetime import datetime
 import logging
+import threading
+import time
+import uuid
+from functools import wraps
 
 # Import custom modules
 from config import Config
 from utils import (
     create_response, create_error_response, 
-    validate_request_data, format_prediction_result,
-    log_prediction_request
+    validate_request_data, validate_feature_matrix,
+    format_prediction_result, log_prediction_request, strip_feature_names
 )
+import binary_protocol
+from warmup import WarmupState, start_warmup_thread
+from ensemble import EnsembleScorer, EnsembleUnavailableError, parse_member_specs, load_members
+from audit_log import AuditLogger, summarize_batch
+from shadow import ShadowEvaluator
+from drift_monitor import DriftMonitor
+from admission import AdmissionController, AdmissionRejected
+from deadline import Deadline, AbandonedWorkStats, client_disconnected
+from explain import Explainer, UnsupportedModelError
+from sensitivity import run_sweep
+from profiling import MemoryProfiler, CpuSampler, ProfilingError, format_collapsed
+from shared_weights import SharedWeightsError, load_shared_model, retire_older_versions, segment_name
 
 # Setup logging
 logging.basicConfig(
@@ -49,6 +65,31 @@ logger.info(f"✅ CORS configured - Origins: {allowed_origins[:3]}{'...' if len(
 
 # ==================== Model Loading ====================
 
+shared_model = None
+
+
+def load_model_weights(model_path):
+    """Load the served model, from shared memory when shared weights are enabled"""
+    global shared_model
+    if not Config.SHARED_WEIGHTS_ENABLED:
+        return joblib.load(model_path)
+    
+    name = segment_name(Config.SHARED_WEIGHTS_PREFIX, Config.MODEL_TYPE, Config.MODEL_VERSION)
+    try:
+        shared_model = load_shared_model(name, lambda: joblib.load(model_path), Config.SHARED_WEIGHTS_TIMEOUT)
+    except SharedWeightsError as e:
+        logger.warning(f"⚠️  {e}, loading a private copy of the model")
+        return joblib.load(model_path)
+    
+    if shared_model.created:
+        # Only the publisher of a version retires, and only superseded versions
+        retired = retire_older_versions(Config.SHARED_WEIGHTS_PREFIX, Config.MODEL_TYPE, Config.MODEL_VERSION)
+        if retired:
+            logger.info(f"Retired shared weights segments: {', '.join(retired)}")
+    logger.info(f"✅ Model weights mapped from shared memory: {name} ({shared_model.size} bytes)")
+    return shared_model.model
+
+
 def load_ml_artifacts():
     """Load ML model, scaler, and metadata"""
     try:
@@ -57,10 +98,10 @@ def load_ml_artifacts():
         metadata_path = Config.get_metadata_path()
         
         logger.info(f"Loading model from: {model_path}")
-        model = joblib.load(model_path)
+        model = strip_feature_names(load_model_weights(model_path))
         
         logger.info(f"Loading scaler from: {scaler_path}")
-        scaler = joblib.load(scaler_path)
+        scaler = strip_feature_names(joblib.load(scaler_path))
         
         # Load metadata if available
         if os.path.exists(metadata_path):
@@ -87,6 +128,29 @@ def load_ml_artifacts():
 model, scaler, metadata = load_ml_artifacts()
 
 
+def load_ensemble():
+    """Load the ensemble scorer when ensemble serving is enabled"""
+    if not Config.ENSEMBLE_ENABLED:
+        return None
+    
+    try:
+        specs = parse_member_specs(Config.ENSEMBLE_MEMBERS, Config.ENSEMBLE_MEMBER_BUDGET_MS)
+        scorer = EnsembleScorer(
+            load_members(Config.MODEL_DIR, specs),
+            method=Config.ENSEMBLE_METHOD,
+            intercept=Config.ENSEMBLE_STACKING_INTERCEPT,
+            max_workers=Config.ENSEMBLE_MAX_WORKERS
+        )
+        logger.info(f"✅ Ensemble loaded: {scorer.name}")
+        return scorer
+    except Exception as e:
+        logger.error(f"❌ Error loading ensemble: {e}")
+        return None
+
+
+ensemble = load_ensemble()
+
+
 # ==================== Helper Functions ====================
 
 def preprocess_input(data):
@@ -97,7 +161,7 @@ def preprocess_input(data):
         data: dict with feature values
         
     Returns:
-        numpy array ready for prediction
+        numpy array of shape (1, n_features) ready for prediction
     """
     # Map backend field names to model field names
     field_mapping = {
@@ -125,14 +189,49 @@ def preprocess_input(data):
     if not is_valid:
         raise ValueError(f"Validation failed: {'; '.join(errors)}")
     
-    # Create DataFrame with correct feature order
-    df = pd.DataFrame([standardized_data])[Config.FEATURE_NAMES]
+    # Build the feature row in model order
+    return np.array(
+        [[standardized_data[name] for name in Config.FEATURE_NAMES]], dtype=np.float64
+    )
+
+
+def preprocess_matrix(features):
+    """
+    Validate a raw feature matrix
+    
+    Args:
+        features: numpy array of shape (n_rows, n_features) in Config.FEATURE_NAMES order
+        
+    Returns:
+        numpy array ready for prediction
+    """
+    is_valid, error_msg = validate_feature_matrix(
+        features, Config.FEATURE_NAMES, Config.FEATURE_RANGES
+    )
+    if not is_valid:
+        raise ValueError(f"Validation failed: {error_msg}")
     
-    # Convert to float and scale
-    df = df.astype(float)
-    scaled_data = scaler.transform(df)
+    return features
+
+
+def predict_probabilities(features, details=None):
+    """
+    Return the probability of diabetes for each row of raw features
     
-    return scaled_data
+    Args:
+        features: numpy array of shape (n_rows, n_features) from preprocess_input/preprocess_matrix
+        details: Optional dict that receives ensemble vote details
+        
+    Returns:
+        numpy array of probabilities, shape (n_rows,)
+    """
+    if ensemble is not None:
+        probabilities, ensemble_details = ensemble.predict_proba(features)
+        if details is not None:
+            details.update(ensemble_details)
+        return probabilities
+    
+    return model.predict_proba(scaler.transform(features))[:, 1]
 
 
 def determine_risk_level(probability):
@@ -145,6 +244,314 @@ def determine_risk_level(probability):
         return 'High'
 
 
+def score_record(record):
+    """Score a single record through the same path as /predict"""
+    processed_data = preprocess_input(record)
+    return determine_risk_level(float(predict_probabilities(processed_data)[0]))
+
+
+def score_batch(features):
+    """Score a raw feature matrix through the same path as /predict/binary"""
+    return predict_probabilities(preprocess_matrix(features))
+
+
+# ==================== Audit Log ====================
+
+audit_logger = AuditLogger(
+    directory=Config.AUDIT_LOG_DIR,
+    capacity=Config.AUDIT_LOG_CAPACITY,
+    max_buffer_bytes=Config.AUDIT_LOG_MAX_BUFFER_BYTES,
+    batch_size=Config.AUDIT_LOG_BATCH_SIZE,
+    flush_interval=Config.AUDIT_LOG_FLUSH_INTERVAL,
+    max_bytes=Config.AUDIT_LOG_MAX_BYTES,
+    backup_count=Config.AUDIT_LOG_BACKUP_COUNT
+) if Config.AUDIT_LOG_ENABLED else None
+
+
+def audit_prediction(endpoint, inputs, outputs, start_time, details=None):
+    """
+    Queue an audit record for a served prediction (never blocks the request)
+    
+    Args:
+        endpoint: Endpoint name
+        inputs: Model inputs (feature dict, or summarize_batch() of a matrix)
+        outputs: Prediction outputs (dict, or summarize_batch() of an array)
+        start_time: time.perf_counter() value taken when the request started
+        details: Optional extra fields (e.g. ensemble votes)
+    """
+    if audit_logger is None:
+        return
+    
+    audit_logger.record({
+        'request_id': request.headers.get('X-Request-Id') or uuid.uuid4().hex,
+        'endpoint': endpoint,
+        'client': request.remote_addr,
+        'model_name': ensemble.name if ensemble is not None else metadata.get('model_name'),
+        'model_type': Config.MODEL_TYPE,
+        'model_version': Config.MODEL_VERSION,
+        'feature_names': Config.FEATURE_NAMES,
+        'inputs': inputs,
+        'outputs': outputs,
+        'details': details,
+        'latency_ms': round((time.perf_counter() - start_time) * 1000, 3)
+    })
+
+
+# ==================== Explanations ====================
+
+def load_explainer():
+    """Prepare the explainer (coefficients / flattened trees) for the served model"""
+    if model is None or scaler is None:
+        return None
+    
+    try:
+        return Explainer(model, scaler, Config.FEATURE_NAMES)
+    except UnsupportedModelError as e:
+        logger.warning(f"⚠️  {e}, /explain disabled")
+        return None
+
+
+explainer = load_explainer()
+
+
+# ==================== Shadow Evaluation ====================
+
+def load_shadow_evaluator():
+    """Load the candidate model for shadow evaluation when enabled"""
+    if not Config.SHADOW_ENABLED or not Config.SHADOW_MODEL_VERSION:
+        return None
+    
+    try:
+        candidate_path = Config.get_model_path(Config.SHADOW_MODEL_TYPE, Config.SHADOW_MODEL_VERSION)
+        logger.info(f"Loading shadow candidate from: {candidate_path}")
+        evaluator = ShadowEvaluator(
+            name=f"{Config.SHADOW_MODEL_TYPE}_{Config.SHADOW_MODEL_VERSION}",
+            model=strip_feature_names(joblib.load(candidate_path)),
+            scaler=strip_feature_names(joblib.load(Config.get_scaler_path(Config.SHADOW_MODEL_VERSION))),
+            risk_level_fn=determine_risk_level,
+            sample_rate=Config.SHADOW_SAMPLE_RATE,
+            queue_size=Config.SHADOW_QUEUE_SIZE,
+            max_queue_bytes=Config.SHADOW_QUEUE_MAX_BYTES,
+            max_rows=Config.SHADOW_MAX_ROWS,
+            latency_window=Config.SHADOW_LATENCY_WINDOW
+        )
+        logger.info(f"✅ Shadow evaluation enabled for {evaluator.name}")
+        return evaluator
+    except Exception as e:
+        logger.error(f"❌ Error loading shadow candidate: {e}")
+        return None
+
+
+shadow_evaluator = load_shadow_evaluator()
+
+
+# ==================== Drift Monitor ====================
+
+drift_monitor = DriftMonitor(
+    Config.FEATURE_NAMES,
+    Config.FEATURE_RANGES,
+    reference=metadata.get('reference_profile'),
+    n_bins=Config.DRIFT_BINS
+) if Config.DRIFT_MONITOR_ENABLED else None
+
+if drift_monitor is not None and drift_monitor.reference is None:
+    logger.warning("⚠️  No reference profile in model metadata, drift scores unavailable")
+
+
+# ==================== Request Deadlines ====================
+
+abandoned_work = AbandonedWorkStats()
+
+if Config.DEADLINE_ENABLED:
+    @app.before_request
+    def _start_request_deadline():
+        g.deadline = Deadline.from_headers(
+            request.headers, Config.DEADLINE_DEFAULT_MS, Config.DEADLINE_MAX_MS
+        )
+
+
+def deadline_exceeded_response(stage):
+    """Count a request dropped at ``stage`` for its deadline and build the 504 response"""
+    abandoned_work.record_expired(stage)
+    response, status_code = create_error_response(
+        error=f"Deadline exceeded before {stage}",
+        status_code=504
+    )
+    response.headers['X-Deadline-Exceeded'] = stage
+    return response, status_code
+
+
+def abandoned(stage, check_disconnect=False):
+    """
+    Error response if the current request is no longer worth working on, else None
+    
+    Args:
+        stage: Stage about to run (reported in counters and the response)
+        check_disconnect: Also stop when the client has closed the connection
+            (499, the response is never delivered)
+    """
+    deadline = g.get('deadline')
+    if deadline is not None and deadline.expired():
+        return deadline_exceeded_response(stage)
+    
+    if check_disconnect and client_disconnected(request.environ):
+        abandoned_work.record_disconnect(stage)
+        return create_error_response(error='Client closed request', status_code=499)
+    
+    return None
+
+
+def run_in_chunks(rows, process, stage):
+    """
+    Apply process to consecutive chunks of rows, checking between chunks that
+    the deadline has not passed and the client is still connected
+    
+    Returns:
+        (list of per-chunk results, None), or (None, error response) when abandoned
+    """
+    results = []
+    for start in range(0, len(rows), Config.BATCH_CHUNK_ROWS):
+        stopped = abandoned(stage, check_disconnect=True)
+        if stopped:
+            return None, stopped
+        results.append(process(rows[start:start + Config.BATCH_CHUNK_ROWS]))
+    return results, None
+
+
+# ==================== Admission Control ====================
+
+def _admission_controller(name, max_concurrency, max_queue):
+    return AdmissionController(
+        name,
+        max_concurrency=max_concurrency,
+        max_queue=max_queue,
+        queue_timeout_ms=Config.ADMISSION_QUEUE_TIMEOUT_MS,
+        adaptive=Config.ADMISSION_ADAPTIVE,
+        min_concurrency=Config.ADMISSION_MIN_CONCURRENCY,
+        target_latency_ms=Config.ADMISSION_TARGET_LATENCY_MS
+    )
+
+
+admission_controllers = {
+    'predict': _admission_controller(
+        'predict', Config.ADMISSION_PREDICT_CONCURRENCY, Config.ADMISSION_PREDICT_QUEUE
+    ),
+    'batch': _admission_controller(
+        'batch', Config.ADMISSION_BATCH_CONCURRENCY, Config.ADMISSION_BATCH_QUEUE
+    )
+} if Config.ADMISSION_ENABLED else {}
+
+
+def admission_control(budget):
+    """Route decorator: run the handler only if the budget admits the request"""
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(*args, **kwargs):
+            controller = admission_controllers.get(budget)
+            if controller is None:
+                return handler(*args, **kwargs)
+            
+            deadline = g.get('deadline')
+            try:
+                in_flight = controller.acquire(deadline=deadline.expires_at if deadline is not None else None)
+            except AdmissionRejected as e:
+                if e.reason == 'deadline':
+                    return deadline_exceeded_response('admission')
+                response, status_code = create_error_response(error=str(e), status_code=503)
+                response.headers['Retry-After'] = str(e.retry_after)
+                return response, status_code
+            
+            start = time.perf_counter()
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                controller.release((time.perf_counter() - start) * 1000, in_flight)
+        return wrapper
+    return decorator
+
+
+# ==================== Admin / Profiling ====================
+
+def admin_only(handler):
+    """Route decorator: require the configured admin token (404 when no token is configured)"""
+    @wraps(handler)
+    def wrapper(*args, **kwargs):
+        if not Config.ADMIN_TOKEN:
+            return create_error_response(error='Endpoint not found', status_code=404)
+        
+        token = request.headers.get('X-Admin-Token', '')
+        if not hmac.compare_digest(token.encode('utf-8'), Config.ADMIN_TOKEN.encode('utf-8')):
+            return create_error_response(error='Admin token required', status_code=403)
+        return handler(*args, **kwargs)
+    return wrapper
+
+
+def profiling_enabled(handler):
+    """Route decorator: 404 unless on-demand profiling is enabled"""
+    @wraps(handler)
+    def wrapper(*args, **kwargs):
+        if memory_profiler is None or cpu_sampler is None:
+            return create_error_response(error='Profiling is not enabled', status_code=404)
+        return handler(*args, **kwargs)
+    return wrapper
+
+
+memory_profiler = None
+cpu_sampler = None
+
+if Config.PROFILING_ENABLED:
+    memory_profiler = MemoryProfiler(
+        max_snapshots=Config.PROFILING_MAX_SNAPSHOTS,
+        default_frames=Config.PROFILING_TRACE_FRAMES
+    )
+    cpu_sampler = CpuSampler(
+        default_interval_ms=Config.PROFILING_CPU_INTERVAL_MS,
+        max_seconds=Config.PROFILING_CPU_MAX_SECONDS
+    )
+    
+    @app.before_request
+    def _begin_request_profiling():
+        rule = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+        if rule.startswith('/admin/'):
+            return
+        cpu_sampler.enter_request(rule)
+        g.allocation_start = memory_profiler.begin_request()
+        g.profiled_rule = rule
+    
+    @app.after_request
+    def _end_allocation_tracking(response):
+        if 'profiled_rule' in g:
+            memory_profiler.end_request(g.profiled_rule, g.pop('allocation_start', None))
+        return response
+    
+    @app.teardown_request
+    def _end_request_profiling(error=None):
+        if g.pop('profiled_rule', None) is not None:
+            cpu_sampler.exit_request()
+
+
+# ==================== Warm-up ====================
+
+warmup_state = WarmupState()
+
+if model is not None and scaler is not None:
+    if Config.WARMUP_ENABLED:
+        start_warmup_thread(
+            warmup_state,
+            single_fn=score_record,
+            batch_fn=score_batch,
+            feature_names=Config.FEATURE_NAMES,
+            feature_ranges=Config.FEATURE_RANGES,
+            n_samples=Config.WARMUP_SAMPLES,
+            self_test_iterations=Config.WARMUP_SELFTEST_ITERATIONS,
+            max_p99_ms=Config.READY_MAX_P99_MS,
+            retry_delay=Config.READY_RETRY_SECONDS,
+            retry_max_delay=Config.READY_RETRY_MAX_SECONDS
+        )
+    else:
+        warmup_state.update(status=WarmupState.SKIPPED)
+
+
 # ==================== API Routes ====================
 
 @app.route('/', methods=['GET'])
@@ -160,8 +567,17 @@ def home():
             'model_version': Config.MODEL_VERSION,
             'endpoints': {
                 'predict': '/predict [POST]',
+                'predict_binary': '/predict/binary [POST]',
+                'predict_sweep': '/predict/sweep [POST]',
+                'explain': '/explain [POST]',
                 'health': '/health [GET]',
-                'info': '/info [GET]'
+                'ready': '/ready [GET]',
+                'metrics': '/metrics [GET]',
+                'shadow': '/shadow [GET]',
+                'drift': '/drift [GET]',
+                'info': '/info [GET]',
+                'memory_profile': '/admin/profile/memory[/start|stop|top|snapshot|diff] [admin]',
+                'cpu_profile': '/admin/profile/cpu [POST, admin]'
             },
             'description': 'ML API for diabetes risk prediction'
         }
@@ -187,6 +603,25 @@ def health_check():
     )
 
 
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    """Readiness check endpoint - ready once the model is loaded and warmed up"""
+    warmup = warmup_state.snapshot()
+    is_ready = model is not None and scaler is not None and warmup_state.is_warm
+    
+    return create_response(
+        success=is_ready,
+        data={
+            'status': 'ready' if is_ready else 'not_ready',
+            'model_loaded': model is not None,
+            'scaler_loaded': scaler is not None,
+            'warmup': warmup,
+            'timestamp': datetime.now().isoformat()
+        },
+        status_code=200 if is_ready else 503
+    )
+
+
 @app.route('/info', methods=['GET'])
 def get_info():
     """Get detailed model information"""
@@ -200,6 +635,9 @@ def get_info():
                 'training_date': metadata.get('training_date', 'Unknown')
             },
             'performance_metrics': metadata.get('performance_metrics', {}),
+            'serving_profile': metadata.get('serving_profile'),
+            'ensemble': ensemble.get_stats() if ensemble is not None else None,
+            'shared_weights': shared_model.get_stats() if shared_model is not None else None,
             'features': Config.FEATURE_NAMES,
             'feature_ranges': Config.FEATURE_RANGES,
             'input_format': {
@@ -216,7 +654,49 @@ def get_info():
     )
 
 
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Runtime counters for serving components"""
+    drift_report = drift_monitor.get_report() if drift_monitor is not None else None
+    
+    return create_response(
+        success=True,
+        data={
+            'audit_log': audit_logger.get_stats() if audit_logger is not None else None,
+            'shadow': shadow_evaluator.get_report() if shadow_evaluator is not None else None,
+            'admission': {
+                name: controller.get_stats() for name, controller in admission_controllers.items()
+            },
+            'abandoned_work': abandoned_work.get_stats(),
+            'drift': {
+                'observations': drift_report['observations'],
+                'max_psi': drift_report['max_psi']
+            } if drift_report is not None else None,
+            'timestamp': datetime.now().isoformat()
+        }
+    )
+
+
+@app.route('/shadow', methods=['GET'])
+def get_shadow_report():
+    """Shadow evaluation report for the candidate model"""
+    if shadow_evaluator is None:
+        return create_error_response(error='Shadow evaluation is not enabled', status_code=404)
+    
+    return create_response(success=True, data=shadow_evaluator.get_report())
+
+
+@app.route('/drift', methods=['GET'])
+def get_drift_report():
+    """Feature drift (PSI/KS) of live traffic against the training reference"""
+    if drift_monitor is None:
+        return create_error_response(error='Drift monitor is not enabled', status_code=404)
+    
+    return create_response(success=True, data=drift_monitor.get_report())
+
+
 @app.route('/predict', methods=['POST'])
+@admission_control('predict')
 def predict():
     """
     Predict diabetes risk
@@ -233,6 +713,7 @@ def predict():
         "age": 30
     }
     """
+    start_time = time.perf_counter()
     try:
         # Check if model is loaded
         if model is None or scaler is None:
@@ -280,18 +761,40 @@ def predict():
         # Log request
         log_prediction_request(data, request.remote_addr)
         
+        stopped = abandoned('preprocess')
+        if stopped:
+            return stopped
+        
         # Preprocess input
         try:
             processed_data = preprocess_input(data)
         except ValueError as e:
             return create_error_response(error=str(e), status_code=400)
         
+        stopped = abandoned('score')
+        if stopped:
+            return stopped
+        
         # Make prediction
-        prediction = int(model.predict(processed_data)[0])
-        probabilities = model.predict_proba(processed_data)[0]
+        ensemble_details = {}
+        scoring_start = time.perf_counter()
+        try:
+            probabilities = predict_probabilities(processed_data, ensemble_details)
+        except EnsembleUnavailableError as e:
+            return create_error_response(error=str(e), status_code=503)
+        
+        if shadow_evaluator is not None:
+            shadow_evaluator.submit(
+                processed_data, probabilities, (time.perf_counter() - scoring_start) * 1000
+            )
         
-        prob_no_diabetes = float(probabilities[0])
-        prob_diabetes = float(probabilities[1])
+        if drift_monitor is not None:
+            drift_monitor.update(processed_data)
+        
+        prob_diabetes = float(probabilities[0])
+        
+        prob_no_diabetes = 1.0 - prob_diabetes
+        prediction = int(prob_diabetes > 0.5)
         
         # Determine risk level
         risk_level = determine_risk_level(prob_diabetes)
@@ -309,12 +812,28 @@ def predict():
             },
             'confidence': round(max(prob_no_diabetes, prob_diabetes) * 100, 2),
             'risk_level': risk_level,
-            'model_used': metadata.get('model_name', 'Logistic Regression'),
+            'model_used': ensemble.name if ensemble is not None else metadata.get('model_name', 'Logistic Regression'),
             'model_version': Config.MODEL_VERSION,
             'timestamp': datetime.now().isoformat()
         }
         
-        logger.info(f"✅ Prediction: {prediction} | Probability: {prob_diabetes:.3f} | Risk: {risk_level}")
+        if ensemble_details:
+            result['ensemble'] = ensemble_details
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"✅ Prediction: {prediction} | Probability: {prob_diabetes:.3f} | Risk: {risk_level}")
+        
+        audit_prediction(
+            'predict',
+            inputs=data,
+            outputs={
+                'prediction': prediction,
+                'probability': prob_diabetes,
+                'risk_level': risk_level
+            },
+            start_time=start_time,
+            details=ensemble_details or None
+        )
         
         return create_response(success=True, data=result)
         
@@ -327,6 +846,343 @@ def predict():
         )
 
 
+@app.route('/predict/binary', methods=['POST'])
+@admission_control('batch')
+def predict_binary():
+    """
+    Predict diabetes risk using the compact binary protocol
+    
+    Body: packed float32 feature rows (see binary_protocol.py), one row for
+    single scoring or many rows for batch scoring.
+    Response: packed float32 probability of diabetes per row.
+    """
+    start_time = time.perf_counter()
+    try:
+        if model is None or scaler is None:
+            return create_error_response(
+                error='Model not loaded properly',
+                status_code=503
+            )
+        
+        if request.mimetype != binary_protocol.CONTENT_TYPE:
+            return create_error_response(
+                error=f"Content-Type must be {binary_protocol.CONTENT_TYPE}",
+                status_code=415
+            )
+        
+        try:
+            features = binary_protocol.decode_request(
+                request.get_data(cache=False), len(Config.FEATURE_NAMES)
+            )
+        except binary_protocol.ProtocolError as e:
+            return create_error_response(error=str(e), status_code=400)
+        
+        if features.shape[0] > Config.BINARY_MAX_ROWS:
+            return create_error_response(
+                error=f"Too many rows: {features.shape[0]} (max {Config.BINARY_MAX_ROWS})",
+                status_code=413
+            )
+        
+        stopped = abandoned('preprocess')
+        if stopped:
+            return stopped
+        
+        try:
+            processed_data = preprocess_matrix(features)
+        except ValueError as e:
+            return create_error_response(error=str(e), status_code=400)
+        
+        # Large batches are scored in chunks so dead requests stop early
+        scoring_start = time.perf_counter()
+        try:
+            chunks, stopped = run_in_chunks(processed_data, predict_probabilities, 'score')
+        except EnsembleUnavailableError as e:
+            return create_error_response(error=str(e), status_code=503)
+        if stopped:
+            return stopped
+        probabilities = np.concatenate(chunks)
+        
+        if shadow_evaluator is not None:
+            shadow_evaluator.submit(
+                processed_data, probabilities, (time.perf_counter() - scoring_start) * 1000
+            )
+        
+        if drift_monitor is not None:
+            drift_monitor.update(processed_data)
+        
+        if audit_logger is not None:
+            outputs = {
+                **summarize_batch(probabilities),
+                'mean_probability': float(probabilities.mean())
+            }
+            if len(probabilities) <= Config.AUDIT_LOG_MAX_BATCH_ROWS:
+                outputs['probabilities'] = probabilities
+                outputs['predictions'] = (probabilities > 0.5).astype(np.int8)
+            audit_prediction('predict_binary', inputs=summarize_batch(features), outputs=outputs, start_time=start_time)
+        
+        return Response(
+            binary_protocol.encode_response(probabilities),
+            status=200,
+            mimetype=binary_protocol.CONTENT_TYPE
+        )
+        
+    except Exception as e:
+        logger.error(f"❌ Binary prediction error: {str(e)}", exc_info=True)
+        return create_error_response(
+            error='Internal server error',
+            details=str(e) if Config.DEBUG else None,
+            status_code=500
+        )
+
+
+@app.route('/predict/sweep', methods=['POST'])
+@admission_control('batch')
+def predict_sweep():
+    """
+    What-if sensitivity sweep around a base record
+    
+    Expected JSON body:
+    {
+        "record": {...same fields as /predict...},
+        "vary": [
+            {"feature": "bmi", "min": 20, "max": 35, "steps": 31},
+            {"feature": "glucose", "values": [90, 110, 130, 150]}
+        ]
+    }
+    One or two features; min/max default to the feature's valid range.
+    """
+    try:
+        if model is None or scaler is None:
+            return create_error_response(
+                error='Model not loaded properly',
+                status_code=503
+            )
+        
+        data = request.get_json()
+        if not data or not isinstance(data.get('record'), dict):
+            return create_error_response(error="Request needs a 'record' object", status_code=400)
+        
+        stopped = abandoned('score')
+        if stopped:
+            return stopped
+        
+        try:
+            base_row = preprocess_input(data['record'])
+            result = run_sweep(
+                base_row,
+                data.get('vary'),
+                predict_probabilities,
+                determine_risk_level,
+                Config.FEATURE_NAMES,
+                Config.FEATURE_RANGES,
+                default_steps=Config.SWEEP_DEFAULT_STEPS,
+                max_points=Config.SWEEP_MAX_POINTS
+            )
+        except (ValueError, AttributeError, TypeError) as e:
+            return create_error_response(error=str(e), status_code=400)
+        except EnsembleUnavailableError as e:
+            return create_error_response(error=str(e), status_code=503)
+        
+        result['model_used'] = ensemble.name if ensemble is not None else metadata.get('model_name', 'Unknown')
+        result['model_version'] = Config.MODEL_VERSION
+        
+        return create_response(success=True, data=result)
+        
+    except Exception as e:
+        logger.error(f"❌ Sweep error: {str(e)}", exc_info=True)
+        return create_error_response(
+            error='Internal server error',
+            details=str(e) if Config.DEBUG else None,
+            status_code=500
+        )
+
+
+@app.route('/explain', methods=['POST'])
+@admission_control('batch')
+def explain():
+    """
+    Explain diabetes risk predictions with per-feature contributions
+    
+    Expected JSON body: a single record (same fields as /predict) or
+    {"records": [{...}, {...}], "top_k": 3}
+    
+    Contributions describe the single loaded model, so explanations are
+    unavailable while an ensemble is served.
+    """
+    try:
+        if explainer is None:
+            return create_error_response(
+                error='Explanations are not available for the loaded model',
+                status_code=503
+            )
+        if ensemble is not None:
+            return create_error_response(
+                error='Explanations are not available while an ensemble is served',
+                status_code=503
+            )
+        
+        data = request.get_json()
+        if not data:
+            return create_error_response(error="No data provided in request", status_code=400)
+        
+        records = data.get('records', [data]) if isinstance(data, dict) else data
+        if not isinstance(records, list) or not records:
+            return create_error_response(error="'records' must be a non-empty list", status_code=400)
+        if len(records) > Config.EXPLAIN_MAX_RECORDS:
+            return create_error_response(
+                error=f"Too many records: {len(records)} (max {Config.EXPLAIN_MAX_RECORDS})",
+                status_code=413
+            )
+        
+        top_k = data.get('top_k', 0) if isinstance(data, dict) else 0
+        if isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 0:
+            return create_error_response(error="'top_k' must be a non-negative integer", status_code=400)
+        
+        stopped = abandoned('preprocess')
+        if stopped:
+            return stopped
+        
+        try:
+            features = np.vstack([preprocess_input(record) for record in records])
+        except (ValueError, AttributeError, TypeError) as e:
+            return create_error_response(error=str(e), status_code=400)
+        
+        def explain_chunk(rows):
+            probabilities = predict_probabilities(rows)
+            chunk = explainer.explain(rows, top_k=top_k)
+            for explanation, probability in zip(chunk, probabilities):
+                explanation['probability'] = float(probability)
+                explanation['risk_level'] = determine_risk_level(float(probability))
+            return chunk
+        
+        chunks, stopped = run_in_chunks(features, explain_chunk, 'explain')
+        if stopped:
+            return stopped
+        explanations = [explanation for chunk in chunks for explanation in chunk]
+        
+        return create_response(
+            success=True,
+            data={
+                'method': explainer.method,
+                'space': explainer.space,
+                'model_used': metadata.get('model_name', 'Unknown'),
+                'model_version': Config.MODEL_VERSION,
+                'explanations': explanations
+            }
+        )
+        
+    except Exception as e:
+        logger.error(f"❌ Explanation error: {str(e)}", exc_info=True)
+        return create_error_response(
+            error='Internal server error',
+            details=str(e) if Config.DEBUG else None,
+            status_code=500
+        )
+
+
+@app.route('/admin/profile/memory', methods=['GET'])
+@admin_only
+@profiling_enabled
+def memory_profile_status():
+    """Allocation tracing status and per-endpoint net allocation per request"""
+    return create_response(
+        success=True,
+        data={**memory_profiler.get_status(), 'endpoints': memory_profiler.endpoints.report()}
+    )
+
+
+@app.route('/admin/profile/memory/<action>', methods=['GET', 'POST'])
+@admin_only
+@profiling_enabled
+def memory_profile_action(action):
+    """
+    Control allocation tracing
+    
+    POST start    {"frames": 1}            Start tracing (clears endpoint counters and snapshots)
+    POST stop                              Stop tracing, returns the final endpoint report
+    GET  top      ?limit=&group_by=&sort_by=  Top allocation sites (lineno|filename|traceback, size|count)
+    POST snapshot {"label": "before"}      Keep a named snapshot
+    GET  diff     ?before=&after=&limit=   Growth between snapshots (after defaults to now)
+    """
+    data = request.get_json(silent=True) or {}
+    args = request.args
+    try:
+        if action == 'start' and request.method == 'POST':
+            result = memory_profiler.start(data.get('frames'))
+        elif action == 'stop' and request.method == 'POST':
+            result = memory_profiler.stop()
+        elif action == 'top':
+            result = {'top': memory_profiler.top(
+                limit=int(args.get('limit', 20)),
+                group_by=args.get('group_by', 'lineno'),
+                sort_by=args.get('sort_by', 'size')
+            )}
+        elif action == 'snapshot' and request.method == 'POST':
+            result = memory_profiler.take_snapshot(str(data.get('label', '')))
+        elif action == 'diff':
+            result = memory_profiler.diff(
+                args.get('before', ''),
+                args.get('after'),
+                limit=int(args.get('limit', 20)),
+                group_by=args.get('group_by', 'lineno')
+            )
+        else:
+            return create_error_response(error=f'Unknown profiling action: {request.method} {action}', status_code=404)
+    except (ProfilingError, ValueError) as e:
+        return create_error_response(error=str(e), status_code=400)
+    
+    return create_response(success=True, data=result)
+
+
+@app.route('/admin/profile/cpu', methods=['POST'])
+@admin_only
+@profiling_enabled
+def cpu_profile():
+    """
+    Sample the stacks of all request threads for a while
+    
+    Options (JSON body or query string):
+        seconds: Profile duration (default 10)
+        interval_ms: Sampling interval (default PROFILING_CPU_INTERVAL_MS)
+        all_threads: Include threads not serving a request
+        format: 'json' (default) or 'collapsed' (text/plain for flamegraph tools)
+    """
+    options = {**request.args.to_dict(), **(request.get_json(silent=True) or {})}
+    try:
+        profile = cpu_sampler.profile(
+            seconds=float(options.get('seconds', 10)),
+            interval_ms=float(options['interval_ms']) if options.get('interval_ms') else None,
+            all_threads=str(options.get('all_threads', 'false')).lower() == 'true'
+        )
+    except ProfilingError as e:
+        status_code = 409 if cpu_sampler.running else 400
+        return create_error_response(error=str(e), status_code=status_code)
+    except ValueError as e:
+        return create_error_response(error=str(e), status_code=400)
+    
+    # Stacks are rooted at the model version so profiles of different versions merge cleanly
+    collapsed = format_collapsed(profile['stacks'], root=f"model:{Config.MODEL_TYPE}_{Config.MODEL_VERSION}")
+    
+    if options.get('format') == 'collapsed':
+        response = Response(collapsed, mimetype='text/plain')
+        response.headers['X-Model-Version'] = f"{Config.MODEL_TYPE}_{Config.MODEL_VERSION}"
+        response.headers['X-Endpoint-Mix'] = ','.join(
+            f"{endpoint}={count}" for endpoint, count in profile['endpoint_mix'].items()
+        )
+        response.headers['X-Profile-Samples'] = str(profile['samples'])
+        return response
+    
+    return create_response(
+        success=True,
+        data={
+            'model_type': Config.MODEL_TYPE,
+            'model_version': Config.MODEL_VERSION,
+            **{key: value for key, value in profile.items() if key != 'stacks'},
+            'collapsed': collapsed
+        }
+    )
+
+
 # ==================== Error Handlers ====================
 
 @app.errorhandler(404)
@@ -338,8 +1194,17 @@ def not_found(error):
             'available_endpoints': {
                 'home': '/',
                 'health': '/health',
+                'ready': '/ready',
+                'metrics': '/metrics',
+                'shadow': '/shadow',
+                'drift': '/drift',
                 'info': '/info',
-                'predict': '/predict'
+                'predict': '/predict',
+                'predict_binary': '/predict/binary',
+                'predict_sweep': '/predict/sweep',
+                'explain': '/explain',
+                'memory_profile': '/admin/profile/memory',
+                'cpu_profile': '/admin/profile/cpu'
             }
         },
         status_code=404
@@ -367,6 +1232,21 @@ def method_not_allowed(error):
 
 # ==================== Application Entry Point ====================
 
+def start_unix_socket_server(socket_path):
+    """Serve the app on a Unix domain socket in a background thread"""
+    from werkzeug.serving import make_server
+    
+    # Remove a stale socket left behind by a previous run
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    
+    server = make_server(f"unix://{socket_path}", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, name='unix-socket-server', daemon=True)
+    thread.start()
+    logger.info(f"✅ Listening on Unix socket: {socket_path}")
+    return server
+
+
 if __name__ == '__main__':
     allowed_origins = Config.get_allowed_origins()
     origins_display = ', '.join(allowed_origins)
@@ -387,8 +1267,17 @@ Trained         : {metadata.get('training_date', 'N/A'):<44}
 📡 Endpoints:                                                 
 GET    /              →  API Information                  
 GET    /health        →  Health Check                     
+GET    /ready         →  Readiness Check (warm-up)        
 GET    /info          →  Model Details                    
+GET    /metrics       →  Runtime Counters                 
+GET    /shadow        →  Shadow Model Report              
+GET    /drift         →  Feature Drift Report             
 POST   /predict       →  Make Prediction                  
+POST   /predict/binary →  Binary Scoring (single/batch)   
+POST   /predict/sweep →  What-if Sensitivity Sweep        
+POST   /explain       →  Per-feature Explanations         
+*      /admin/profile/memory →  Allocation Tracing (admin)
+POST   /admin/profile/cpu →  CPU Sampling Profile (admin)
                                                                 
 🔒 CORS Origins : {origins_display:<44}
                                                                 
@@ -397,6 +1286,10 @@ POST   /predict       →  Make Prediction
 🚀 Server    : http://{Config.HOST}:{Config.PORT}
     """)
     
+    # Optional Unix socket listener (skip the reloader's parent process in debug mode)
+    if Config.UNIX_SOCKET_PATH and (not Config.DEBUG or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'):
+        start_unix_socket_server(Config.UNIX_SOCKET_PATH)
+    
     # Run the Flask app
     app.run(
         host=Config.HOST,
@@ -0,0 +1,229 @@
+"""
+Prediction Audit Log for ML Service
+Buffers structured audit records in memory and writes them to rotating
+JSON-lines files from a background thread
+
+The request thread only appends a dict to a bounded buffer; all formatting
+and file I/O happens on the writer thread. The buffer is bounded both by
+record count and by the approximate size of the buffered values; when
+either bound is hit the record is dropped and counted instead of blocking
+the request. Batch endpoints should log a summary (see summarize_batch)
+rather than whole matrices.
+
+Each process writes its own file (the pid is part of the name), so
+several workers can share one audit directory without interleaving or
+rotating each other's files.
+
+Audit records contain patient features and client addresses, so the log is
+disabled unless explicitly enabled.
+"""
+
+import os
+import json
+import time
+import atexit
+import hashlib
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _to_serializable(value: Any) -> Any:
+    """json.dumps fallback for numpy values captured on the request thread"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _approx_size(value: Any) -> int:
+    """Rough in-memory size of a record value in bytes (cheap, not exact)"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes + 112
+    if isinstance(value, dict):
+        return 64 + sum(_approx_size(k) + _approx_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return 56 + sum(_approx_size(v) for v in value)
+    if isinstance(value, (str, bytes)):
+        return 49 + len(value)
+    return 32
+
+
+def summarize_batch(matrix: np.ndarray) -> Dict[str, Any]:
+    """
+    Compact audit entry for a batch: shape and SHA-256 of the raw bytes
+
+    The hash lets an auditor match a logged request against the client's
+    copy of the data without the log holding every row.
+    """
+    matrix = np.ascontiguousarray(matrix)
+    return {
+        'rows': int(matrix.shape[0]) if matrix.ndim else 1,
+        'shape': list(matrix.shape),
+        'dtype': str(matrix.dtype),
+        'sha256': hashlib.sha256(matrix.tobytes()).hexdigest()
+    }
+
+
+class AuditLogger:
+    """
+    Non-blocking audit logger
+
+    Args:
+        directory: Directory for audit files
+        filename: Active audit file name (default: predictions-<pid>.jsonl)
+        capacity: Maximum number of buffered records
+        max_buffer_bytes: Maximum approximate size of the buffered records
+        batch_size: Records written per batch
+        flush_interval: Seconds between flushes when the buffer is not full
+        max_bytes: Rotate the active file once it exceeds this size
+        backup_count: Number of rotated files to keep
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        filename: Optional[str] = None,
+        capacity: int = 10000,
+        max_buffer_bytes: int = 16 * 1024 * 1024,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        max_bytes: int = 50 * 1024 * 1024,
+        backup_count: int = 10
+    ):
+        self.path = os.path.join(directory, filename or f"predictions-{os.getpid()}.jsonl")
+        self.capacity = capacity
+        self.max_buffer_bytes = max_buffer_bytes
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+        self._buffer = deque()
+        self._buffer_bytes = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._stats = {
+            'recorded': 0,
+            'dropped': 0,
+            'dropped_bytes_limit': 0,
+            'written': 0,
+            'batches': 0,
+            'write_errors': 0,
+            'rotations': 0
+        }
+
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, entry: Dict[str, Any]) -> bool:
+        """
+        Buffer one audit record without blocking
+
+        Args:
+            entry: Record fields; numpy values are converted by the writer
+
+        Returns:
+            True if buffered, False if dropped because the buffer is full
+        """
+        size = _approx_size(entry)
+        with self._lock:
+            if len(self._buffer) >= self.capacity:
+                self._stats['dropped'] += 1
+                return False
+            if self._buffer_bytes + size > self.max_buffer_bytes:
+                self._stats['dropped'] += 1
+                self._stats['dropped_bytes_limit'] += 1
+                return False
+
+            entry['ts'] = time.time()
+            self._buffer.append((entry, size))
+            self._buffer_bytes += size
+            self._stats['recorded'] += 1
+            pending = len(self._buffer)
+
+        if pending >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._drain()
+        self._drain()
+
+    def _drain(self):
+        while self._buffer:
+            batch = []
+            with self._lock:
+                while self._buffer and len(batch) < self.batch_size:
+                    entry, size = self._buffer.popleft()
+                    self._buffer_bytes -= size
+                    batch.append(entry)
+            self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        try:
+            lines = []
+            for entry in batch:
+                entry['ts'] = datetime.fromtimestamp(entry['ts'], tz=timezone.utc).isoformat()
+                lines.append(json.dumps(entry, default=_to_serializable, separators=(',', ':')))
+            self._file.write('\n'.join(lines) + '\n')
+            self._file.flush()
+
+            self._stats['written'] += len(batch)
+            self._stats['batches'] += 1
+
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except Exception as e:
+            self._stats['write_errors'] += 1
+            logger.error(f"❌ Audit log write failed: {e}")
+
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._stats['rotations'] += 1
+
+    def close(self):
+        """Flush buffered records and stop the writer thread"""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+        if self._thread.is_alive():
+            # Closing under a writer that is still draining would lose its batch
+            logger.warning("⚠️  Audit log writer still running after 5s, leaving file open")
+            return
+        self._file.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Buffer and writer counters"""
+        return {
+            'path': self.path,
+            'buffered': len(self._buffer),
+            'buffered_bytes': self._buffer_bytes,
+            'capacity': self.capacity,
+            'max_buffer_bytes': self.max_buffer_bytes,
+            **self._stats
+        }
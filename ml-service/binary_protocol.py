@@ -0,0 +1,125 @@
+"""
+Binary Scoring Protocol for ML Service
+Compact request/response encoding for co-located clients (packed float32 arrays)
+
+Request layout (little-endian):
+    magic       4s   b'MHMQ'
+    version     B    protocol version
+    flags       B    reserved, must be 0
+    n_features  H    values per row (Config.FEATURE_NAMES order)
+    n_rows      I    number of rows (1 for single scoring)
+    payload     n_rows * n_features float32, row-major
+
+Response layout (little-endian):
+    magic       4s   b'MHMR'
+    version     B    protocol version
+    flags       B    reserved, 0
+    n_cols      H    values per row (1: probability of diabetes)
+    n_rows      I    number of rows
+    payload     n_rows * n_cols float32, row-major
+"""
+
+import struct
+import numpy as np
+
+CONTENT_TYPE = 'application/x-mhm-scoring'
+PROTOCOL_VERSION = 1
+
+REQUEST_MAGIC = b'MHMQ'
+RESPONSE_MAGIC = b'MHMR'
+
+_HEADER = struct.Struct('<4sBBHI')
+_DTYPE = np.dtype('<f4')
+
+HEADER_SIZE = _HEADER.size
+
+
+class ProtocolError(ValueError):
+    """Raised when a binary payload cannot be decoded"""
+
+
+def _decode(buffer: bytes, magic: bytes) -> np.ndarray:
+    if len(buffer) < HEADER_SIZE:
+        raise ProtocolError(f"Payload too short: {len(buffer)} bytes")
+
+    got_magic, version, flags, n_cols, n_rows = _HEADER.unpack_from(buffer)
+    if got_magic != magic:
+        raise ProtocolError("Invalid magic bytes")
+    if version != PROTOCOL_VERSION:
+        raise ProtocolError(f"Unsupported protocol version: {version}")
+    if flags != 0:
+        raise ProtocolError(f"Unsupported flags: {flags}")
+
+    expected = HEADER_SIZE + n_rows * n_cols * _DTYPE.itemsize
+    if len(buffer) != expected:
+        raise ProtocolError(f"Payload size mismatch: expected {expected} bytes, got {len(buffer)}")
+
+    # Zero-copy view over the request body, reshaped to (rows, cols)
+    values = np.frombuffer(buffer, dtype=_DTYPE, offset=HEADER_SIZE)
+    return values.reshape(n_rows, n_cols)
+
+
+def _encode(values: np.ndarray, magic: bytes) -> bytes:
+    values = np.ascontiguousarray(values, dtype=_DTYPE)
+    if values.ndim == 1:
+        values = values.reshape(-1, 1)
+    n_rows, n_cols = values.shape
+    return _HEADER.pack(magic, PROTOCOL_VERSION, 0, n_cols, n_rows) + values.tobytes()
+
+
+def decode_request(buffer: bytes, n_features: int) -> np.ndarray:
+    """
+    Decode a binary scoring request
+
+    Args:
+        buffer: Raw request body
+        n_features: Number of features the model expects
+
+    Returns:
+        float64 array of shape (n_rows, n_features)
+    """
+    features = _decode(buffer, REQUEST_MAGIC)
+    if features.shape[1] != n_features:
+        raise ProtocolError(f"Expected {n_features} features per row, got {features.shape[1]}")
+    if features.shape[0] == 0:
+        raise ProtocolError("No rows provided in request")
+    return features.astype(np.float64)
+
+
+def encode_response(probabilities: np.ndarray) -> bytes:
+    """
+    Encode diabetes probabilities (one per row) as a binary response
+
+    Args:
+        probabilities: Array of P(diabetes), shape (n_rows,)
+
+    Returns:
+        Encoded response bytes
+    """
+    return _encode(probabilities, RESPONSE_MAGIC)
+
+
+def encode_request(features: np.ndarray) -> bytes:
+    """
+    Encode a feature matrix as a binary scoring request (client side)
+
+    Args:
+        features: Array of shape (n_features,) or (n_rows, n_features)
+
+    Returns:
+        Encoded request bytes
+    """
+    features = np.asarray(features)
+    if features.ndim == 1:
+        features = features.reshape(1, -1)
+    return _encode(features, REQUEST_MAGIC)
+
+
+def decode_response(buffer: bytes) -> np.ndarray:
+    """
+    Decode a binary scoring response (client side)
+
+    Returns:
+        float32 array of P(diabetes), shape (n_rows,)
+    """
+    return _decode(buffer, RESPONSE_MAGIC)[:, 0]
@@ -18,6 +18,12 @@ class Config:
     HOST = os.getenv('ML_HOST', '0.0.0.0')
     PORT = int(os.getenv('ML_PORT', 5001))
     
+    # Optional Unix domain socket listener for co-located clients (empty = disabled)
+    UNIX_SOCKET_PATH = os.getenv('ML_UNIX_SOCKET', '')
+    
+    # Binary Scoring Protocol Configuration
+    BINARY_MAX_ROWS = int(os.getenv('BINARY_MAX_ROWS', 10000))
+    
     # CORS Configuration
     @classmethod
     def get_allowed_origins(cls) -> List[str]:
@@ -38,16 +44,42 @@ class Config:
         'Authorization', 
         'X-Requested-With',
         'Accept',
-        'Origin'
+        'Origin',
+        'X-Request-Timeout-Ms',
+        'X-Request-Deadline'
     ]
-    EXPOSED_HEADERS = ['Content-Length', 'X-Request-Id']
+    EXPOSED_HEADERS = ['Content-Length', 'X-Request-Id', 'X-Deadline-Exceeded']
     SUPPORTS_CREDENTIALS = True
     MAX_AGE = 3600  # 1 hour for preflight cache
     
     # Model Configuration
     MODEL_DIR = os.path.join(os.path.dirname(__file__), 'models')
     MODEL_VERSION = os.getenv('MODEL_VERSION', '20251023_210956')
-    MODEL_TYPE = 'logistic_regression'
+    MODEL_TYPE = os.getenv('MODEL_TYPE', 'logistic_regression')
+    
+    # Shared-memory Model Weights (one copy of the parameters for all workers on a host)
+    SHARED_WEIGHTS_ENABLED = os.getenv('SHARED_WEIGHTS_ENABLED', 'False').lower() == 'true'
+    SHARED_WEIGHTS_PREFIX = os.getenv('SHARED_WEIGHTS_PREFIX', 'mhm')
+    SHARED_WEIGHTS_TIMEOUT = float(os.getenv('SHARED_WEIGHTS_TIMEOUT', 30))
+    
+    # Ensemble Serving Configuration
+    # ENSEMBLE_MEMBERS: comma-separated model_type:version[:weight[:budget_ms]]
+    ENSEMBLE_ENABLED = os.getenv('ENSEMBLE_ENABLED', 'False').lower() == 'true'
+    ENSEMBLE_MEMBERS = os.getenv('ENSEMBLE_MEMBERS', '')
+    ENSEMBLE_METHOD = os.getenv('ENSEMBLE_METHOD', 'weighted')  # 'weighted' or 'stacking'
+    ENSEMBLE_STACKING_INTERCEPT = float(os.getenv('ENSEMBLE_STACKING_INTERCEPT', 0.0))
+    ENSEMBLE_MEMBER_BUDGET_MS = float(os.getenv('ENSEMBLE_MEMBER_BUDGET_MS', 50))
+    ENSEMBLE_MAX_WORKERS = int(os.getenv('ENSEMBLE_MAX_WORKERS', 0))  # 0 = 4 per member
+    
+    # Shadow Evaluation Configuration (candidate model scored off the hot path)
+    SHADOW_ENABLED = os.getenv('SHADOW_ENABLED', 'False').lower() == 'true'
+    SHADOW_MODEL_TYPE = os.getenv('SHADOW_MODEL_TYPE', MODEL_TYPE)
+    SHADOW_MODEL_VERSION = os.getenv('SHADOW_MODEL_VERSION', '')
+    SHADOW_SAMPLE_RATE = float(os.getenv('SHADOW_SAMPLE_RATE', 0.1))
+    SHADOW_QUEUE_SIZE = int(os.getenv('SHADOW_QUEUE_SIZE', 1000))
+    SHADOW_QUEUE_MAX_BYTES = int(os.getenv('SHADOW_QUEUE_MAX_BYTES', 16 * 1024 * 1024))
+    SHADOW_MAX_ROWS = int(os.getenv('SHADOW_MAX_ROWS', 256))  # Rows sampled from a batch request
+    SHADOW_LATENCY_WINDOW = int(os.getenv('SHADOW_LATENCY_WINDOW', 10000))
     
     # Feature Configuration
     FEATURE_NAMES = [
@@ -67,27 +99,86 @@ class Config:
         'Age': (18, 120)
     }
     
+    # Explanation Configuration
+    EXPLAIN_MAX_RECORDS = int(os.getenv('EXPLAIN_MAX_RECORDS', 1000))
+    
+    # What-if Sweep Configuration
+    SWEEP_DEFAULT_STEPS = int(os.getenv('SWEEP_DEFAULT_STEPS', 50))
+    SWEEP_MAX_POINTS = int(os.getenv('SWEEP_MAX_POINTS', 2500))
+    
+    # Feature Drift Monitor Configuration
+    DRIFT_MONITOR_ENABLED = os.getenv('DRIFT_MONITOR_ENABLED', 'True').lower() == 'true'
+    DRIFT_BINS = int(os.getenv('DRIFT_BINS', 20))  # Used only when the artifact has no reference profile
+    
+    # Admission Control Configuration (separate budgets for single and batch scoring)
+    ADMISSION_ENABLED = os.getenv('ADMISSION_ENABLED', 'True').lower() == 'true'
+    ADMISSION_PREDICT_CONCURRENCY = int(os.getenv('ADMISSION_PREDICT_CONCURRENCY', 16))
+    ADMISSION_PREDICT_QUEUE = int(os.getenv('ADMISSION_PREDICT_QUEUE', 32))
+    ADMISSION_BATCH_CONCURRENCY = int(os.getenv('ADMISSION_BATCH_CONCURRENCY', 4))
+    ADMISSION_BATCH_QUEUE = int(os.getenv('ADMISSION_BATCH_QUEUE', 8))
+    ADMISSION_QUEUE_TIMEOUT_MS = float(os.getenv('ADMISSION_QUEUE_TIMEOUT_MS', 500))
+    ADMISSION_ADAPTIVE = os.getenv('ADMISSION_ADAPTIVE', 'True').lower() == 'true'
+    ADMISSION_MIN_CONCURRENCY = int(os.getenv('ADMISSION_MIN_CONCURRENCY', 2))
+    ADMISSION_TARGET_LATENCY_MS = float(os.getenv('ADMISSION_TARGET_LATENCY_MS', 0))  # 0 = derive from observed latency
+    
+    # Request Deadline Configuration (X-Request-Timeout-Ms / X-Request-Deadline headers)
+    DEADLINE_ENABLED = os.getenv('DEADLINE_ENABLED', 'True').lower() == 'true'
+    DEADLINE_DEFAULT_MS = float(os.getenv('DEADLINE_DEFAULT_MS', 10000))  # Backend client timeout; 0 = no deadline without header
+    DEADLINE_MAX_MS = float(os.getenv('DEADLINE_MAX_MS', 60000))  # Cap on caller-supplied budgets; 0 = uncapped
+    BATCH_CHUNK_ROWS = int(os.getenv('BATCH_CHUNK_ROWS', 1000))  # Rows per chunk between deadline/disconnect checks
+    
+    # Warm-up / Readiness Configuration
+    WARMUP_ENABLED = os.getenv('WARMUP_ENABLED', 'True').lower() == 'true'
+    WARMUP_SAMPLES = int(os.getenv('WARMUP_SAMPLES', 200))
+    WARMUP_SELFTEST_ITERATIONS = int(os.getenv('WARMUP_SELFTEST_ITERATIONS', 50))
+    READY_MAX_P99_MS = float(os.getenv('READY_MAX_P99_MS', 0))  # 0 = no latency budget
+    READY_RETRY_SECONDS = float(os.getenv('READY_RETRY_SECONDS', 5))  # First self-test retry delay, 0 = no retries
+    READY_RETRY_MAX_SECONDS = float(os.getenv('READY_RETRY_MAX_SECONDS', 300))
+    
+    # Admin Endpoints (disabled unless a token is configured; sent as X-Admin-Token)
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+    
+    # On-demand Profiling Configuration (admin only; no hooks are installed when disabled)
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False').lower() == 'true'
+    PROFILING_TRACE_FRAMES = int(os.getenv('PROFILING_TRACE_FRAMES', 1))
+    PROFILING_MAX_SNAPSHOTS = int(os.getenv('PROFILING_MAX_SNAPSHOTS', 4))
+    PROFILING_CPU_INTERVAL_MS = float(os.getenv('PROFILING_CPU_INTERVAL_MS', 10))
+    PROFILING_CPU_MAX_SECONDS = float(os.getenv('PROFILING_CPU_MAX_SECONDS', 60))
+    
     # Logging Configuration
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     
+    # Prediction Audit Log Configuration (buffered JSON-lines, written off the request thread)
+    # Opt-in: records hold patient features and client IPs in plain text
+    AUDIT_LOG_ENABLED = os.getenv('AUDIT_LOG_ENABLED', 'False').lower() == 'true'
+    AUDIT_LOG_DIR = os.getenv('AUDIT_LOG_DIR', os.path.join(os.path.dirname(__file__), 'logs', 'audit'))
+    AUDIT_LOG_CAPACITY = int(os.getenv('AUDIT_LOG_CAPACITY', 10000))
+    AUDIT_LOG_MAX_BUFFER_BYTES = int(os.getenv('AUDIT_LOG_MAX_BUFFER_BYTES', 16 * 1024 * 1024))
+    AUDIT_LOG_BATCH_SIZE = int(os.getenv('AUDIT_LOG_BATCH_SIZE', 256))
+    AUDIT_LOG_FLUSH_INTERVAL = float(os.getenv('AUDIT_LOG_FLUSH_INTERVAL', 1.0))
+    AUDIT_LOG_MAX_BYTES = int(os.getenv('AUDIT_LOG_MAX_BYTES', 50 * 1024 * 1024))
+    AUDIT_LOG_BACKUP_COUNT = int(os.getenv('AUDIT_LOG_BACKUP_COUNT', 10))
+    # Binary batches up to this many rows log per-row outputs; larger ones only a summary
+    AUDIT_LOG_MAX_BATCH_ROWS = int(os.getenv('AUDIT_LOG_MAX_BATCH_ROWS', 1000))
+    
     @classmethod
-    def get_model_path(cls) -> str:
-        """Get full path to model file"""
+    def get_model_path(cls, model_type: str = None, version: str = None) -> str:
+        """Get full path to model file (defaults to the served model)"""
         return os.path.join(
             cls.MODEL_DIR, 
-            f'diabetes_model_{cls.MODEL_TYPE}_{cls.MODEL_VERSION}.joblib'
+            f'diabetes_model_{model_type or cls.MODEL_TYPE}_{version or cls.MODEL_VERSION}.joblib'
         )
     
     @classmethod
-    def get_scaler_path(cls) -> str:
+    def get_scaler_path(cls, version: str = None) -> str:
         """Get full path to scaler file"""
-        return os.path.join(cls.MODEL_DIR, f'scaler_{cls.MODEL_VERSION}.joblib')
+        return os.path.join(cls.MODEL_DIR, f'scaler_{version or cls.MODEL_VERSION}.joblib')
     
     @classmethod
-    def get_metadata_path(cls) -> str:
+    def get_metadata_path(cls, version: str = None) -> str:
         """Get full path to metadata file"""
-        return os.path.join(cls.MODEL_DIR, f'model_metadata_{cls.MODEL_VERSION}.json')
+        return os.path.join(cls.MODEL_DIR, f'model_metadata_{version or cls.MODEL_VERSION}.json')
     
     @classmethod
     def validate_feature_value(cls, feature_name: str, value: float) -> bool:
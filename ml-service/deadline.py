@@ -0,0 +1,134 @@
+"""
+Request Deadlines for ML Service
+Propagates the caller's deadline through a request so expired work is abandoned
+
+Callers send how long they are willing to wait, either as a relative budget
+(``X-Request-Timeout-Ms``) or as an absolute Unix time in milliseconds
+(``X-Request-Deadline``); requests without either get a configured default.
+The deadline is checked before each costly stage (admission queue,
+preprocessing, scoring, every chunk of a batch) and the request is dropped
+as soon as the answer could no longer be delivered in time. Batch endpoints
+also stop between chunks once the client has disconnected.
+"""
+
+import math
+import select
+import socket
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+TIMEOUT_HEADER = 'X-Request-Timeout-Ms'
+DEADLINE_HEADER = 'X-Request-Deadline'
+
+
+class Deadline:
+    """
+    Point in time (monotonic clock) after which a request's result is useless
+
+    Args:
+        timeout_ms: Time budget from now
+    """
+
+    def __init__(self, timeout_ms: float):
+        self.timeout_ms = timeout_ms
+        self.expires_at = time.monotonic() + timeout_ms / 1000
+
+    @classmethod
+    def from_headers(
+        cls,
+        headers: Mapping[str, str],
+        default_ms: float,
+        max_ms: float = 0
+    ) -> Optional['Deadline']:
+        """
+        Build the deadline of a request from its headers
+
+        Args:
+            headers: Request headers
+            default_ms: Budget when the caller sends no deadline (0 = no deadline)
+            max_ms: Upper bound for caller-supplied budgets (0 = unbounded)
+
+        Returns:
+            Deadline, or None when neither the caller nor the default sets one
+        """
+        timeout_ms = None
+        try:
+            if headers.get(TIMEOUT_HEADER):
+                timeout_ms = float(headers[TIMEOUT_HEADER])
+            elif headers.get(DEADLINE_HEADER):
+                timeout_ms = float(headers[DEADLINE_HEADER]) - time.time() * 1000
+        except ValueError:
+            timeout_ms = None
+        if timeout_ms is not None and not math.isfinite(timeout_ms):
+            # float() accepts 'nan' and 'inf'; treat them like a missing header
+            timeout_ms = None
+
+        if timeout_ms is None:
+            if not default_ms:
+                return None
+            timeout_ms = default_ms
+        elif max_ms:
+            timeout_ms = min(timeout_ms, max_ms)
+        return cls(timeout_ms)
+
+    def remaining(self) -> float:
+        """Seconds left (negative once expired)"""
+        return self.expires_at - time.monotonic()
+
+    def expired(self, reserve: float = 0) -> bool:
+        """Whether less than ``reserve`` seconds are left"""
+        return self.remaining() <= reserve
+
+
+class AbandonedWorkStats:
+    """Thread-safe counters of requests dropped for deadlines or disconnects"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._expired = {}
+        self._disconnected = {}
+
+    def record_expired(self, stage: str):
+        with self._lock:
+            self._expired[stage] = self._expired.get(stage, 0) + 1
+
+    def record_disconnect(self, stage: str):
+        with self._lock:
+            self._disconnected[stage] = self._disconnected.get(stage, 0) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'deadline_exceeded_total': sum(self._expired.values()),
+                'deadline_exceeded_by_stage': dict(self._expired),
+                'client_disconnected_total': sum(self._disconnected.values()),
+                'client_disconnected_by_stage': dict(self._disconnected)
+            }
+
+
+def client_disconnected(environ: Mapping[str, Any]) -> bool:
+    """
+    Whether the client has closed the connection of the current request
+
+    Uses the raw socket exposed by the WSGI server (Werkzeug or Gunicorn): a
+    readable socket whose peek returns no data has been closed by the peer.
+    Returns False when the server does not expose the socket.
+    """
+    sock = environ.get('werkzeug.socket') or environ.get('gunicorn.socket')
+    if sock is None:
+        return False
+
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+        if not readable:
+            return False
+        return sock.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) == b''
+    except (BlockingIOError, InterruptedError):
+        return False
+    except ValueError:
+        # Closed locally or a TLS socket that does not support peeking
+        return False
+    except OSError:
+        # Connection reset by the peer
+        return True
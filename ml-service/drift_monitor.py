@@ -0,0 +1,277 @@
+"""
+Feature Drift Monitor for ML Service
+Streams incoming features into constant-memory sketches and compares them
+with the reference distribution stored alongside the model artifact
+
+Updates go to one of a fixed set of striped accumulators (fixed-bin
+histograms plus running mean/variance) picked from the calling thread's id,
+each behind its own lock, so concurrent workers rarely contend and nothing
+is allocated per thread (the Flask dev server starts a thread per request).
+Stripes are merged only when a report is requested.
+"""
+
+import os
+import json
+import threading
+import numpy as np
+from typing import Any, Dict, List, Optional
+
+DEFAULT_BINS = 20
+
+# Population Stability Index interpretation thresholds
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+
+_EPSILON = 1e-6
+
+
+def build_bin_edges(feature_names: List[str], feature_ranges: Dict[str, tuple], n_bins: int) -> np.ndarray:
+    """Equal-width bin edges over each feature's configured range, shape (n_features, n_bins + 1)"""
+    return np.array([
+        np.linspace(feature_ranges[name][0], feature_ranges[name][1], n_bins + 1)
+        for name in feature_names
+    ])
+
+
+def _bin_indices(features: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Histogram bin index per value (values outside the range land in the edge bins)"""
+    lower = edges[:, 0]
+    width = (edges[:, -1] - lower) / (edges.shape[1] - 1)
+    indices = np.floor((features - lower) / width).astype(np.int64)
+    return np.clip(indices, 0, edges.shape[1] - 2)
+
+
+def compute_reference_profile(
+    features: np.ndarray,
+    feature_names: List[str],
+    feature_ranges: Dict[str, tuple],
+    n_bins: int = DEFAULT_BINS
+) -> Dict[str, Any]:
+    """
+    Summarize a training feature matrix for drift comparison
+
+    Args:
+        features: Raw (unscaled) feature matrix, shape (n_rows, n_features)
+        feature_names: Ordered list of feature names
+        feature_ranges: Mapping of feature name to (min, max)
+        n_bins: Histogram bins per feature
+
+    Returns:
+        JSON-serializable profile with per-feature bin edges, counts, mean and std
+    """
+    features = np.asarray(features, dtype=np.float64)
+    edges = build_bin_edges(feature_names, feature_ranges, n_bins)
+    indices = _bin_indices(features, edges)
+
+    profile = {'n_samples': int(features.shape[0]), 'n_bins': n_bins, 'features': {}}
+    for col, name in enumerate(feature_names):
+        profile['features'][name] = {
+            'bin_edges': edges[col].tolist(),
+            'counts': np.bincount(indices[:, col], minlength=n_bins).tolist(),
+            'mean': float(features[:, col].mean()),
+            'std': float(features[:, col].std())
+        }
+    return profile
+
+
+def merge_reference_profiles(profile: Optional[Dict[str, Any]], other: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combine two reference profiles built over the same bins (e.g. from data chunks)
+
+    Args:
+        profile: Accumulated profile, or None to start from ``other``
+        other: Profile of the next chunk
+
+    Returns:
+        Profile equivalent to compute_reference_profile over both inputs
+    """
+    if profile is None:
+        return other
+
+    n_a, n_b = profile['n_samples'], other['n_samples']
+    total = n_a + n_b
+    merged = {'n_samples': total, 'n_bins': profile['n_bins'], 'features': {}}
+    for name, a in profile['features'].items():
+        b = other['features'][name]
+        delta = b['mean'] - a['mean']
+        m2 = a['std'] ** 2 * n_a + b['std'] ** 2 * n_b + delta ** 2 * n_a * n_b / max(total, 1)
+        merged['features'][name] = {
+            'bin_edges': a['bin_edges'],
+            'counts': [x + y for x, y in zip(a['counts'], b['counts'])],
+            'mean': a['mean'] + delta * n_b / max(total, 1),
+            'std': float(np.sqrt(m2 / max(total, 1)))
+        }
+    return merged
+
+
+def population_stability_index(reference: np.ndarray, live: np.ndarray) -> float:
+    """PSI between two histograms over the same bins"""
+    ref = reference / max(reference.sum(), 1) + _EPSILON
+    cur = live / max(live.sum(), 1) + _EPSILON
+    return float(np.sum((cur - ref) * np.log(cur / ref)))
+
+
+def binned_ks_statistic(reference: np.ndarray, live: np.ndarray) -> float:
+    """Kolmogorov-Smirnov statistic evaluated at the histogram bin edges"""
+    ref_cdf = np.cumsum(reference) / max(reference.sum(), 1)
+    cur_cdf = np.cumsum(live) / max(live.sum(), 1)
+    return float(np.max(np.abs(ref_cdf - cur_cdf)))
+
+
+class _Accumulator:
+    """Streaming sketch: histogram counts and Welford moments"""
+
+    def __init__(self, n_features: int, n_bins: int):
+        self.counts = np.zeros((n_features, n_bins), dtype=np.int64)
+        self.n = 0
+        self.mean = np.zeros(n_features, dtype=np.float64)
+        self.m2 = np.zeros(n_features, dtype=np.float64)
+        self._columns = np.arange(n_features)
+
+    def update(self, features: np.ndarray, indices: np.ndarray):
+        m = features.shape[0]
+        if m == 1:
+            self.counts[self._columns, indices[0]] += 1
+        else:
+            np.add.at(self.counts, (np.broadcast_to(self._columns, indices.shape), indices), 1)
+
+        batch_mean = features.mean(axis=0)
+        batch_m2 = ((features - batch_mean) ** 2).sum(axis=0)
+        self._combine(m, batch_mean, batch_m2)
+
+    def merge(self, other: '_Accumulator'):
+        if other.n:
+            self.counts += other.counts
+            self._combine(other.n, other.mean, other.m2)
+
+    def _combine(self, m: int, mean: np.ndarray, m2: np.ndarray):
+        # Chan et al. parallel update of mean and sum of squared deviations
+        total = self.n + m
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (m / total)
+        self.m2 = self.m2 + m2 + delta ** 2 * (self.n * m / total)
+        self.n = total
+
+
+class DriftMonitor:
+    """
+    Streaming feature drift monitor
+
+    Args:
+        feature_names: Ordered list of feature names
+        feature_ranges: Mapping of feature name to (min, max)
+        reference: Reference profile from compute_reference_profile (optional)
+        n_bins: Histogram bins per feature when no reference is available
+    """
+
+    # Number of striped accumulators (threads are spread over them by id)
+    STRIPES = 16
+
+    def __init__(
+        self,
+        feature_names: List[str],
+        feature_ranges: Dict[str, tuple],
+        reference: Optional[Dict[str, Any]] = None,
+        n_bins: int = DEFAULT_BINS
+    ):
+        self.feature_names = feature_names
+        self.reference = reference
+
+        if reference:
+            # Reuse the training-time bins so histograms are directly comparable
+            self.edges = np.array([reference['features'][name]['bin_edges'] for name in feature_names])
+            self.reference_counts = np.array([reference['features'][name]['counts'] for name in feature_names])
+        else:
+            self.edges = build_bin_edges(feature_names, feature_ranges, n_bins)
+            self.reference_counts = None
+
+        self._stripes = [(threading.Lock(), self._new_accumulator()) for _ in range(self.STRIPES)]
+
+    def _new_accumulator(self) -> _Accumulator:
+        return _Accumulator(len(self.feature_names), self.edges.shape[1] - 1)
+
+    def _stripe(self):
+        # Thread ids are aligned addresses; Fibonacci hashing spreads their high bits
+        ident = threading.get_ident()
+        mixed = (ident * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        return self._stripes[(mixed >> 32) % self.STRIPES]
+
+    def update(self, features: np.ndarray):
+        """
+        Add raw feature rows to the calling thread's stripe
+
+        Args:
+            features: Raw feature matrix, shape (n_rows, n_features)
+        """
+        indices = _bin_indices(features, self.edges)
+        lock, acc = self._stripe()
+        with lock:
+            acc.update(features, indices)
+
+    def _merge(self) -> _Accumulator:
+        merged = self._new_accumulator()
+        for lock, acc in self._stripes:
+            with lock:
+                merged.merge(acc)
+        return merged
+
+    def get_report(self) -> Dict[str, Any]:
+        """Merge all worker accumulators and score drift per feature"""
+        merged = self._merge()
+        counts, n, mean = merged.counts, merged.n, merged.mean
+        std = np.sqrt(merged.m2 / n) if n else np.zeros_like(mean)
+
+        features = {}
+        for col, name in enumerate(self.feature_names):
+            entry = {
+                'mean': float(mean[col]) if n else None,
+                'std': float(std[col]) if n else None,
+                'counts': counts[col].tolist()
+            }
+            if self.reference_counts is not None and n:
+                ref = self.reference['features'][name]
+                psi = population_stability_index(self.reference_counts[col], counts[col])
+                entry.update({
+                    'psi': round(psi, 6),
+                    'ks': round(binned_ks_statistic(self.reference_counts[col], counts[col]), 6),
+                    'mean_shift_std': round((float(mean[col]) - ref['mean']) / (ref['std'] or 1.0), 6),
+                    'status': (
+                        'significant' if psi >= PSI_SIGNIFICANT
+                        else 'moderate' if psi >= PSI_MODERATE
+                        else 'stable'
+                    )
+                })
+            features[name] = entry
+
+        scored = [f['psi'] for f in features.values() if 'psi' in f]
+        return {
+            'observations': int(n),
+            'stripes': self.STRIPES,
+            'reference_available': self.reference_counts is not None,
+            'reference_samples': self.reference['n_samples'] if self.reference else None,
+            'bin_edges': {name: self.edges[col].tolist() for col, name in enumerate(self.feature_names)},
+            'max_psi': max(scored) if scored else None,
+            'features': features
+        }
+
+
+if __name__ == '__main__':
+    # Backfill the reference profile into an existing model_metadata_*.json
+    import sys
+    import pandas as pd
+    from config import Config
+
+    version = sys.argv[1] if len(sys.argv) > 1 else Config.MODEL_VERSION
+    data_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(os.path.dirname(__file__), 'data', 'pima_clean.csv')
+    metadata_path = Config.get_metadata_path(version)
+
+    df = pd.read_csv(data_path)
+    profile = compute_reference_profile(df[Config.FEATURE_NAMES].values, Config.FEATURE_NAMES, Config.FEATURE_RANGES)
+
+    with open(metadata_path, 'r') as f:
+        metadata = json.load(f)
+    metadata['reference_profile'] = profile
+    with open(metadata_path, 'w') as f:
+        json.dump(metadata, f, indent=2)
+
+    print(f"✅ Reference profile ({profile['n_samples']} samples) written to {metadata_path}")
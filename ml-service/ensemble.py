@@ -0,0 +1,288 @@
+"""
+Ensemble Serving for ML Service
+Evaluates several trained models concurrently and combines their probabilities
+
+Members are scored on a shared thread pool (NumPy and most tree libraries
+release the GIL), so an ensemble costs roughly its slowest member rather than
+the sum of all members. A member that misses its latency budget is dropped
+from that request's vote.
+
+Python threads cannot be interrupted, so a member that misses its budget
+keeps its pool thread until its call returns. To stop one slow member from
+taking over the pool, each member may have at most ``max_workers / members``
+calls in flight; while it is at that cap it is skipped (reason
+'overloaded') instead of being queued behind its own backlog.
+"""
+
+import os
+import time
+import threading
+import joblib
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+import logging
+
+from utils import strip_feature_names
+
+logger = logging.getLogger(__name__)
+
+COMBINE_METHODS = ('weighted', 'stacking')
+
+_EPSILON = 1e-6
+
+
+class EnsembleUnavailableError(RuntimeError):
+    """Raised when no ensemble member answers within its latency budget"""
+
+
+@dataclass
+class EnsembleMember:
+    """One trained model (with its own scaler) taking part in the ensemble"""
+    name: str
+    model: Any
+    scaler: Any
+    weight: float = 1.0
+    budget_ms: float = 50.0
+    stats: Dict[str, int] = field(default_factory=lambda: {'used': 0, 'dropped': 0, 'errors': 0})
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """Return P(diabetes) for raw (unscaled) features"""
+        return self.model.predict_proba(self.scaler.transform(features))[:, 1]
+
+
+def parse_member_specs(spec: str, default_budget_ms: float) -> List[Dict[str, Any]]:
+    """
+    Parse ENSEMBLE_MEMBERS
+
+    Format: comma-separated ``model_type:version[:weight[:budget_ms]]``, e.g.
+    ``logistic_regression:20251023_210956:0.6,logistic_regression:20251023_210425:0.4:30``
+
+    Returns:
+        List of dicts with model_type, version, weight and budget_ms
+    """
+    members = []
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        parts = item.split(':')
+        if len(parts) < 2 or len(parts) > 4:
+            raise ValueError(f"Invalid ensemble member spec: '{item}'")
+        members.append({
+            'model_type': parts[0],
+            'version': parts[1],
+            'weight': float(parts[2]) if len(parts) > 2 and parts[2] else 1.0,
+            'budget_ms': float(parts[3]) if len(parts) > 3 and parts[3] else default_budget_ms
+        })
+    return members
+
+
+def load_members(model_dir: str, specs: List[Dict[str, Any]]) -> List[EnsembleMember]:
+    """Load model and scaler artifacts for each member spec"""
+    members = []
+    for spec in specs:
+        model_path = os.path.join(
+            model_dir, f"diabetes_model_{spec['model_type']}_{spec['version']}.joblib"
+        )
+        scaler_path = os.path.join(model_dir, f"scaler_{spec['version']}.joblib")
+        logger.info(f"Loading ensemble member from: {model_path}")
+        members.append(EnsembleMember(
+            name=f"{spec['model_type']}_{spec['version']}",
+            model=strip_feature_names(joblib.load(model_path)),
+            scaler=strip_feature_names(joblib.load(scaler_path)),
+            weight=spec['weight'],
+            budget_ms=spec['budget_ms']
+        ))
+    return members
+
+
+def _logit(p: np.ndarray) -> np.ndarray:
+    p = np.clip(p, _EPSILON, 1 - _EPSILON)
+    return np.log(p / (1 - p))
+
+
+class EnsembleScorer:
+    """
+    Concurrent ensemble over several loaded models
+
+    Args:
+        members: Loaded ensemble members
+        method: 'weighted' (weighted average of probabilities) or 'stacking'
+            (logistic meta-model over member logits, member weights are its
+            coefficients). The meta-model is only valid for the full member
+            set, so a stacked request that loses a member falls back to the
+            plain average of the members that answered.
+        intercept: Stacking meta-model intercept
+        max_workers: Thread pool size (defaults to 4 threads per member),
+            split evenly into per-member in-flight caps
+    """
+
+    def __init__(
+        self,
+        members: List[EnsembleMember],
+        method: str = 'weighted',
+        intercept: float = 0.0,
+        max_workers: int = 0
+    ):
+        if not members:
+            raise ValueError("Ensemble requires at least one member")
+        if method not in COMBINE_METHODS:
+            raise ValueError(f"Ensemble method must be one of: {', '.join(COMBINE_METHODS)}")
+
+        self.members = members
+        self.method = method
+        self.intercept = intercept
+        max_workers = max_workers or 4 * len(members)
+        self.max_in_flight = max(1, max_workers // len(members))
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(max_workers, len(members)),
+            thread_name_prefix='ensemble'
+        )
+        self._lock = threading.Lock()
+        self._in_flight = {id(m): 0 for m in members}
+
+    @property
+    def name(self) -> str:
+        return f"Ensemble ({self.method}: {', '.join(m.name for m in self.members)})"
+
+    def _combine(self, members: List[EnsembleMember], probabilities: List[np.ndarray]) -> Tuple[np.ndarray, str]:
+        """Combined probabilities and the combination actually used"""
+        stacked = np.vstack(probabilities)
+
+        if self.method == 'stacking':
+            if len(members) < len(self.members):
+                # Intercept and coefficients were fitted for the full member set
+                return stacked.mean(axis=0), 'average'
+            weights = np.array([m.weight for m in members], dtype=np.float64)
+            return 1 / (1 + np.exp(-(self.intercept + weights @ _logit(stacked)))), 'stacking'
+
+        weights = np.array([m.weight for m in members], dtype=np.float64)
+        return (weights @ stacked) / weights.sum(), 'weighted'
+
+    def _count(self, member: EnsembleMember, key: str):
+        with self._lock:
+            member.stats[key] += 1
+
+    def _submit(self, member: EnsembleMember, features: np.ndarray):
+        """Schedule a member call, or return None while the member is at its in-flight cap"""
+        with self._lock:
+            if self._in_flight[id(member)] >= self.max_in_flight:
+                return None
+            self._in_flight[id(member)] += 1
+
+        def finished(_):
+            with self._lock:
+                self._in_flight[id(member)] -= 1
+
+        future = self._executor.submit(member.predict_proba, features)
+        future.add_done_callback(finished)
+        return future
+
+    def predict_proba(self, features: np.ndarray) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Score raw features with every member concurrently
+
+        Args:
+            features: Raw feature matrix of shape (n_rows, n_features)
+
+        Returns:
+            Tuple of (P(diabetes) per row, details with members used/dropped)
+        """
+        start = time.perf_counter()
+        futures = [(m, self._submit(m, features)) for m in self.members]
+
+        used, dropped, probabilities = [], [], []
+        # Collect in budget order; members keep running concurrently while we wait
+        for member, future in sorted(futures, key=lambda item: item[0].budget_ms):
+            if future is None:
+                dropped.append({'member': member.name, 'reason': 'overloaded'})
+                self._count(member, 'dropped')
+                continue
+            remaining = member.budget_ms / 1000 - (time.perf_counter() - start)
+            try:
+                probabilities.append(future.result(timeout=max(remaining, 0)))
+                used.append(member)
+                self._count(member, 'used')
+            except FutureTimeoutError:
+                # Only stops a call that has not started; a running one finishes in the background
+                future.cancel()
+                dropped.append({'member': member.name, 'reason': 'deadline'})
+                self._count(member, 'dropped')
+            except Exception as e:
+                dropped.append({'member': member.name, 'reason': 'error'})
+                self._count(member, 'errors')
+                logger.warning(f"⚠️  Ensemble member {member.name} failed: {e}")
+
+        if not used:
+            raise EnsembleUnavailableError("No ensemble member answered within its latency budget")
+
+        combined, combined_with = self._combine(used, probabilities)
+        details = {
+            'method': self.method,
+            'combined_with': combined_with,
+            'members_used': [m.name for m in used],
+            'members_dropped': dropped,
+            'latency_ms': round((time.perf_counter() - start) * 1000, 3)
+        }
+        return combined, details
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-member vote counters"""
+        with self._lock:
+            return {
+                'method': self.method,
+                'max_in_flight_per_member': self.max_in_flight,
+                'members': {
+                    m.name: {
+                        'weight': m.weight,
+                        'budget_ms': m.budget_ms,
+                        'in_flight': self._in_flight[id(m)],
+                        **m.stats
+                    }
+                    for m in self.members
+                }
+            }
+
+
+def fit_stacking_weights(members: List[EnsembleMember], features: np.ndarray, y: np.ndarray) -> Dict[str, Any]:
+    """
+    Fit stacking coefficients (logistic regression over member logits)
+
+    Args:
+        members: Loaded ensemble members
+        features: Raw feature matrix
+        y: Binary labels
+
+    Returns:
+        Dict with intercept and per-member weights
+    """
+    from sklearn.linear_model import LogisticRegression
+
+    logits = np.column_stack([_logit(m.predict_proba(features)) for m in members])
+    meta = LogisticRegression(max_iter=1000).fit(logits, y)
+    return {
+        'intercept': float(meta.intercept_[0]),
+        'weights': {m.name: float(w) for m, w in zip(members, meta.coef_[0])}
+    }
+
+
+if __name__ == '__main__':
+    # Fit stacking weights for the configured members on the cleaned dataset
+    import pandas as pd
+    from config import Config
+
+    logging.basicConfig(level=logging.INFO, format=Config.LOG_FORMAT)
+    specs = parse_member_specs(Config.ENSEMBLE_MEMBERS, Config.ENSEMBLE_MEMBER_BUDGET_MS)
+    members = load_members(Config.MODEL_DIR, specs)
+
+    df = pd.read_csv(os.path.join(os.path.dirname(__file__), 'data', 'pima_clean.csv'))
+    fitted = fit_stacking_weights(members, df[Config.FEATURE_NAMES], df['Outcome'].values)
+
+    print("ENSEMBLE_METHOD=stacking")
+    print(f"ENSEMBLE_STACKING_INTERCEPT={fitted['intercept']:.6f}")
+    print("ENSEMBLE_MEMBERS=" + ','.join(
+        f"{spec['model_type']}:{spec['version']}:{fitted['weights'][m.name]:.6f}:{spec['budget_ms']:g}"
+        for spec, m in zip(specs, members)
+    ))
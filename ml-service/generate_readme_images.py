@@ -2,16 +2,19 @@
 Script để tạo các hình ảnh minh họa cho README
 """
 
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.metrics import roc_curve, auc, confusion_matrix
 from sklearn.model_selection import cross_val_score
 import joblib
+import sys
 from pathlib import Path
 import warnings
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'models'))
+from data_loader import load_dataframe
+
 warnings.filterwarnings('ignore')
 
 # Thiết lập style
@@ -25,7 +28,7 @@ images_dir.mkdir(exist_ok=True)
 def load_data():
     """Load dữ liệu Pima"""
     try:
-        df = pd.read_csv('data/pima_clean.csv')
+        df = load_dataframe('data/pima_clean.csv')
         return df
     except FileNotFoundError:
         print("⚠️ Không tìm thấy file pima_clean.csv")
@@ -0,0 +1,330 @@
+"""
+Open-loop Load Test for ML Service
+Replays the prediction payloads of the backend's Postman collection at a fixed
+arrival rate and reports the latency distribution
+
+Requests are issued on a precomputed schedule whether or not earlier ones have
+finished, and each latency is measured from the request's scheduled start, so
+a stalled server shows up as tail latency instead of silently lowering the
+offered load (coordinated omission). Payloads are the collection's request
+bodies with every feature jittered and clipped to Config.FEATURE_RANGES.
+
+Usage:
+    python load_test.py --rate 200 --duration 30                    # in-process server
+    python load_test.py --url http://localhost:5000 --rate 200      # running container
+    python load_test.py --rate 100 --json-out report.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import http.client
+import numpy as np
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from config import Config
+from sensitivity import SweepError, resolve_feature_name
+
+DEFAULT_COLLECTION = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'Backend', 'postman',
+    'MyHealthMate-API.postman_collection.json'
+)
+PERCENTILES = (50, 90, 99, 99.9)
+INTEGER_FEATURES = ('Pregnancies', 'Age')
+
+# Backend -> ML service field names (see Backend/src/services/mlService.js)
+REQUEST_FIELDS = {
+    'Pregnancies': 'pregnancies',
+    'Glucose': 'glucose',
+    'BloodPressure': 'blood_pressure',
+    'SkinThickness': 'skin_thickness',
+    'Insulin': 'insulin',
+    'BMI': 'bmi',
+    'DiabetesPedigreeFunction': 'diabetes_pedigree_function',
+    'Age': 'age'
+}
+
+
+def _walk_requests(items: List[Dict[str, Any]]):
+    for item in items:
+        if 'item' in item:
+            yield from _walk_requests(item['item'])
+        elif 'request' in item:
+            yield item
+
+
+def extract_payloads(collection_path: str, feature_names: List[str]) -> List[Dict[str, float]]:
+    """
+    Prediction bodies of a Postman collection as raw feature rows
+
+    Every request whose JSON body carries all model features (in any naming
+    style) is used; other fields (patientId, ...) are dropped.
+    """
+    with open(collection_path, 'r', encoding='utf-8') as f:
+        collection = json.load(f)
+
+    payloads = []
+    for item in _walk_requests(collection.get('item', [])):
+        raw = (item['request'].get('body') or {}).get('raw')
+        if not raw:
+            continue
+        try:
+            body = json.loads(raw)
+        except ValueError:
+            continue  # Bodies with Postman variables are not plain JSON
+        if not isinstance(body, dict):
+            continue
+
+        row = {}
+        for key, value in body.items():
+            try:
+                feature = resolve_feature_name(key, feature_names)
+            except SweepError:
+                continue
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                row[feature] = float(value)
+        if len(row) == len(feature_names):
+            payloads.append(row)
+
+    if not payloads:
+        raise ValueError(f"No prediction payloads found in {collection_path}")
+    return payloads
+
+
+class PayloadGenerator:
+    """
+    Jittered copies of seed payloads, kept within the feature ranges
+
+    Args:
+        seeds: Raw feature rows to start from
+        feature_ranges: Mapping of feature name to (min, max)
+        jitter: Gaussian noise as a fraction of each feature's range width
+        seed: Random seed
+    """
+
+    def __init__(self, seeds: List[Dict[str, float]], feature_ranges: Dict[str, tuple],
+                 jitter: float = 0.1, seed: int = 42):
+        self.names = list(seeds[0])
+        self.seeds = np.array([[row[name] for name in self.names] for row in seeds])
+        self.low = np.array([feature_ranges[name][0] for name in self.names], dtype=np.float64)
+        self.high = np.array([feature_ranges[name][1] for name in self.names], dtype=np.float64)
+        self.scale = jitter * (self.high - self.low)
+        self.integer = np.array([name in INTEGER_FEATURES for name in self.names])
+        self.rng = np.random.default_rng(seed)
+
+    def generate(self, n: int) -> List[bytes]:
+        """n encoded request bodies"""
+        rows = self.seeds[self.rng.integers(0, len(self.seeds), n)]
+        rows = np.clip(rows + self.rng.normal(0, 1, rows.shape) * self.scale, self.low, self.high)
+        rows[:, self.integer] = np.round(rows[:, self.integer])
+        rows[:, ~self.integer] = np.round(rows[:, ~self.integer], 3)
+
+        fields = [REQUEST_FIELDS[name] for name in self.names]
+        return [
+            json.dumps({field: (int(v) if is_int else float(v)) for field, v, is_int in zip(fields, row, self.integer)}).encode('utf-8')
+            for row in rows
+        ]
+
+
+def arrival_offsets(rate: float, duration: float, poisson: bool = False, seed: int = 42) -> np.ndarray:
+    """Scheduled start times (seconds from test start) for a fixed arrival rate"""
+    n = int(rate * duration)
+    if not poisson:
+        return np.arange(n) / rate
+    gaps = np.random.default_rng(seed).exponential(1 / rate, n)
+    return np.cumsum(gaps) - gaps[0]
+
+
+class _Client:
+    """One keep-alive HTTP connection per worker thread"""
+
+    def __init__(self, base_url: str, timeout: float):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def post(self, path: str, body: bytes) -> int:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            conn.request('POST', self.prefix + path, body, {'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            if response.getheader('Connection', '').lower() == 'close' or response.version == 10:
+                conn.close()
+                self._local.conn = None
+            return response.status
+        except Exception:
+            conn.close()
+            self._local.conn = None
+            raise
+
+
+def run_load(
+    base_url: str,
+    bodies: List[bytes],
+    offsets: np.ndarray,
+    path: str = '/predict',
+    max_workers: int = 64,
+    timeout: float = 10.0
+) -> Dict[str, Any]:
+    """
+    Issue one request per scheduled offset and collect per-request results
+
+    Returns:
+        Dict with latencies (from scheduled start), service times (from actual
+        send), dispatch lag, status counts and wall time
+    """
+    n = len(offsets)
+    client = _Client(base_url, timeout)
+    latency = np.full(n, np.nan)
+    service = np.full(n, np.nan)
+    lag = np.zeros(n)
+    statuses: List[Any] = [None] * n
+
+    def send(i: int, scheduled: float):
+        sent = time.perf_counter()
+        lag[i] = sent - scheduled
+        try:
+            statuses[i] = client.post(path, bodies[i % len(bodies)])
+        except Exception as e:
+            statuses[i] = type(e).__name__
+        done = time.perf_counter()
+        latency[i] = done - scheduled
+        service[i] = done - sent
+
+    start = time.perf_counter() + 0.05
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='load') as pool:
+        for i, offset in enumerate(offsets):
+            scheduled = start + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, i, scheduled)
+    wall = time.perf_counter() - start
+
+    return {
+        'latency': latency,
+        'service': service,
+        'lag': lag,
+        'statuses': statuses,
+        'wall': wall
+    }
+
+
+def _distribution(values: np.ndarray) -> Dict[str, float]:
+    values = values[~np.isnan(values)] * 1000
+    if not len(values):
+        return {}
+    result = {f'p{p:g}': round(float(np.percentile(values, p)), 3) for p in PERCENTILES}
+    result['mean'] = round(float(values.mean()), 3)
+    result['max'] = round(float(values.max()), 3)
+    return result
+
+
+def summarize(run: Dict[str, Any], rate: float, duration: float, target: str, path: str) -> Dict[str, Any]:
+    """JSON-serializable report of a run"""
+    statuses = Counter(str(status) for status in run['statuses'])
+    n = len(run['statuses'])
+    ok = statuses.get('200', 0)
+    return {
+        'target': target,
+        'path': path,
+        'offered_rate': rate,
+        'duration_s': duration,
+        'requests': n,
+        'throughput_rps': round(ok / run['wall'], 2) if run['wall'] else 0.0,
+        'error_rate': round(1 - ok / n, 5) if n else 0.0,
+        'status_counts': dict(statuses.most_common()),
+        'latency_ms': _distribution(run['latency']),
+        'service_time_ms': _distribution(run['service']),
+        'dispatch_lag_ms': _distribution(run['lag'])
+    }
+
+
+def format_summary(report: Dict[str, Any]) -> str:
+    """Human-readable summary of a report"""
+    lines = [
+        f"Target      : {report['target']}{report['path']}",
+        f"Offered     : {report['offered_rate']:g} req/s for {report['duration_s']:g}s ({report['requests']} requests)",
+        f"Throughput  : {report['throughput_rps']:.1f} req/s (2xx)",
+        f"Errors      : {report['error_rate'] * 100:.2f}%  {report['status_counts']}",
+        ''
+    ]
+    columns = [f'p{p:g}' for p in PERCENTILES] + ['mean', 'max']
+    lines.append(f"{'(ms)':<14}" + ''.join(f"{column:>10}" for column in columns))
+    for label, key in (('latency', 'latency_ms'), ('service time', 'service_time_ms'), ('dispatch lag', 'dispatch_lag_ms')):
+        values = report[key]
+        lines.append(f"{label:<14}" + ''.join(f"{values.get(column, float('nan')):>10.2f}" for column in columns))
+    return '\n'.join(lines)
+
+
+def start_in_process_server():
+    """Serve app on an ephemeral local port in a background thread"""
+    from werkzeug.serving import make_server
+    from app import app
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='load-test-server', daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Open-loop load test replaying Postman prediction payloads')
+    parser.add_argument('--url', help='Base URL of a running service (default: start an in-process server)')
+    parser.add_argument('--path', default='/predict', help='Endpoint to drive')
+    parser.add_argument('--rate', type=float, default=50, help='Arrival rate (requests/s)')
+    parser.add_argument('--duration', type=float, default=10, help='Measured duration (s)')
+    parser.add_argument('--warmup', type=float, default=2, help='Unmeasured warm-up at the same rate (s)')
+    parser.add_argument('--poisson', action='store_true', help='Exponential inter-arrival times instead of a constant interval')
+    parser.add_argument('--collection', default=DEFAULT_COLLECTION, help='Postman collection with prediction bodies')
+    parser.add_argument('--jitter', type=float, default=0.1, help='Feature noise as a fraction of the feature range')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--max-workers', type=int, default=64, help='Client threads (bounds requests in flight)')
+    parser.add_argument('--timeout', type=float, default=10, help='Per-request timeout (s)')
+    parser.add_argument('--json-out', help='Write the JSON report here ("-" for stdout)')
+    args = parser.parse_args(argv)
+
+    seeds = extract_payloads(args.collection, Config.FEATURE_NAMES)
+    generator = PayloadGenerator(seeds, Config.FEATURE_RANGES, jitter=args.jitter, seed=args.seed)
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server, base_url = start_in_process_server()
+
+    try:
+        if args.warmup > 0:
+            warmup_offsets = arrival_offsets(args.rate, args.warmup, args.poisson, args.seed + 1)
+            run_load(base_url, generator.generate(len(warmup_offsets)), warmup_offsets,
+                     args.path, args.max_workers, args.timeout)
+
+        offsets = arrival_offsets(args.rate, args.duration, args.poisson, args.seed)
+        run = run_load(base_url, generator.generate(len(offsets)), offsets,
+                       args.path, args.max_workers, args.timeout)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    report = summarize(run, args.rate, args.duration, base_url, args.path)
+    if args.json_out == '-':
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_summary(report))
+        if args.json_out:
+            with open(args.json_out, 'w') as f:
+                json.dump(report, f, indent=2)
+    return 0 if report['error_rate'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
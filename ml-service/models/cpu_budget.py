@@ -0,0 +1,124 @@
+"""
+CPU Budget
+Phân bổ số luồng cho các tác vụ huấn luyện chạy song song để không bị oversubscription
+
+Mỗi tầng song song đều muốn dùng hết core: joblib ở mức models/folds/bộ tham số,
+n_jobs/thread_count bên trong estimator (Random Forest, XGBoost, LightGBM, CatBoost)
+và BLAS/OpenMP bên dưới numpy/scikit-learn. CpuBudget chia tổng số core thành
+outer (số tác vụ chạy đồng thời) x inner (số luồng cho mỗi tác vụ), gán inner
+cho tham số luồng của estimator và giới hạn thread pool native (threadpoolctl).
+"""
+
+import os
+from contextlib import contextmanager
+from typing import NamedTuple, Optional
+
+import joblib
+from threadpoolctl import threadpool_limits
+
+# Tham số số luồng của các estimator (XGBoost/LightGBM/scikit-learn dùng n_jobs)
+THREAD_PARAMS = ('n_jobs', 'thread_count', 'nthread')
+
+
+def available_cpus() -> int:
+    """Số core thực sự dùng được (CPU affinity và quota cgroup của container)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    # cgroup v2: "<quota> <period>" hoặc "max <period>"
+    try:
+        with open('/sys/fs/cgroup/cpu.max', 'r') as f:
+            quota, period = f.read().split()[:2]
+        if quota != 'max':
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+class Allocation(NamedTuple):
+    """outer tác vụ đồng thời, mỗi tác vụ inner luồng"""
+    outer: int
+    inner: int
+
+
+def thread_params(estimator) -> list:
+    """Tên các tham số điều khiển số luồng của estimator (kể cả estimator lồng nhau)"""
+    params = estimator.get_params()
+    names = [name for name in params if name.split('__')[-1] in THREAD_PARAMS]
+    # CatBoost chỉ trả về các tham số đã được set trong get_params()
+    if 'thread_count' not in names and type(estimator).__module__.startswith('catboost'):
+        names.append('thread_count')
+    return names
+
+
+class CpuBudget:
+    """
+    Ngân sách CPU cho một lần chạy pipeline
+
+    Args:
+        total: Tổng số core được dùng (None = available_cpus())
+    """
+
+    def __init__(self, total: Optional[int] = None):
+        self.total = max(1, int(total)) if total else available_cpus()
+
+    def split(self, n_tasks: int, inner_parallel: bool = True) -> Allocation:
+        """
+        Chia ngân sách cho n_tasks tác vụ độc lập
+
+        Song song ở mức tác vụ được ưu tiên (gần như tăng tốc tuyến tính); số
+        core còn dư được chia cho các luồng bên trong mỗi tác vụ nếu estimator
+        hỗ trợ (inner_parallel).
+        """
+        outer = max(1, min(n_tasks, self.total))
+        inner = max(1, self.total // outer) if inner_parallel else 1
+        return Allocation(outer, inner)
+
+    def split_for(self, estimator, n_tasks: int) -> Allocation:
+        """split() với inner_parallel suy ra từ estimator"""
+        return self.split(n_tasks, inner_parallel=bool(thread_params(estimator)))
+
+    def configure(self, estimator, n_threads: int):
+        """Gán n_threads cho tất cả tham số số luồng của estimator (in-place)"""
+        params = estimator.get_params()
+        changes = {name: n_threads for name in thread_params(estimator) if params.get(name) != n_threads}
+        if changes:
+            try:
+                estimator.set_params(**changes)
+            except Exception as e:
+                # CatBoost không cho set_params sau khi fit; giữ nguyên số luồng
+                if not type(e).__module__.startswith('_catboost'):
+                    raise
+        return estimator
+
+    @contextmanager
+    def limit(self, allocation: Allocation):
+        """
+        Áp dụng một Allocation cho khối lệnh bên trong
+
+        joblib.Parallel mặc định dùng allocation.outer workers, mỗi worker (loky)
+        giới hạn BLAS/OpenMP ở allocation.inner luồng; code chạy trực tiếp trong
+        process hiện tại cũng bị giới hạn ở allocation.inner luồng native.
+        """
+        with joblib.parallel_config(backend='loky', n_jobs=allocation.outer,
+                                    inner_max_num_threads=allocation.inner):
+            with threadpool_limits(limits=allocation.inner):
+                yield allocation
+
+    @contextmanager
+    def exclusive(self, estimator=None):
+        """Một tác vụ dùng toàn bộ ngân sách (vd: fit model cuối cùng)"""
+        if estimator is not None:
+            self.configure(estimator, self.total)
+        with self.limit(Allocation(1, self.total)) as allocation:
+            yield allocation
+
+    def __repr__(self) -> str:
+        return f"CpuBudget(total={self.total})"
+
+
+def describe(allocation: Allocation) -> str:
+    return f"{allocation.outer} tác vụ x {allocation.inner} luồng"
@@ -0,0 +1,228 @@
+"""
+Dataset Loader
+Chuyển CSV sang cache dạng cột (.npy cho từng cột) một lần, các lần load sau chỉ memory-map
+
+Cache được đặt theo hash nội dung của file nguồn, nên khi CSV thay đổi cache cũ
+tự động bị bỏ qua. Với dữ liệu không vừa RAM, dùng iter_chunks() để duyệt theo
+từng khối với dtype cố định cho các cột DIABETES_FEATURES.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from model_config import DIABETES_FEATURES, DATA_CACHE_CONFIG
+
+TARGET_COLUMN = 'Outcome'
+
+# Dtype cố định cho từng cột (số nguyên cho các cột đếm, float64 cho số đo)
+COLUMN_DTYPES = {
+    **{feature: 'float64' for feature in DIABETES_FEATURES},
+    'Pregnancies': 'int16',
+    'Age': 'int16',
+    TARGET_COLUMN: 'int8'
+}
+
+MANIFEST_FILE = 'manifest.json'
+INDEX_FILE = 'index.json'
+_HASH_BLOCK = 1 << 20
+
+
+def _cache_root(source: Path, cache_dir: Optional[str] = None) -> Path:
+    cache_dir = cache_dir or DATA_CACHE_CONFIG.get('cache_dir')
+    return Path(cache_dir) if cache_dir else source.parent / '.cache'
+
+
+def source_hash(source, cache_dir: Optional[str] = None) -> str:
+    """
+    SHA-256 của file nguồn
+
+    Hash được ghi nhớ trong index.json theo (size, mtime) để không phải đọc lại
+    toàn bộ file lớn ở mỗi lần load.
+    """
+    source = Path(source).resolve()
+    stat = source.stat()
+    index_path = _cache_root(source, cache_dir) / INDEX_FILE
+
+    index = {}
+    if index_path.exists():
+        try:
+            with open(index_path, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+
+    entry = index.get(str(source))
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return entry['sha256']
+
+    digest = hashlib.sha256()
+    with open(source, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b''):
+            digest.update(block)
+
+    index[str(source)] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest.hexdigest()}
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, index_path)
+    return digest.hexdigest()
+
+
+def cache_path(source, cache_dir: Optional[str] = None) -> Path:
+    """Thư mục cache cho phiên bản hiện tại của file nguồn"""
+    source = Path(source).resolve()
+    return _cache_root(source, cache_dir) / f"{source.stem}-{source_hash(source, cache_dir)[:16]}"
+
+
+def _dtypes_for(columns: List[str]) -> Dict[str, str]:
+    return {column: COLUMN_DTYPES[column] for column in columns if column in COLUMN_DTYPES}
+
+
+def build_columnar_cache(source, cache_dir: Optional[str] = None, chunksize: Optional[int] = None) -> Path:
+    """
+    Chuyển CSV sang cache dạng cột (một file .npy cho mỗi cột)
+
+    CSV được đọc theo từng khối nên không cần nạp toàn bộ vào RAM. Cache được
+    ghi vào thư mục tạm rồi đổi tên, nên tiến trình khác không bao giờ thấy cache dở dang.
+
+    Returns:
+        Đường dẫn thư mục cache
+    """
+    source = Path(source).resolve()
+    target = cache_path(source, cache_dir)
+    if (target / MANIFEST_FILE).exists():
+        return target
+
+    chunksize = chunksize or DATA_CACHE_CONFIG['chunksize']
+    columns = list(pd.read_csv(source, nrows=0).columns)
+    dtypes = _dtypes_for(columns)
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    work_dir = Path(tempfile.mkdtemp(prefix=f'.{target.name}-', dir=target.parent))
+    try:
+        parts = {column: open(work_dir / f'{column}.part', 'wb') for column in columns}
+        resolved = {}
+        n_rows = 0
+        try:
+            for chunk in pd.read_csv(source, chunksize=chunksize, dtype=dtypes):
+                for column in columns:
+                    values = chunk[column].to_numpy()
+                    if values.dtype == object:
+                        raise ValueError(f"Cột không phải số, không thể cache: {column}")
+                    # Cột ngoài COLUMN_DTYPES lấy dtype suy ra từ khối đầu tiên
+                    dtype = resolved.setdefault(column, np.dtype(dtypes.get(column, values.dtype)))
+                    parts[column].write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+                n_rows += len(chunk)
+        finally:
+            for part in parts.values():
+                part.close()
+
+        # Ghi header .npy khi đã biết số dòng, sau đó nối dữ liệu thô
+        for column in columns:
+            dtype = resolved.get(column, np.dtype(dtypes.get(column, 'float64')))
+            with open(work_dir / f'{column}.npy', 'wb') as out, open(work_dir / f'{column}.part', 'rb') as part:
+                np.lib.format.write_array_header_1_0(
+                    out, {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (n_rows,)}
+                )
+                shutil.copyfileobj(part, out, _HASH_BLOCK)
+            os.remove(work_dir / f'{column}.part')
+
+        manifest = {
+            'source': str(source),
+            'source_sha256': source_hash(source, cache_dir),
+            'n_rows': n_rows,
+            'columns': columns,
+            'dtypes': {column: resolved.get(column, np.dtype(dtypes.get(column, 'float64'))).str for column in columns},
+            'created_at': datetime.now().isoformat()
+        }
+        with open(work_dir / MANIFEST_FILE, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        try:
+            os.replace(work_dir, target)
+        except OSError:
+            # Tiến trình khác đã tạo xong cache cùng phiên bản
+            if not (target / MANIFEST_FILE).exists():
+                raise
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return target
+
+
+def load_columns(
+    source,
+    columns: Optional[List[str]] = None,
+    cache_dir: Optional[str] = None,
+    mmap: bool = True
+) -> Dict[str, np.ndarray]:
+    """
+    Load các cột từ cache (tạo cache nếu chưa có)
+
+    Args:
+        source: Đường dẫn file CSV
+        columns: Các cột cần load (mặc định tất cả)
+        cache_dir: Thư mục cache (mặc định <thư mục nguồn>/.cache)
+        mmap: Memory-map thay vì đọc vào RAM
+
+    Returns:
+        Dict tên cột -> mảng 1 chiều (read-only nếu mmap)
+    """
+    if not Path(source).exists():
+        raise FileNotFoundError(source)
+
+    directory = build_columnar_cache(source, cache_dir)
+    with open(directory / MANIFEST_FILE, 'r') as f:
+        manifest = json.load(f)
+
+    columns = columns or manifest['columns']
+    missing = [column for column in columns if column not in manifest['columns']]
+    if missing:
+        raise KeyError(f"Không có cột trong dataset: {missing}")
+
+    return {
+        column: np.load(directory / f'{column}.npy', mmap_mode='r' if mmap else None)
+        for column in columns
+    }
+
+
+def load_dataframe(source, columns: Optional[List[str]] = None, cache_dir: Optional[str] = None) -> pd.DataFrame:
+    """Load dataset dạng DataFrame từ cache dạng cột (thay cho pd.read_csv)"""
+    return pd.DataFrame(load_columns(source, columns, cache_dir, mmap=True))
+
+
+def iter_chunks(
+    source,
+    chunksize: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+    cache_dir: Optional[str] = None,
+    use_cache: bool = True
+) -> Iterator[pd.DataFrame]:
+    """
+    Duyệt dataset theo từng khối DataFrame
+
+    Khi use_cache=True, các khối là lát cắt của mảng memory-map (cache được tạo
+    nếu chưa có); khi use_cache=False, CSV được đọc theo khối với dtype cố định.
+    """
+    chunksize = chunksize or DATA_CACHE_CONFIG['chunksize']
+
+    if use_cache:
+        arrays = load_columns(source, columns, cache_dir, mmap=True)
+        n_rows = len(next(iter(arrays.values()))) if arrays else 0
+        for start in range(0, n_rows, chunksize):
+            yield pd.DataFrame({column: values[start:start + chunksize] for column, values in arrays.items()})
+        return
+
+    header = list(pd.read_csv(source, nrows=0).columns)
+    yield from pd.read_csv(
+        source, chunksize=chunksize, usecols=columns, dtype=_dtypes_for(columns or header)
+    )
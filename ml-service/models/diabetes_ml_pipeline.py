@@ -8,54 +8,34 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import joblib
+import json
+import sys
+import logging
 import warnings
 from datetime import datetime
 from pathlib import Path
 
+# Cho phép import các module của ml-service (config, drift_monitor) khi chạy từ thư mục models/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from config import Config
+from drift_monitor import compute_reference_profile
+from cpu_budget import CpuBudget
+from data_loader import iter_chunks, load_dataframe
+from hyperparameter_search import search_model, search_models
+from model_config import MODEL_CATEGORIES, CPU_BUDGET_CONFIG, SELECTION_CONFIG, DISTILLATION_CONFIG, EXPORT_CONFIG
+from model_registry import build_models, model_category, select_models
+from serving_cost import COST_COLUMNS, measure_serving_cost, pareto_frontier, satisfies, select_constrained
+
 # Scikit-learn imports
+from sklearn.base import clone
 from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV, StratifiedKFold
 from sklearn.preprocessing import StandardScaler, RobustScaler, MinMaxScaler
-from sklearn.ensemble import (
-    RandomForestClassifier, GradientBoostingClassifier, AdaBoostClassifier,
-    ExtraTreesClassifier
-)
-from sklearn.linear_model import LogisticRegression, RidgeClassifier
-from sklearn.svm import SVC
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.naive_bayes import GaussianNB
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.neural_network import MLPClassifier
-from sklearn.discriminant_analysis import LinearDiscriminantAnalysis, QuadraticDiscriminantAnalysis
 from sklearn.metrics import (
     accuracy_score, precision_score, recall_score, f1_score, 
     roc_auc_score, confusion_matrix, classification_report, roc_curve
 )
 
-# Advanced ML libraries (optional)
-try:
-    import xgboost as xgb
-    XGBOOST_AVAILABLE = True
-except ImportError:
-    XGBOOST_AVAILABLE = False
-    xgb = None
-    logging.warning("⚠️ XGBoost not available. Install: pip install xgboost")
-
-try:
-    import lightgbm as lgb
-    LIGHTGBM_AVAILABLE = True
-except ImportError:
-    LIGHTGBM_AVAILABLE = False
-    lgb = None
-    logging.warning("⚠️ LightGBM not available. Install: pip install lightgbm")
-
-try:
-    from catboost import CatBoostClassifier
-    CATBOOST_AVAILABLE = True
-except ImportError:
-    CATBOOST_AVAILABLE = False
-    CatBoostClassifier = None
-    logging.warning("⚠️ CatBoost not available. Install: pip install catboost")
-
 # Imbalanced learning (optional)
 try:
     from imblearn.over_sampling import SMOTE, ADASYN
@@ -67,16 +47,6 @@ except ImportError:
     SMOTE = ADASYN = RandomUnderSampler = SMOTEENN = None
     logging.warning("⚠️ Imbalanced-learn not available. Install: pip install imbalanced-learn")
 
-# Hyperparameter optimization
-from sklearn.model_selection import RandomizedSearchCV
-try:
-    import optuna
-    OPTUNA_AVAILABLE = True
-except ImportError:
-    OPTUNA_AVAILABLE = False
-    optuna = None
-    logging.warning("⚠️ Optuna not available. Install: pip install optuna")
-
 warnings.filterwarnings('ignore')
 plt.style.use('seaborn-v0_8')
 
@@ -98,6 +68,13 @@ class DiabetesPredictionPipeline:
         self.best_model = None
         self.best_model_name = None
         self.feature_names = None
+        self.reference_profile = None
+        self.cpu_budget = CpuBudget(CPU_BUDGET_CONFIG['total_cpus'])
+        self.serving_costs = {}
+        self.selection_report = None
+        self.teacher_model = None
+        self.distillation_report = None
+        self.serving_sample = None
         
     def load_data(self, filepath=None):
         """Load and inspect diabetes dataset"""
@@ -110,7 +87,8 @@ class DiabetesPredictionPipeline:
             self.create_sample_data()
         else:
             print(f"📂 Loading data từ {self.data_path}")
-            self.df = pd.read_csv(self.data_path)
+            # Lần đầu chuyển CSV sang cache dạng cột, các lần sau chỉ memory-map
+            self.df = load_dataframe(self.data_path)
             
         print(f"📊 Dataset shape: {self.df.shape}")
         print(f"📋 Features: {list(self.df.columns)}")
@@ -147,6 +125,26 @@ class DiabetesPredictionPipeline:
         self.df = pd.DataFrame(data)
         print("✅ Tạo dữ liệu mẫu thành công!")
     
+    def load_synthetic_data(self, n_samples, seed=42, labeler='logistic', zero_rates=None):
+        """
+        Sinh cohort tổng hợp (phân phối và tương quan giống pima_clean.csv)
+        
+        Parameters:
+        - n_samples: Số dòng cần sinh
+        - seed: Seed để tái lập dữ liệu
+        - labeler: 'logistic', 'rule' hoặc hàm features -> P(diabetes)
+        - zero_rates: Tỷ lệ giá trị 0 theo feature (vd: synthetic_data.PIMA_ZERO_RATES)
+        """
+        from synthetic_data import CohortGenerator
+        
+        print(f"🧬 Sinh {n_samples:,} dòng dữ liệu tổng hợp...")
+        generator = CohortGenerator.fit(labeler=labeler, zero_rates=zero_rates)
+        self.df = generator.generate(n_samples, seed=seed)
+        print(f"📊 Dataset shape: {self.df.shape}")
+        print(f"🎯 Target distribution:")
+        print(self.df['Outcome'].value_counts())
+        return self
+    
     def explore_data(self):
         """Phân tích dữ liệu khám phá (EDA)"""
         print("\n" + "="*50)
@@ -261,6 +259,14 @@ class DiabetesPredictionPipeline:
         print(f"📊 Train set: {self.X_train.shape[0]} samples")
         print(f"📊 Test set: {self.X_test.shape[0]} samples")
         
+        # Reference distribution cho drift monitor (dữ liệu gốc, trước khi xử lý giá trị 0)
+        if all(col in Config.FEATURE_RANGES for col in feature_cols):
+            self.reference_profile = compute_reference_profile(
+                self.df.loc[self.X_train.index, feature_cols].values,
+                feature_cols, Config.FEATURE_RANGES
+            )
+            print(f"📈 Reference profile: {self.reference_profile['n_samples']} samples")
+        
         # Scaling
         print(f"⚖️  Scaling method: {scaling_method}")
         if scaling_method == 'standard':
@@ -303,73 +309,94 @@ class DiabetesPredictionPipeline:
         print("✅ Preprocessing hoàn thành!")
         return self
     
-    def define_models(self):
-        """Định nghĩa các mô hình ML để so sánh"""
+    def train_out_of_core(self, filepath=None, chunksize=None, test_size=0.2, handle_zeros=True, epochs=1):
+        """
+        Huấn luyện out-of-core cho dataset lớn hơn RAM (thay cho preprocess_data + train_and_evaluate_models)
+        
+        Parameters:
+        - filepath: File CSV nguồn (mặc định self.data_path)
+        - chunksize: Số dòng mỗi khối (bộ nhớ tối đa phụ thuộc giá trị này)
+        - test_size: Tỷ lệ test set (split theo hash nội dung dòng)
+        - handle_zeros: Thay giá trị 0 bằng median xấp xỉ
+        - epochs: Số pass huấn luyện partial_fit
+        """
+        from out_of_core import OutOfCoreTrainer
+        
         print("\n" + "="*50)
-        print("🤖 DEFINING ML MODELS")
+        print("🌊 OUT-OF-CORE TRAINING")
         print("="*50)
         
-        self.models = {}
-        
-        # 1. Linear Models
-        self.models['Logistic_Regression'] = LogisticRegression(random_state=42, max_iter=1000)
-        self.models['Ridge_Classifier'] = RidgeClassifier(random_state=42)
-        self.models['Linear_Discriminant'] = LinearDiscriminantAnalysis()
-        self.models['Quadratic_Discriminant'] = QuadraticDiscriminantAnalysis()
+        source = filepath or self.data_path
+        if source is None:
+            raise ValueError("Out-of-core training cần file dữ liệu")
         
-        # 2. Tree-based Models
-        self.models['Decision_Tree'] = DecisionTreeClassifier(random_state=42)
-        self.models['Random_Forest'] = RandomForestClassifier(
-            n_estimators=100, random_state=42, n_jobs=-1
-        )
-        self.models['Extra_Trees'] = ExtraTreesClassifier(
-            n_estimators=100, random_state=42, n_jobs=-1
+        trainer = OutOfCoreTrainer(
+            lambda: iter_chunks(source, chunksize),
+            test_size=test_size,
+            handle_zeros=handle_zeros,
+            epochs=epochs
         )
+        self.feature_names = trainer.feature_cols
         
-        # 3. Boosting Models
-        self.models['Gradient_Boosting'] = GradientBoostingClassifier(random_state=42)
-        self.models['AdaBoost'] = AdaBoostClassifier(random_state=42)
+        print("🔧 Pass 1: median, scaler và reference profile...")
+        # Mẫu nhỏ của tập test để đo chi phí serving khi export (không giữ cả tập test)
+        trainer.compute_statistics(
+            lambda raw: compute_reference_profile(raw, self.feature_names, Config.FEATURE_RANGES),
+            sample_rows=SELECTION_CONFIG['batch_size']
+        )
+        for col, median in trainer.medians.items():
+            print(f"  - {col}: median ≈ {median:.2f}")
+        print(f"📊 Train set: {trainer.counts['train']} samples")
         
-        # 4. Advanced Gradient Boosting (if available)
-        if XGBOOST_AVAILABLE:
-            self.models['XGBoost'] = xgb.XGBClassifier(
-                random_state=42, eval_metric='logloss', verbosity=0
-            )
+        print(f"🎯 Pass 2: partial_fit {list(trainer.models)} ({epochs} epoch)...")
+        trainer.train()
         
-        if LIGHTGBM_AVAILABLE:
-            self.models['LightGBM'] = lgb.LGBMClassifier(
-                random_state=42, verbosity=-1
-            )
-        
-        if CATBOOST_AVAILABLE:
-            self.models['CatBoost'] = CatBoostClassifier(
-                random_state=42, verbose=False
-            )
+        self.results = {}
+        for name, metrics in trainer.evaluate().items():
+            self.results[name] = {**metrics, 'Model': trainer.models[name]}
+            print(f"  ✅ {name}: Test Accuracy {metrics['Test_Accuracy']:.4f} | ROC-AUC {metrics['Test_ROC_AUC']:.4f}")
+        print(f"📊 Test set: {trainer.counts['test']} samples")
+        
+        self.scalers['main'] = trainer.scaler
+        self.reference_profile = trainer.reference_profile
+        self.serving_sample = trainer.serving_sample
+        self.best_model_name = max(self.results, key=lambda name: self.results[name]['Test_ROC_AUC'])
+        self.best_model = self.results[self.best_model_name]['Model']
+        
+        print(f"\n🏆 Best Model: {self.best_model_name} (ROC-AUC: {self.results[self.best_model_name]['Test_ROC_AUC']:.4f})")
+        return self
+    
+    def define_models(self, model_names=None, categories=None):
+        """
+        Định nghĩa các mô hình ML để so sánh
         
-        # 5. Instance-based Models
-        self.models['K_Nearest_Neighbors'] = KNeighborsClassifier(n_neighbors=5)
+        Parameters:
+        - model_names: Chỉ dùng các models này (None = tất cả trong MODEL_CATEGORIES)
+        - categories: Chỉ dùng các categories này, vd ['linear', 'boosting']
         
-        # 6. Kernel Methods
-        self.models['Support_Vector_Machine'] = SVC(random_state=42, probability=True)
+        Thư viện của mỗi model (xgboost, lightgbm, catboost...) chỉ được import khi model được chọn.
+        """
+        print("\n" + "="*50)
+        print("🤖 DEFINING ML MODELS")
+        print("="*50)
         
-        # 7. Probabilistic Models
-        self.models['Naive_Bayes'] = GaussianNB()
+        self.models = build_models(model_names, categories)
         
-        # 8. Neural Network
-        self.models['Neural_Network'] = MLPClassifier(
-            hidden_layer_sizes=(100,), random_state=42, max_iter=500
-        )
+        unavailable = [name for name in select_models(model_names, categories, available_only=False)
+                       if name not in self.models]
+        for name in unavailable:
+            print(f"⚠️  {name} không khả dụng (thư viện chưa được cài)")
         
         print(f"✅ Đã định nghĩa {len(self.models)} models:")
         print(f"\n🎯 Model Categories:")
-        print(f"• Linear Models: 4")
-        print(f"• Tree-based Models: 3")
-        print(f"• Boosting Models: 2 + {sum([XGBOOST_AVAILABLE, LIGHTGBM_AVAILABLE, CATBOOST_AVAILABLE])} advanced")
-        print(f"• Instance-based: 1")
-        print(f"• Kernel Methods: 1")
-        print(f"• Probabilistic: 1")
-        print(f"• Neural Networks: 1")
-        
+        category_counts = {}
+        for name in self.models:
+            category = model_category(name)
+            category_counts[category] = category_counts.get(category, 0) + 1
+        for category, count in category_counts.items():
+            print(f"• {MODEL_CATEGORIES[category]['description']}: {count}")
+        
+        print(f"\n🧵 CPU budget: {self.cpu_budget.total} cores")
         print(f"\n📋 Available Models:")
         for i, name in enumerate(self.models.keys(), 1):
             print(f"{i:2d}. {name}")
@@ -389,18 +416,32 @@ class DiabetesPredictionPipeline:
             print(f"\n🔄 Training {name}...")
             
             try:
-                # Cross-validation scores
-                cv_scores = cross_val_score(model, self.X_train_scaled, self.y_train, 
-                                          cv=cv, scoring='roc_auc')
+                # Cross-validation: folds song song, số luồng mỗi fold theo CPU budget
+                allocation = self.cpu_budget.split_for(model, cv_folds)
+                self.cpu_budget.configure(model, allocation.inner)
+                with self.cpu_budget.limit(allocation):
+                    cv_scores = cross_val_score(model, self.X_train_scaled, self.y_train, 
+                                              cv=cv, scoring='roc_auc', n_jobs=allocation.outer)
                 
                 # Train on full training set
-                model.fit(self.X_train_scaled, self.y_train)
+                with self.cpu_budget.exclusive(model):
+                    model.fit(self.X_train_scaled, self.y_train)
                 
                 # Predictions
                 y_train_pred = model.predict(self.X_train_scaled)
                 y_test_pred = model.predict(self.X_test_scaled)
                 y_test_proba = model.predict_proba(self.X_test_scaled)[:, 1]
                 
+                # Chi phí serving (latency, kích thước, bộ nhớ) đo với 1 luồng như khi serve
+                with self.cpu_budget.limit(self.cpu_budget.split(1, inner_parallel=False)):
+                    self.cpu_budget.configure(model, 1)
+                    cost = measure_serving_cost(
+                        model, self.X_test_scaled,
+                        single_iterations=SELECTION_CONFIG['single_iterations'],
+                        batch_size=SELECTION_CONFIG['batch_size']
+                    )
+                self.serving_costs[name] = cost
+                
                 # Calculate metrics
                 metrics = {
                     'CV_ROC_AUC_mean': cv_scores.mean(),
@@ -411,6 +452,7 @@ class DiabetesPredictionPipeline:
                     'Test_Recall': recall_score(self.y_test, y_test_pred),
                     'Test_F1': f1_score(self.y_test, y_test_pred),
                     'Test_ROC_AUC': roc_auc_score(self.y_test, y_test_proba),
+                    **{column: cost[column] for column in COST_COLUMNS},
                     'Model': model
                 }
                 
@@ -419,20 +461,185 @@ class DiabetesPredictionPipeline:
                 print(f"  ✅ CV ROC-AUC: {metrics['CV_ROC_AUC_mean']:.4f} (±{metrics['CV_ROC_AUC_std']:.4f})")
                 print(f"  📊 Test Accuracy: {metrics['Test_Accuracy']:.4f}")
                 print(f"  🎯 Test ROC-AUC: {metrics['Test_ROC_AUC']:.4f}")
+                print(f"  ⏱️  Latency p99 (1 dòng): {cost['Latency_Single_p99_ms']:.3f} ms | "
+                      f"Artifact: {cost['Artifact_Bytes'] / 1024:.1f} KB | Memory: {cost['Memory_Bytes'] / 1024:.1f} KB")
                 
             except Exception as e:
                 print(f"  ❌ Error training {name}: {str(e)}")
                 continue
         
-        # Find best model
-        best_auc = 0
-        for name, metrics in self.results.items():
-            if metrics['Test_ROC_AUC'] > best_auc:
-                best_auc = metrics['Test_ROC_AUC']
-                self.best_model_name = name
-                self.best_model = metrics['Model']
+        return self.select_best_model()
+    
+    def select_best_model(self, metric=None, constraints=None):
+        """
+        Chọn model tốt nhất theo metric, trong giới hạn chi phí serving
+        
+        Parameters:
+        - metric: Cột trong results (mặc định SELECTION_CONFIG['metric'])
+        - constraints: Dict cột -> giá trị tối đa, vd {'Latency_Single_p99_ms': 2, 'Artifact_Bytes': 5_000_000}
+          (mặc định SELECTION_CONFIG['constraints'])
+        
+        Nếu không model nào thoả ràng buộc thì chọn model có metric cao nhất.
+        Pareto frontier (AUC / latency p99 / kích thước) được lưu vào selection_report.
+        """
+        metric = metric or SELECTION_CONFIG['metric']
+        constraints = {k: v for k, v in (constraints if constraints is not None else SELECTION_CONFIG['constraints']).items()
+                       if v is not None}
+        
+        best_name = select_constrained(self.results, metric, constraints)
+        constrained = best_name is not None
+        if not constrained:
+            print(f"⚠️  Không model nào thoả ràng buộc {constraints}, chọn theo {metric}")
+            best_name = select_constrained(self.results, metric)
+        
+        frontier = pareto_frontier(self.results)
+        if frontier:
+            print(f"\n📐 Pareto frontier (AUC / latency p99 / kích thước):")
+            for name in frontier:
+                metrics = self.results[name]
+                print(f"  • {name}: AUC {metrics['Test_ROC_AUC']:.4f} | "
+                      f"p99 {metrics['Latency_Single_p99_ms']:.3f} ms | {metrics['Artifact_Bytes'] / 1024:.1f} KB")
+        
+        self.selection_report = {
+            'metric': metric,
+            'constraints': constraints,
+            'constraints_satisfied': constrained,
+            'pareto_frontier': frontier,
+            'candidates': {
+                name: {
+                    metric: float(metrics[metric]),
+                    **{column: float(metrics[column]) for column in COST_COLUMNS if column in metrics},
+                    'feasible': satisfies(metrics, constraints)
+                }
+                for name, metrics in self.results.items()
+            }
+        }
+        
+        self.best_model_name = best_name
+        self.best_model = self.results[best_name]['Model']
+        print(f"\n🏆 Best Model: {best_name} ({metric}: {self.results[best_name][metric]:.4f})")
+        return self
+    
+    def select_model_successive_halving(self, eta=3, min_samples=None, cv_folds=5, time_budget=None):
+        """
+        Chọn model bằng successive halving (thay cho train_and_evaluate_models khi dữ liệu lớn)
+        
+        Parameters:
+        - eta: Mỗi vòng giữ lại 1/eta models tốt nhất, vòng sau dùng gấp eta lần dữ liệu
+        - min_samples: Số dòng ở vòng đầu (mặc định tự tính theo số vòng)
+        - cv_folds: Số fold ở vòng cuối (toàn bộ tập train)
+        - time_budget: Giới hạn thời gian (giây) cho quá trình chọn
+        """
+        from model_selection import successive_halving
+        
+        print("\n" + "="*50)
+        print("✂️  SUCCESSIVE HALVING MODEL SELECTION")
+        print("="*50)
+        
+        report = successive_halving(
+            self.models, self.X_train_scaled, self.y_train,
+            eta=eta, min_samples=min_samples, cv_folds=cv_folds, time_budget=time_budget,
+            budget=self.cpu_budget
+        )
+        self.halving_report = report
+        
+        print("\n📋 Models bị loại:")
+        for name, info in sorted(report['eliminated'].items(), key=lambda item: item[1]['round']):
+            print(f"  - {name}: vòng {info['round']} ({info['n_samples']} samples, score {info['score']:.4f})")
+        
+        # Fit model thắng cuộc trên toàn bộ tập train
+        name = report['winner']
+        model = clone(self.models[name])
+        with self.cpu_budget.exclusive(model):
+            model.fit(self.X_train_scaled, self.y_train)
+        y_test_pred = model.predict(self.X_test_scaled)
+        final_round = report['rounds'][-1]
+        
+        # Hết time budget trước vòng cuối: điểm CV chỉ tính trên tập con, không ghi như CV toàn tập train
+        if final_round['n_samples'] == len(self.y_train):
+            cv_metrics = {'CV_ROC_AUC_mean': report['winner_score'], 'CV_ROC_AUC_std': float('nan')}
+        else:
+            cv_metrics = {'Subsample_CV_ROC_AUC': report['winner_score'], 'Subsample_CV_Samples': final_round['n_samples']}
+        
+        with self.cpu_budget.limit(self.cpu_budget.split(1, inner_parallel=False)):
+            self.cpu_budget.configure(model, 1)
+            cost = measure_serving_cost(
+                model, self.X_test_scaled,
+                single_iterations=SELECTION_CONFIG['single_iterations'],
+                batch_size=SELECTION_CONFIG['batch_size']
+            )
+        self.serving_costs[name] = cost
+        
+        self.results = {name: {
+            **cv_metrics,
+            'Train_Accuracy': accuracy_score(self.y_train, model.predict(self.X_train_scaled)),
+            'Test_Accuracy': accuracy_score(self.y_test, y_test_pred),
+            'Test_Precision': precision_score(self.y_test, y_test_pred),
+            'Test_Recall': recall_score(self.y_test, y_test_pred),
+            'Test_F1': f1_score(self.y_test, y_test_pred),
+            'Test_ROC_AUC': roc_auc_score(self.y_test, model.predict_proba(self.X_test_scaled)[:, 1]),
+            **{column: cost[column] for column in COST_COLUMNS},
+            'Model': model
+        }}
+        self.best_model_name = name
+        self.best_model = model
+        
+        print(f"\n🏆 Best Model: {name} (CV ROC-AUC: {report['winner_score']:.4f} trên {final_round['n_samples']} samples)")
+        print(f"⏱️  Thời gian chọn: {report['elapsed']:.1f}s")
+        return self
+    
+    def distill_best_model(self, students=None, max_auc_gap=None):
+        """
+        Distill model tốt nhất (teacher) vào một student nhỏ, nhanh để serve
+        
+        Parameters:
+        - students: Danh sách student ('tree', 'sparse_logistic', 'mlp'), mặc định DISTILLATION_CONFIG['students']
+        - max_auc_gap: Student chỉ thay teacher nếu Test ROC-AUC kém hơn không quá mức này
+          (mặc định DISTILLATION_CONFIG['max_auc_gap']) và nhanh hơn teacher
+          (speedup_single > DISTILLATION_CONFIG['min_speedup'])
         
-        print(f"\n🏆 Best Model: {self.best_model_name} (ROC-AUC: {best_auc:.4f})")
+        Teacher được giữ ở teacher_model; báo cáo fidelity / tăng tốc ở distillation_report
+        và được ghi vào metadata khi export_artifacts.
+        """
+        from distillation import build_students, distill, summarize
+        
+        print("\n" + "="*50)
+        print("🎓 MODEL DISTILLATION")
+        print("="*50)
+        
+        max_auc_gap = DISTILLATION_CONFIG['max_auc_gap'] if max_auc_gap is None else max_auc_gap
+        config = {'students': students} if students is not None else None
+        teacher = self.teacher_model or self.best_model
+        teacher_name = self.best_model_name.split('_distilled_')[0]
+        
+        self.cpu_budget.configure(teacher, 1)
+        with self.cpu_budget.limit(self.cpu_budget.split(1, inner_parallel=False)):
+            report = distill(teacher, self.X_train_scaled, self.X_test_scaled, np.asarray(self.y_test),
+                             students=build_students(config), config=config)
+        
+        best = report['best']
+        if best is None:
+            self.distillation_report = {'teacher': teacher_name, 'student': None, 'accepted': False,
+                                        'max_auc_gap': max_auc_gap, **summarize(report)}
+            print(f"\n⚠️  Không student nào nhanh hơn teacher, giữ {teacher_name}")
+            return self
+        
+        student = report['students'][best]
+        accepted = (student['roc_auc_gap'] <= max_auc_gap
+                    and student['speedup_single'] > DISTILLATION_CONFIG['min_speedup'])
+        self.distillation_report = {'teacher': teacher_name, 'student': best, 'accepted': accepted,
+                                    'max_auc_gap': max_auc_gap, **summarize(report)}
+        
+        if accepted:
+            self.teacher_model = teacher
+            self.best_model = student['model']
+            self.best_model_name = f"{teacher_name}_distilled_{best}"
+            print(f"\n🏆 Student: {best} (AUC gap {student['roc_auc_gap']:+.4f}, "
+                  f"p99 nhanh hơn x{student['speedup_single']:.1f}, "
+                  f"{student['artifact_bytes'] / 1024:.1f} KB)")
+        else:
+            print(f"\n⚠️  Student tốt nhất ({best}) kém teacher {student['roc_auc_gap']:.4f} AUC "
+                  f"(> {max_auc_gap}), giữ {teacher_name}")
         return self
     
     def create_results_summary(self):
@@ -504,74 +711,69 @@ class DiabetesPredictionPipeline:
         plt.savefig('ML/data/model_comparison.png', dpi=300, bbox_inches='tight')
         plt.show()
     
-    def hyperparameter_tuning(self, model_name=None, n_trials=50):
-        """Tối ưu hyperparameters cho model tốt nhất hoặc model được chỉ định"""
+    def hyperparameter_tuning(self, model_name=None, method=None, n_iter=None):
+        """
+        Tối ưu hyperparameters cho model tốt nhất hoặc model được chỉ định
+        
+        Search space và cấu hình lấy từ HYPERPARAMETER_SEARCH_SPACES / OPTIMIZATION_CONFIG
+        trong model_config.py; method/n_iter ghi đè cấu hình nếu được truyền vào.
+        """
         if model_name is None:
             model_name = self.best_model_name
             
         print(f"\n🔧 Hyperparameter tuning cho {model_name}...")
         
-        def objective(trial):
-            if model_name == 'Random_Forest':
-                params = {
-                    'n_estimators': trial.suggest_int('n_estimators', 50, 300),
-                    'max_depth': trial.suggest_int('max_depth', 3, 20),
-                    'min_samples_split': trial.suggest_int('min_samples_split', 2, 20),
-                    'min_samples_leaf': trial.suggest_int('min_samples_leaf', 1, 10),
-                    'max_features': trial.suggest_categorical('max_features', ['sqrt', 'log2']),
-                }
-                model = RandomForestClassifier(random_state=42, **params)
-                
-            elif model_name == 'XGBoost':
-                params = {
-                    'n_estimators': trial.suggest_int('n_estimators', 50, 300),
-                    'max_depth': trial.suggest_int('max_depth', 3, 10),
-                    'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3),
-                    'subsample': trial.suggest_float('subsample', 0.6, 1.0),
-                    'colsample_bytree': trial.suggest_float('colsample_bytree', 0.6, 1.0),
-                }
-                model = xgb.XGBClassifier(random_state=42, eval_metric='logloss', **params)
-                
-            elif model_name == 'LightGBM':
-                params = {
-                    'n_estimators': trial.suggest_int('n_estimators', 50, 300),
-                    'max_depth': trial.suggest_int('max_depth', 3, 10),
-                    'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3),
-                    'num_leaves': trial.suggest_int('num_leaves', 10, 100),
-                    'subsample': trial.suggest_float('subsample', 0.6, 1.0),
-                }
-                model = lgb.LGBMClassifier(random_state=42, verbose=-1, **params)
-            else:
-                return 0  # Skip tuning for other models
-            
-            # Cross-validation score
-            cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-            scores = cross_val_score(model, self.X_train_scaled, self.y_train, 
-                                   cv=cv, scoring='roc_auc')
-            return scores.mean()
+        config = {key: value for key, value in {'method': method, 'n_iter': n_iter}.items() if value is not None}
+        try:
+            result = search_model(model_name, self.models[model_name], self.X_train_scaled, self.y_train,
+                                  config=config, budget=self.cpu_budget)
+        except KeyError as e:
+            print(f"⚠️  Bỏ qua tuning: {e}")
+            return self
         
-        # Run optimization
-        study = optuna.create_study(direction='maximize')
-        study.optimize(objective, n_trials=n_trials, show_progress_bar=True)
+        print(f"🏆 Best parameters: {result['best_params']}")
+        print(f"📊 Best CV ROC-AUC: {result['best_score']:.4f}")
         
-        # Get best parameters
-        best_params = study.best_params
-        best_score = study.best_value
+        # Train best model
+        tuned_model = clone(self.models[model_name]).set_params(**result['best_params'])
+        with self.cpu_budget.exclusive(tuned_model):
+            tuned_model.fit(self.X_train_scaled, self.y_train)
+        self.best_model = tuned_model
+        self.tuning_results = {model_name: result}
         
-        print(f"🏆 Best parameters: {best_params}")
-        print(f"📊 Best CV ROC-AUC: {best_score:.4f}")
+        return self
+    
+    def tune_all_models(self, model_names=None, method=None, n_iter=None):
+        """
+        Tối ưu hyperparameters cho tất cả models có search space trong model_config.py
         
-        # Train best model
-        if model_name == 'Random_Forest':
-            tuned_model = RandomForestClassifier(random_state=42, **best_params)
-        elif model_name == 'XGBoost':
-            tuned_model = xgb.XGBClassifier(random_state=42, eval_metric='logloss', **best_params)
-        elif model_name == 'LightGBM':
-            tuned_model = lgb.LGBMClassifier(random_state=42, verbose=-1, **best_params)
-            
-        tuned_model.fit(self.X_train_scaled, self.y_train)
+        Các bộ tham số của mỗi model được đánh giá song song theo CPU budget; model có điểm CV tốt nhất
+        sau tuning trở thành best_model.
+        """
+        print("\n" + "="*50)
+        print("🔧 HYPERPARAMETER TUNING (ALL MODELS)")
+        print("="*50)
+        
+        config = {key: value for key, value in {'method': method, 'n_iter': n_iter}.items() if value is not None}
+        self.tuning_results = search_models(
+            self.models, self.X_train_scaled, self.y_train, names=model_names, config=config,
+            budget=self.cpu_budget
+        )
+        if not self.tuning_results:
+            print("⚠️  Không có model nào được tuning")
+            return self
+        
+        best_name = max(self.tuning_results, key=lambda name: self.tuning_results[name]['best_score'])
+        best = self.tuning_results[best_name]
+        
+        tuned_model = clone(self.models[best_name]).set_params(**best['best_params'])
+        with self.cpu_budget.exclusive(tuned_model):
+            tuned_model.fit(self.X_train_scaled, self.y_train)
+        self.best_model_name = best_name
         self.best_model = tuned_model
         
+        print(f"\n🏆 Best tuned model: {best_name} (CV ROC-AUC: {best['best_score']:.4f})")
+        print(f"   Parameters: {best['best_params']}")
         return self
     
     def analyze_feature_importance(self):
@@ -675,13 +877,9 @@ class DiabetesPredictionPipeline:
             'scaler': self.scalers['main'],
             'feature_names': self.feature_names,
             'model_name': self.best_model_name,
+            'reference_profile': self.reference_profile,
             'timestamp': datetime.now(),
-            'performance': {
-                'test_accuracy': accuracy_score(self.y_test, 
-                                              self.best_model.predict(self.X_test_scaled)),
-                'test_roc_auc': roc_auc_score(self.y_test, 
-                                            self.best_model.predict_proba(self.X_test_scaled)[:, 1])
-            }
+            'performance': self._best_model_performance()
         }
         
         joblib.dump(model_data, filename)
@@ -692,9 +890,171 @@ class DiabetesPredictionPipeline:
         
         return filename
     
-    def create_prediction_function(self, filename):
-        """Tạo function đơn giản để prediction"""
-        code = f'''
+    def export_artifacts(self, models_dir=None, version=None):
+        """
+        Xuất model tốt nhất theo layout mà ml-service đọc (config.py):
+        diabetes_model_<type>_<version>.joblib, scaler_<version>.joblib, model_metadata_<version>.json
+        
+        Kèm diabetes_predictor_standalone_<version>.py (không phụ thuộc thư viện) nếu model hỗ trợ.
+        
+        Metadata có thêm 'serving_profile' (latency, kích thước, bộ nhớ của model được xuất)
+        và 'model_selection' (ràng buộc, Pareto frontier, chi phí từng ứng viên);
+        'distillation' (teacher, fidelity, tăng tốc) nếu đã gọi distill_best_model.
+        
+        Parameters:
+        - models_dir: Thư mục xuất (mặc định thư mục models/ của ml-service)
+        - version: Mặc định timestamp hiện tại
+        """
+        models_dir = Path(models_dir or Path(__file__).resolve().parent)
+        models_dir.mkdir(parents=True, exist_ok=True)
+        version = version or datetime.now().strftime("%Y%m%d_%H%M%S")
+        model_type = self.best_model_name.lower()
+        
+        model_path = models_dir / f"diabetes_model_{model_type}_{version}.joblib"
+        scaler_path = models_dir / f"scaler_{version}.joblib"
+        metadata_path = models_dir / f"model_metadata_{version}.json"
+        
+        # Train out-of-core không giữ tập test: đo trên mẫu lấy từ nguồn khối, metrics lấy từ self.results
+        in_memory = getattr(self, 'X_test_scaled', None) is not None
+        sample = self.X_test_scaled if in_memory else self.serving_sample
+        
+        # Model được serve đơn luồng (mỗi request một luồng của web server)
+        serving_profile = None
+        if sample is not None and len(sample):
+            self.cpu_budget.configure(self.best_model, 1)
+            with self.cpu_budget.limit(self.cpu_budget.split(1, inner_parallel=False)):
+                serving_profile = measure_serving_cost(
+                    self.best_model, sample,
+                    single_iterations=SELECTION_CONFIG['single_iterations'],
+                    batch_size=SELECTION_CONFIG['batch_size']
+                )
+        
+        metrics = self.results.get(self.best_model_name, {})
+        if in_memory:
+            y_pred = self.best_model.predict(self.X_test_scaled)
+            y_proba = self.best_model.predict_proba(self.X_test_scaled)[:, 1]
+            test_metrics = {
+                'test_accuracy': float(accuracy_score(self.y_test, y_pred)),
+                'test_precision': float(precision_score(self.y_test, y_pred)),
+                'test_recall': float(recall_score(self.y_test, y_pred)),
+                'test_f1_score': float(f1_score(self.y_test, y_pred)),
+                'test_roc_auc': float(roc_auc_score(self.y_test, y_proba))
+            }
+        else:
+            test_metrics = {
+                'test_accuracy': float(metrics['Test_Accuracy']),
+                'test_precision': float(metrics['Test_Precision']),
+                'test_recall': float(metrics['Test_Recall']),
+                'test_f1_score': float(metrics['Test_F1']),
+                'test_roc_auc': float(metrics['Test_ROC_AUC'])
+            }
+        tuning = getattr(self, 'tuning_results', None) or {}
+        
+        metadata = {
+            'model_name': self.best_model_name.replace('_', ' '),
+            'model_type': type(self.best_model).__name__,
+            'model_version': version,
+            'training_date': datetime.now().isoformat(),
+            'dataset_info': {
+                'features': list(self.feature_names),
+                'n_samples': int(len(self.df)) if self.df is not None else None,
+                'n_features': len(self.feature_names),
+                'target_distribution': {str(k): int(v) for k, v in self.df['Outcome'].value_counts().items()}
+                if self.df is not None else None
+            },
+            'performance_metrics': {
+                'cv_roc_auc_mean': float(metrics['CV_ROC_AUC_mean']) if 'CV_ROC_AUC_mean' in metrics else None,
+                **test_metrics
+            },
+            'hyperparameters': str(tuning.get(self.best_model_name, {}).get('best_params', {})),
+            'preprocessing': {
+                'scaler': type(self.scalers['main']).__name__,
+                'missing_value_strategy': 'median_imputation'
+            },
+            'feature_names': list(self.feature_names),
+            'feature_importance': None,
+            'serving_profile': {
+                'single_row_latency_p50_ms': serving_profile['Latency_Single_p50_ms'],
+                'single_row_latency_p99_ms': serving_profile['Latency_Single_p99_ms'],
+                'batch_latency_ms': serving_profile['Latency_Batch_ms'],
+                'batch_size': SELECTION_CONFIG['batch_size'],
+                'batch_rows_per_s': serving_profile['Batch_Rows_per_s'],
+                'artifact_bytes': serving_profile['Artifact_Bytes'],
+                'memory_bytes': serving_profile['Memory_Bytes']
+            } if serving_profile is not None else None,
+            'model_selection': self.selection_report,
+            'distillation': self.distillation_report,
+            'reference_profile': self.reference_profile
+        }
+        if hasattr(self.best_model, 'feature_importances_'):
+            importance = self.best_model.feature_importances_
+        elif hasattr(self.best_model, 'coef_'):
+            importance = np.abs(np.ravel(self.best_model.coef_))
+        else:
+            importance = None
+        if importance is not None:
+            metadata['feature_importance'] = {k: float(v) for k, v in zip(self.feature_names, importance)}
+        
+        joblib.dump(self.best_model, model_path)
+        joblib.dump(self.scalers['main'], scaler_path)
+        with open(metadata_path, 'w') as f:
+            json.dump(metadata, f, indent=2)
+        paths = [model_path, scaler_path, metadata_path]
+        
+        if EXPORT_CONFIG['save_production_code'] and EXPORT_CONFIG['standalone_predictor']:
+            from predictor_codegen import is_supported
+            if is_supported(self.best_model, self.scalers['main']):
+                predictor_path = models_dir / f"diabetes_predictor_standalone_{version}.py"
+                self.create_prediction_function(predictor_path, standalone=True)
+                paths.append(predictor_path)
+            else:
+                print(f"⚠️  {type(self.best_model).__name__} chưa hỗ trợ predictor standalone, bỏ qua")
+        
+        print(f"\n📦 Artifacts cho ml-service (MODEL_TYPE={model_type}, MODEL_VERSION={version}):")
+        for path in paths:
+            print(f"  • {path}")
+        return version
+    
+    def _best_model_performance(self):
+        """Metrics của model tốt nhất trên test set (lấy từ kết quả streaming nếu train out-of-core)"""
+        if getattr(self, 'X_test_scaled', None) is None:
+            metrics = self.results[self.best_model_name]
+            return {'test_accuracy': metrics['Test_Accuracy'], 'test_roc_auc': metrics['Test_ROC_AUC']}
+        
+        return {
+            'test_accuracy': accuracy_score(self.y_test, 
+                                          self.best_model.predict(self.X_test_scaled)),
+            'test_roc_auc': roc_auc_score(self.y_test, 
+                                        self.best_model.predict_proba(self.X_test_scaled)[:, 1])
+        }
+    
+    def create_prediction_function(self, filename, standalone=False, tree_layout='auto'):
+        """
+        Tạo function đơn giản để prediction
+        
+        Parameters:
+        - standalone: Sinh module tự chứa (tham số scaler/model nhúng dạng literal, chấm điểm
+          chỉ bằng thư viện chuẩn, import trong vài ms) thay vì load file .pkl bằng joblib
+        - tree_layout: Với model cây: 'auto', 'nested' (if/else lồng nhau) hoặc 'flat' (mảng phẳng)
+        """
+        if standalone:
+            from predictor_codegen import generate_standalone_predictor
+            code = generate_standalone_predictor(
+                self.best_model, self.scalers['main'], self.feature_names,
+                model_name=self.best_model_name, tree_layout=tree_layout
+            )
+        else:
+            code = self._joblib_predictor_code()
+        
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(code)
+        
+        print(f"📝 Prediction function saved: {filename}")
+    
+    def _joblib_predictor_code(self):
+        """Mã nguồn predictor load model + scaler từ file .pkl của save_model"""
+        return f'''
 """
 Diabetes Prediction Function
 Generated automatically from ML pipeline
@@ -782,12 +1142,6 @@ if __name__ == "__main__":
     result = predictor.predict(sample_input)
     print("Prediction Result:", result)
 '''
-        
-        Path(filename).parent.mkdir(parents=True, exist_ok=True)
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(code)
-        
-        print(f"📝 Prediction function saved: {filename}")
 
 # Example usage
 if __name__ == "__main__":
@@ -811,6 +1165,8 @@ if __name__ == "__main__":
      .generate_final_report()  # Final report
      .save_model()  # Save best model
     )
+    pipeline.distill_best_model()  # Student nhỏ nếu đủ sát teacher
+    pipeline.export_artifacts()  # Artifacts cho ml-service
     
     print("\n✅ ML Pipeline hoàn thành!")
     print("📁 Check thư mục ML/data/ và ML/models/ để xem kết quả")
\ No newline at end of file
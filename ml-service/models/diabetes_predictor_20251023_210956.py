@@ -1,8 +1,13 @@
 
+import warnings
+from operator import itemgetter
+from typing import Union, Dict, Iterable, Iterator, Optional
+
 import joblib
 import numpy as np
 import pandas as pd
-from typing import Union, List, Dict
+
+InputData = Union[Dict, Iterable, pd.DataFrame, np.ndarray]
 
 class DiabetesPredictor:
     """
@@ -10,15 +15,23 @@ class DiabetesPredictor:
 
     Features expected (in order):
     ['Pregnancies', 'Glucose', 'BloodPressure', 'SkinThickness', 'Insulin', 'BMI', 'DiabetesPedigreeFunction', 'Age']
+
+    Besides predict/predict_proba on in-memory data, iter_predict and
+    iter_predict_proba score arrays, DataFrames and record iterables
+    (including generators) chunk by chunk and yield results lazily.
     """
 
-    def __init__(self, model_path: str, scaler_path: str):
+    DEFAULT_CHUNK_SIZE = 65536
+
+    def __init__(self, model_path: str, scaler_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
         """Initialize the predictor with model and scaler paths."""
         self.model = joblib.load(model_path)
         self.scaler = joblib.load(scaler_path)
         self.feature_names = ['Pregnancies', 'Glucose', 'BloodPressure', 'SkinThickness', 'Insulin', 'BMI', 'DiabetesPedigreeFunction', 'Age']
+        self.chunk_size = chunk_size
+        self._get_features = itemgetter(*self.feature_names)
 
-    def predict(self, data: Union[Dict, List[Dict], pd.DataFrame, np.ndarray]) -> np.ndarray:
+    def predict(self, data: InputData) -> np.ndarray:
         """
         Predict diabetes probability.
 
@@ -28,10 +41,9 @@ class DiabetesPredictor:
         Returns:
             numpy array of predictions (0 or 1)
         """
-        processed_data = self._preprocess_input(data)
-        return self.model.predict(processed_data)
+        return self._collect(self.iter_predict(data), (0,))
 
-    def predict_proba(self, data: Union[Dict, List[Dict], pd.DataFrame, np.ndarray]) -> np.ndarray:
+    def predict_proba(self, data: InputData) -> np.ndarray:
         """
         Predict diabetes probabilities.
 
@@ -41,42 +53,133 @@ class DiabetesPredictor:
         Returns:
             numpy array of probabilities [prob_no_diabetes, prob_diabetes]
         """
-        processed_data = self._preprocess_input(data)
-        if hasattr(self.model, 'predict_proba'):
-            return self.model.predict_proba(processed_data)
-        else:
+        return self._collect(self.iter_predict_proba(data), (0, 2))
+
+    def iter_predict(self, data: InputData, chunk_size: Optional[int] = None) -> Iterator[np.ndarray]:
+        """
+        Lazily predict labels chunk by chunk.
+
+        Args:
+            data: numpy array, DataFrame, dict, or any iterable (list, generator)
+                of dicts or feature sequences in feature_names order
+            chunk_size: Rows per chunk (defaults to self.chunk_size)
+
+        Yields:
+            numpy array of predictions (0 or 1) for each chunk
+        """
+        for chunk in self._iter_chunks(data, chunk_size):
+            yield self._score(chunk, proba=False)
+
+    def iter_predict_proba(self, data: InputData, chunk_size: Optional[int] = None) -> Iterator[np.ndarray]:
+        """
+        Lazily predict probabilities chunk by chunk.
+
+        Args:
+            data: numpy array, DataFrame, dict, or any iterable (list, generator)
+                of dicts or feature sequences in feature_names order
+            chunk_size: Rows per chunk (defaults to self.chunk_size)
+
+        Yields:
+            numpy array of probabilities [prob_no_diabetes, prob_diabetes] for each chunk
+        """
+        for chunk in self._iter_chunks(data, chunk_size):
+            yield self._score(chunk, proba=True)
+
+    def _preprocess_input(self, data: InputData) -> np.ndarray:
+        """Preprocess input data to match training format."""
+        with warnings.catch_warnings():
+            warnings.filterwarnings('ignore', message='X does not have valid feature names')
+            return self._collect(
+                (self.scaler.transform(chunk) for chunk in self._iter_chunks(data)),
+                (0, len(self.feature_names))
+            )
+
+    def _score(self, chunk: np.ndarray, proba: bool) -> np.ndarray:
+        """Scale and score a raw float64 chunk whose columns are in feature_names order."""
+        with warnings.catch_warnings():
+            # Columns were matched by name before reaching here; plain arrays skip DataFrame overhead
+            warnings.filterwarnings('ignore', message='X does not have valid feature names')
+            scaled = self.scaler.transform(chunk)
+            if not proba:
+                return self.model.predict(scaled)
+            if hasattr(self.model, 'predict_proba'):
+                return self.model.predict_proba(scaled)
             # Fallback for models without predict_proba
-            pred = self.model.predict(processed_data)
+            pred = self.model.predict(scaled)
             return np.column_stack([1-pred, pred])
 
-    def _preprocess_input(self, data: Union[Dict, List[Dict], pd.DataFrame, np.ndarray]) -> np.ndarray:
-        """Preprocess input data to match training format."""
+    def _iter_chunks(self, data: InputData, chunk_size: Optional[int] = None) -> Iterator[np.ndarray]:
+        """
+        Split input into C-contiguous float64 chunks of at most chunk_size rows.
+
+        Arrays are sliced without copying when they are already float64 and
+        C-contiguous. DataFrame columns are copied straight into a reused
+        buffer, and records are written row by row into it, so a yielded chunk
+        is only valid until the next one is requested.
+        """
+        chunk_size = chunk_size or self.chunk_size
+        n_features = len(self.feature_names)
+
         if isinstance(data, dict):
             data = [data]
 
-        if isinstance(data, list):
-            df = pd.DataFrame(data)
+        if isinstance(data, np.ndarray):
+            if data.ndim == 1:
+                data = data.reshape(1, -1) if data.size else data.reshape(0, n_features)
+            if data.ndim != 2 or data.shape[1] != n_features:
+                raise ValueError(f"Expected array of shape (n, {n_features}), got {data.shape}")
+            for start in range(0, len(data), chunk_size):
+                yield np.ascontiguousarray(data[start:start + chunk_size], dtype=np.float64)
+
         elif isinstance(data, pd.DataFrame):
-            df = data.copy()
-        elif isinstance(data, np.ndarray):
-            df = pd.DataFrame(data, columns=self.feature_names)
-        else:
+            if not len(data):
+                return
+            positions = data.columns.get_indexer(self.feature_names)
+            if (positions < 0).any():
+                missing = [name for name, pos in zip(self.feature_names, positions) if pos < 0]
+                raise ValueError(f"Missing required feature: {missing[0]}")
+            columns = [data.iloc[:, pos].to_numpy() for pos in positions]
+            buffer = np.empty((min(chunk_size, len(data)), n_features), dtype=np.float64)
+            for start in range(0, len(data), chunk_size):
+                chunk = buffer[:min(chunk_size, len(data) - start)]
+                for j, column in enumerate(columns):
+                    chunk[:, j] = column[start:start + len(chunk)]
+                yield chunk
+
+        elif isinstance(data, (str, bytes)) or not hasattr(data, '__iter__'):
             raise ValueError("Unsupported data type")
 
-        # Ensure all required features are present
-        for feature in self.feature_names:
-            if feature not in df.columns:
-                raise ValueError(f"Missing required feature: {feature}")
-
-        # Select and order features correctly
-        df = df[self.feature_names]
-
-        # Scale the features
-        scaled_data = self.scaler.transform(df)
-
-        return scaled_data
+        else:
+            # Sized inputs (lists) smaller than a chunk only need a buffer of their own length
+            size = min(chunk_size, len(data)) if hasattr(data, '__len__') else chunk_size
+            buffer = np.empty((size, n_features), dtype=np.float64)
+            n = 0
+            for record in data:
+                if isinstance(record, dict):
+                    try:
+                        buffer[n] = self._get_features(record)
+                    except KeyError as e:
+                        raise ValueError(f"Missing required feature: {e.args[0]}") from None
+                else:
+                    buffer[n] = record
+                n += 1
+                if n == chunk_size:
+                    yield buffer
+                    n = 0
+            if n:
+                yield buffer[:n]
+
+    @staticmethod
+    def _collect(chunks: Iterable[np.ndarray], empty_shape: tuple) -> np.ndarray:
+        """Concatenate chunk results (without copying when there is a single chunk); empty input gives an empty array."""
+        results = list(chunks)
+        if not results:
+            return np.empty(empty_shape)
+        return results[0] if len(results) == 1 else np.concatenate(results)
 
 # Example usage:
 # predictor = DiabetesPredictor('path/to/model.joblib', 'path/to/scaler.joblib')
 # result = predictor.predict({"Pregnancies": 1, "Glucose": 120, "BloodPressure": 70, ...})
 # probabilities = predictor.predict_proba({"Pregnancies": 1, "Glucose": 120, ...})
+# for probabilities in predictor.iter_predict_proba(record_generator, chunk_size=10000):
+#     ...
@@ -0,0 +1,223 @@
+"""
+Model Distillation
+Huấn luyện một student nhỏ, nhanh bắt chước xác suất của model tốt nhất (teacher)
+
+    - Transfer set: tập train + dữ liệu tăng cường (nhiễu Gaussian và mixup giữa
+      các dòng trong không gian đã scale), được gán nhãn mềm bởi teacher
+    - Students: cây quyết định nông, logistic L1 với các feature tương tác bậc 2,
+      MLP nhỏ
+    - Báo cáo: độ trung thành với teacher (sai khác xác suất, tỷ lệ đồng ý nhãn,
+      chênh lệch ROC-AUC) và mức tăng tốc khi serve
+    - Chỉ student nhanh hơn teacher (speedup_single > min_speedup) mới được chọn
+
+Nhãn mềm được học bằng cách nhân đôi mỗi dòng thành nhãn 1 với trọng số p và nhãn
+0 với trọng số 1 - p (cross-entropy với target mềm). Vì vậy student là estimator
+thuần scikit-learn, load được bởi ml-service như mọi artifact khác.
+"""
+
+import time
+import numpy as np
+from typing import Any, Dict, Optional
+
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.neural_network import MLPClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import PolynomialFeatures
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.utils.validation import has_fit_parameter
+
+from model_config import DISTILLATION_CONFIG
+from serving_cost import measure_serving_cost
+
+
+def build_students(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Các student chưa fit theo DISTILLATION_CONFIG"""
+    config = {**DISTILLATION_CONFIG, **(config or {})}
+    seed = config['random_state']
+    students = {
+        'tree': DecisionTreeClassifier(
+            max_depth=config['tree_max_depth'],
+            min_samples_leaf=config['tree_min_samples_leaf'],
+            random_state=seed
+        ),
+        'sparse_logistic': make_pipeline(
+            PolynomialFeatures(degree=2, interaction_only=True, include_bias=False),
+            LogisticRegression(penalty='l1', C=config['logistic_C'], solver='liblinear', max_iter=2000)
+        ),
+        'mlp': MLPClassifier(
+            hidden_layer_sizes=config['mlp_hidden_layer_sizes'],
+            max_iter=config['mlp_max_iter'],
+            early_stopping=False,
+            random_state=seed
+        )
+    }
+    return {name: students[name] for name in config['students'] if name in students}
+
+
+def augment(X: np.ndarray, n_samples: int, noise: float = 0.1, mixup: float = 0.5, seed: int = 42) -> np.ndarray:
+    """
+    Sinh dữ liệu tăng cường quanh phân phối của X (đã scale)
+
+    Args:
+        n_samples: Số dòng sinh thêm
+        noise: Độ lệch chuẩn của nhiễu, tính theo std của từng feature
+        mixup: Tỷ lệ dòng được tạo bằng nội suy giữa hai dòng ngẫu nhiên
+    """
+    rng = np.random.default_rng(seed)
+    X = np.asarray(X, dtype=np.float64)
+    base = X[rng.integers(0, len(X), n_samples)]
+
+    n_mix = int(n_samples * mixup)
+    if n_mix:
+        partners = X[rng.integers(0, len(X), n_mix)]
+        weights = rng.uniform(0, 1, (n_mix, 1))
+        base[:n_mix] = weights * base[:n_mix] + (1 - weights) * partners
+
+    scale = X.std(axis=0) * noise
+    return base + rng.normal(0, 1, base.shape) * scale
+
+
+def fit_soft(student, X: np.ndarray, soft_targets: np.ndarray):
+    """Fit classifier trên nhãn mềm (mỗi dòng thành 2 dòng có trọng số p và 1 - p)"""
+    n = len(X)
+    X_dup = np.vstack([X, X])
+    y_dup = np.concatenate([np.ones(n, dtype=np.int64), np.zeros(n, dtype=np.int64)])
+    weights = np.concatenate([soft_targets, 1 - soft_targets])
+
+    final_step = student.steps[-1][0] if hasattr(student, 'steps') else None
+    if final_step is not None:
+        student.fit(X_dup, y_dup, **{f'{final_step}__sample_weight': weights})
+    else:
+        student.fit(X_dup, y_dup, sample_weight=weights)
+    return student
+
+
+def _supports_soft_targets(student) -> bool:
+    estimator = student.steps[-1][1] if hasattr(student, 'steps') else student
+    return has_fit_parameter(estimator, 'sample_weight')
+
+
+def fidelity(teacher_proba: np.ndarray, student_proba: np.ndarray, y_true: Optional[np.ndarray] = None) -> Dict[str, float]:
+    """Mức độ student bắt chước teacher (và chênh lệch ROC-AUC nếu có nhãn thật)"""
+    result = {
+        'mean_abs_proba_diff': float(np.mean(np.abs(teacher_proba - student_proba))),
+        'max_abs_proba_diff': float(np.max(np.abs(teacher_proba - student_proba))),
+        'label_agreement': float(np.mean((teacher_proba >= 0.5) == (student_proba >= 0.5)))
+    }
+    if y_true is not None:
+        teacher_auc = roc_auc_score(y_true, teacher_proba)
+        student_auc = roc_auc_score(y_true, student_proba)
+        result.update({
+            'teacher_roc_auc': float(teacher_auc),
+            'student_roc_auc': float(student_auc),
+            'roc_auc_gap': float(teacher_auc - student_auc)
+        })
+    return result
+
+
+def distill(
+    teacher,
+    X_train: np.ndarray,
+    X_test: np.ndarray,
+    y_test: Optional[np.ndarray] = None,
+    students: Optional[Dict[str, Any]] = None,
+    config: Optional[Dict[str, Any]] = None,
+    verbose: bool = True
+) -> Dict[str, Any]:
+    """
+    Distill teacher vào từng student và so sánh
+
+    Args:
+        teacher: Model đã fit có predict_proba
+        X_train: Tập train đã scale (nền cho transfer set)
+        X_test, y_test: Tập test đã scale để đo fidelity
+        students: Dict tên -> estimator chưa fit (mặc định build_students(config))
+        config: Ghi đè DISTILLATION_CONFIG
+
+    Returns:
+        Dict với 'students' (fidelity, chi phí serving, speedup, model đã fit),
+        'best' (trong các student nhanh hơn teacher, student có ROC-AUC gap nhỏ nhất,
+        hoà thì nhanh hơn; None nếu không student nào nhanh hơn), 'teacher_cost'
+        và kích thước transfer set
+    """
+    config = {**DISTILLATION_CONFIG, **(config or {})}
+    students = students if students is not None else build_students(config)
+
+    X_train = np.asarray(X_train, dtype=np.float64)
+    X_test = np.asarray(X_test, dtype=np.float64)
+    n_augment = int(len(X_train) * config['augment_factor'])
+    X_transfer = np.vstack([
+        X_train,
+        augment(X_train, n_augment, config['noise'], config['mixup'], config['random_state'])
+    ])
+    soft_targets = teacher.predict_proba(X_transfer)[:, 1]
+    teacher_test = teacher.predict_proba(X_test)[:, 1]
+    teacher_cost = measure_serving_cost(teacher, X_test)
+
+    if verbose:
+        print(f"🧪 Transfer set: {len(X_train)} dòng train + {n_augment} dòng tăng cường")
+        print(f"👨‍🏫 Teacher: {type(teacher).__name__} | p99 {teacher_cost['Latency_Single_p99_ms']:.3f} ms | "
+              f"{teacher_cost['Artifact_Bytes'] / 1024:.1f} KB")
+
+    reports = {}
+    for name, student in students.items():
+        if not _supports_soft_targets(student):
+            if verbose:
+                print(f"  ⚠️  {name}: estimator không hỗ trợ sample_weight (cần scikit-learn mới hơn), bỏ qua")
+            continue
+
+        start = time.perf_counter()
+        fit_soft(student, X_transfer, soft_targets)
+        fit_time = time.perf_counter() - start
+
+        student_test = student.predict_proba(X_test)[:, 1]
+        cost = measure_serving_cost(student, X_test)
+        report = {
+            **fidelity(teacher_test, student_test, y_test),
+            'fit_time_s': fit_time,
+            'latency_single_p99_ms': cost['Latency_Single_p99_ms'],
+            'latency_batch_ms': cost['Latency_Batch_ms'],
+            'artifact_bytes': cost['Artifact_Bytes'],
+            'speedup_single': teacher_cost['Latency_Single_p99_ms'] / cost['Latency_Single_p99_ms'],
+            'speedup_batch': teacher_cost['Latency_Batch_ms'] / cost['Latency_Batch_ms'],
+            'model': student
+        }
+        reports[name] = report
+
+        if verbose:
+            gap = f" | AUC gap {report['roc_auc_gap']:+.4f}" if 'roc_auc_gap' in report else ''
+            print(f"  🎓 {name}: |Δp| {report['mean_abs_proba_diff']:.4f} | đồng ý {report['label_agreement'] * 100:.1f}%"
+                  f"{gap} | p99 {report['latency_single_p99_ms']:.3f} ms (x{report['speedup_single']:.1f})")
+
+    if not reports:
+        raise RuntimeError("Không có student nào được huấn luyện")
+
+    gap_key = 'roc_auc_gap' if y_test is not None else 'mean_abs_proba_diff'
+    faster = [name for name in reports if reports[name]['speedup_single'] > config['min_speedup']]
+    if verbose and len(faster) < len(reports):
+        slower = [name for name in reports if name not in faster]
+        print(f"  ⚠️  Không nhanh hơn teacher (x{config['min_speedup']}), loại: {slower}")
+    best = min(faster, key=lambda name: (reports[name][gap_key], reports[name]['latency_single_p99_ms'])) if faster else None
+    return {
+        'best': best,
+        'students': reports,
+        'teacher_cost': teacher_cost,
+        'n_transfer': len(X_transfer),
+        'n_augmented': n_augment
+    }
+
+
+def summarize(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Báo cáo JSON-serializable (bỏ các model đã fit) để ghi vào metadata"""
+    return {
+        'best': report['best'],
+        'n_transfer': report['n_transfer'],
+        'n_augmented': report['n_augmented'],
+        'teacher_latency_single_p99_ms': report['teacher_cost']['Latency_Single_p99_ms'],
+        'teacher_artifact_bytes': report['teacher_cost']['Artifact_Bytes'],
+        'students': {
+            name: {key: value for key, value in student.items() if key != 'model'}
+            for name, student in report['students'].items()
+        }
+    }
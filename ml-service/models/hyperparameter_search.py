@@ -0,0 +1,204 @@
+"""
+Hyperparameter Search
+Tối ưu hyperparameters theo HYPERPARAMETER_SEARCH_SPACES và OPTIMIZATION_CONFIG trong model_config.py
+
+    - Grid hoặc random search ('method'), đánh giá song song theo CPU budget ('n_jobs' giới hạn số tác vụ đồng thời)
+    - Kết quả từng bộ tham số được lưu trên đĩa, chạy lại không phải tính lại
+    - Dừng sớm khi điểm tốt nhất không cải thiện sau 'early_stopping_rounds' bộ tham số
+"""
+
+import os
+import json
+import time
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import joblib
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold, cross_val_score
+
+from cpu_budget import CpuBudget, THREAD_PARAMS, describe
+from model_config import HYPERPARAMETER_SEARCH_SPACES, OPTIMIZATION_CONFIG, CV_CONFIG
+
+
+def candidate_params(space: Dict[str, list], method: str, n_iter: int, random_state: int = 42) -> List[Dict[str, Any]]:
+    """Danh sách bộ tham số cần thử (random search dùng toàn bộ grid nếu grid nhỏ hơn n_iter)"""
+    grid = ParameterGrid(space)
+    if method == 'grid' or len(grid) <= n_iter:
+        return list(grid)
+    if method == 'random':
+        return list(ParameterSampler(space, n_iter=n_iter, random_state=random_state))
+    raise ValueError(f"Search method không hợp lệ: {method} (chỉ 'grid' hoặc 'random')")
+
+
+class SearchCache:
+    """
+    Bộ nhớ đệm trên đĩa cho điểm CV của từng bộ tham số
+
+    Key gồm model, tham số gốc của estimator, bộ tham số, dữ liệu và cấu hình CV,
+    nên cache tự mất hiệu lực khi bất kỳ yếu tố nào thay đổi.
+    """
+
+    def __init__(self, cache_dir: Optional[str], model_name: str):
+        self.path = Path(cache_dir) / f'{model_name}.json' if cache_dir else None
+        self.entries = {}
+        if self.path is not None and self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(key)
+
+    def put(self, key: str, entry: Dict[str, Any]):
+        self.entries[key] = entry
+
+    def save(self):
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def _evaluate(estimator, params: Dict[str, Any], X, y, cv, scoring: str) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        model = clone(estimator).set_params(**params)
+        scores = cross_val_score(model, X, y, cv=cv, scoring=scoring, error_score='raise')
+        result = {'score': float(scores.mean()), 'std': float(scores.std())}
+    except Exception as e:
+        # Tổ hợp tham số không hợp lệ (vd: penalty/solver không tương thích)
+        result = {'score': None, 'std': None, 'error': str(e)}
+    result['fit_time'] = time.perf_counter() - start
+    return result
+
+
+def search_model(
+    model_name: str,
+    estimator,
+    X,
+    y,
+    space: Optional[Dict[str, list]] = None,
+    config: Optional[Dict[str, Any]] = None,
+    verbose: bool = True,
+    budget: Optional[CpuBudget] = None
+) -> Dict[str, Any]:
+    """
+    Tối ưu hyperparameters cho một model
+
+    Args:
+        model_name: Tên model (key trong HYPERPARAMETER_SEARCH_SPACES)
+        estimator: Estimator gốc (chưa fit); tham số tìm kiếm được set lên bản clone
+        X, y: Tập train
+        space: Search space (mặc định HYPERPARAMETER_SEARCH_SPACES[model_name])
+        config: Ghi đè OPTIMIZATION_CONFIG
+        budget: CPU budget chia giữa các bộ tham số và luồng bên trong model (mặc định toàn bộ core)
+
+    Returns:
+        Dict với best_params, best_score, số bộ tham số đã đánh giá/lấy từ cache,
+        stopped_early và history
+    """
+    config = {**OPTIMIZATION_CONFIG, **(config or {})}
+    space = space if space is not None else HYPERPARAMETER_SEARCH_SPACES.get(model_name)
+    if not space:
+        raise KeyError(f"Không có search space cho {model_name}")
+
+    candidates = candidate_params(space, config['method'], config['n_iter'], CV_CONFIG['random_state'])
+    cv = StratifiedKFold(n_splits=config['cv_folds'], shuffle=CV_CONFIG['shuffle'], random_state=CV_CONFIG['random_state'])
+
+    # Song song ở mức bộ tham số; core còn dư (nếu có) dành cho luồng bên trong estimator
+    budget = budget or CpuBudget()
+    max_tasks = config['n_jobs'] if config['n_jobs'] and config['n_jobs'] > 0 else budget.total
+    n_tasks = min(len(candidates), max_tasks)
+    allocation = budget.split_for(estimator, n_tasks)
+    base = budget.configure(clone(estimator), allocation.inner)
+
+    cache = SearchCache(config.get('cache_dir'), model_name)
+    # Số luồng không ảnh hưởng kết quả nên không nằm trong key của cache
+    base_params = {key: value for key, value in base.get_params().items() if key.split('__')[-1] not in THREAD_PARAMS}
+    context = joblib.hash((
+        type(base).__name__, base_params, np.asarray(X), np.asarray(y),
+        config['cv_folds'], CV_CONFIG['random_state'], config['scoring']
+    ))
+    keys = [joblib.hash((context, params)) for params in candidates]
+
+    batch_size = allocation.outer * 2
+    patience = config.get('early_stopping_rounds')
+    min_delta = config.get('min_delta', 0.0)
+
+    history = []
+    best_index, best_score = None, -np.inf
+    since_improvement = 0
+    n_cached = 0
+    stopped_early = False
+    start = time.perf_counter()
+
+    with budget.limit(allocation), Parallel(n_jobs=allocation.outer) as parallel:
+        for batch_start in range(0, len(candidates), batch_size):
+            batch = range(batch_start, min(batch_start + batch_size, len(candidates)))
+            pending = [i for i in batch if cache.get(keys[i]) is None]
+            n_cached += len(batch) - len(pending)
+
+            results = parallel(
+                delayed(_evaluate)(base, candidates[i], X, y, cv, config['scoring']) for i in pending
+            )
+            for i, result in zip(pending, results):
+                cache.put(keys[i], {'params': repr(candidates[i]), **result})
+            cache.save()
+
+            for i in batch:
+                entry = cache.get(keys[i])
+                history.append({'params': candidates[i], **entry})
+                if entry['score'] is not None and entry['score'] > best_score + min_delta:
+                    best_index, best_score = i, entry['score']
+                    since_improvement = 0
+                else:
+                    since_improvement += 1
+
+            if patience and since_improvement >= patience:
+                stopped_early = True
+                break
+
+    if best_index is None:
+        raise RuntimeError(f"Không có bộ tham số hợp lệ cho {model_name}")
+
+    if verbose:
+        print(f"  🔧 {model_name}: {len(history)}/{len(candidates)} bộ tham số "
+              f"({n_cached} từ cache{', dừng sớm' if stopped_early else ''}, {describe(allocation)}) "
+              f"→ {config['scoring']} {best_score:.4f} ({time.perf_counter() - start:.1f}s)")
+
+    return {
+        'model_name': model_name,
+        'best_params': candidates[best_index],
+        'best_score': best_score,
+        'n_candidates': len(candidates),
+        'n_evaluated': len(history),
+        'n_cached': n_cached,
+        'stopped_early': stopped_early,
+        'elapsed': time.perf_counter() - start,
+        'history': history
+    }
+
+
+def search_models(models: Dict[str, Any], X, y, names: Optional[List[str]] = None, **kwargs) -> Dict[str, Dict[str, Any]]:
+    """
+    Tối ưu tất cả models có search space (hoặc các model trong names)
+
+    Returns:
+        Dict tên model -> kết quả search_model
+    """
+    names = names or [name for name in models if name in HYPERPARAMETER_SEARCH_SPACES]
+    results = {}
+    for name in names:
+        try:
+            results[name] = search_model(name, models[name], X, y, **kwargs)
+        except Exception as e:
+            print(f"  ❌ {name}: {e}")
+    return results
@@ -3,12 +3,21 @@ ML Models Configuration
 Cấu hình tập trung cho tất cả các ML models trong dự án
 """
 
-# Model availability flags (sẽ được set runtime)
-XGBOOST_AVAILABLE = False
-LIGHTGBM_AVAILABLE = False
-CATBOOST_AVAILABLE = False
-IMBLEARN_AVAILABLE = False
-OPTUNA_AVAILABLE = False
+import os
+import logging
+import importlib.util
+
+
+def _is_installed(package):
+    """Kiểm tra thư viện đã được cài chưa mà không import"""
+    return importlib.util.find_spec(package) is not None
+
+
+# Model availability flags
+XGBOOST_AVAILABLE = _is_installed('xgboost')
+LIGHTGBM_AVAILABLE = _is_installed('lightgbm')
+CATBOOST_AVAILABLE = _is_installed('catboost')
+IMBLEARN_AVAILABLE = _is_installed('imblearn')
 
 # Model categories và descriptions
 MODEL_CATEGORIES = {
@@ -113,8 +122,7 @@ DEFAULT_HYPERPARAMETERS = {
         'random_state': 42,
         'n_estimators': 100,
         'eval_metric': 'logloss',
-        'verbosity': 0,
-        'use_label_encoder': False
+        'verbosity': 0
     },
     'LightGBM': {
         'random_state': 42,
@@ -124,7 +132,8 @@ DEFAULT_HYPERPARAMETERS = {
     'CatBoost': {
         'random_state': 42,
         'iterations': 100,
-        'verbose': False
+        'verbose': False,
+        'allow_writing_files': False
     },
     'K_Nearest_Neighbors': {
         'n_neighbors': 5,
@@ -266,14 +275,56 @@ TRAINING_CONFIG = {
     'cv_folds': 5
 }
 
+# Dataset cache configuration (xem data_loader.py)
+DATA_CACHE_CONFIG = {
+    'cache_dir': os.getenv('DATA_CACHE_DIR'),  # None = <thư mục dataset>/.cache
+    'chunksize': 100_000                       # Số dòng mỗi khối khi đọc CSV
+}
+
+# CPU budget cho huấn luyện song song (xem cpu_budget.py)
+CPU_BUDGET_CONFIG = {
+    'total_cpus': int(os.getenv('ML_CPU_BUDGET', 0)) or None  # None = số core khả dụng (affinity/cgroup)
+}
+
 # Hyperparameter optimization configuration
 OPTIMIZATION_CONFIG = {
     'method': 'random',  # 'grid' or 'random'
-    'n_iter': 100,       # For RandomizedSearchCV
+    'n_iter': 100,       # Số bộ tham số cho random search
     'cv_folds': 5,
     'n_jobs': -1,
     'verbose': 1,
-    'scoring': PRIMARY_METRIC
+    'scoring': PRIMARY_METRIC,
+    'early_stopping_rounds': 30,  # Dừng khi không cải thiện sau N bộ tham số (None = tắt)
+    'min_delta': 1e-4,            # Mức cải thiện tối thiểu được tính
+    'cache_dir': os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'hyperparameter_search')
+}
+
+# Chọn model theo ràng buộc chi phí serving (xem serving_cost.py)
+SELECTION_CONFIG = {
+    'metric': 'Test_ROC_AUC',
+    'constraints': {
+        'Latency_Single_p99_ms': None,  # Latency tối đa cho 1 dòng (None = không giới hạn)
+        'Artifact_Bytes': None,         # Kích thước file model tối đa
+        'Memory_Bytes': None            # Bộ nhớ tối đa sau khi load
+    },
+    'single_iterations': 200,  # Số lần đo latency 1 dòng
+    'batch_size': 1000         # Số dòng mỗi batch khi đo throughput
+}
+
+# Distill model tốt nhất vào một student nhỏ để serve (xem distillation.py)
+DISTILLATION_CONFIG = {
+    'students': ['tree', 'sparse_logistic', 'mlp'],
+    'augment_factor': 2.0,            # Số dòng tăng cường = augment_factor x số dòng train
+    'noise': 0.1,                     # Độ lệch chuẩn nhiễu (theo std của từng feature)
+    'mixup': 0.5,                     # Tỷ lệ dòng tăng cường tạo bằng mixup
+    'tree_max_depth': 6,
+    'tree_min_samples_leaf': 5,
+    'logistic_C': 0.5,                # Nghịch đảo độ mạnh L1 (nhỏ hơn = thưa hơn)
+    'mlp_hidden_layer_sizes': (16,),
+    'mlp_max_iter': 500,
+    'max_auc_gap': 0.01,              # Chỉ thay teacher khi student kém hơn không quá mức này
+    'min_speedup': 1.0,               # ... và p99 1 dòng nhanh hơn teacher quá số lần này
+    'random_state': 42
 }
 
 # Model export configuration
@@ -282,7 +333,8 @@ EXPORT_CONFIG = {
     'include_timestamp': True,
     'save_metadata': True,
     'save_scaler': True,
-    'save_production_code': True
+    'save_production_code': True,
+    'standalone_predictor': True  # Predictor không phụ thuộc thư viện (xem predictor_codegen.py)
 }
 
 # Visualization configuration
@@ -328,7 +380,6 @@ def get_available_models():
 
 def print_config_summary():
     """Print configuration summary"""
-    import logging
     logger = logging.getLogger(__name__)
     
     logger.info("="*60)
@@ -0,0 +1,137 @@
+"""
+Model Registry
+Factory cho tất cả models trong MODEL_CATEGORIES với DEFAULT_HYPERPARAMETERS (model_config.py)
+
+Thư viện của mỗi model chỉ được import khi model đó được tạo lần đầu; việc kiểm
+tra một thư viện có được cài hay không dùng importlib.util.find_spec nên không
+phải import (xgboost, lightgbm, catboost) chỉ để biết có dùng được hay không.
+"""
+
+import importlib
+import importlib.util
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from model_config import MODEL_CATEGORIES, DEFAULT_HYPERPARAMETERS
+
+# Tên model -> (module, class)
+MODEL_CLASSES = {
+    'Logistic_Regression': ('sklearn.linear_model', 'LogisticRegression'),
+    'Ridge_Classifier': ('sklearn.linear_model', 'RidgeClassifier'),
+    'Linear_Discriminant': ('sklearn.discriminant_analysis', 'LinearDiscriminantAnalysis'),
+    'Quadratic_Discriminant': ('sklearn.discriminant_analysis', 'QuadraticDiscriminantAnalysis'),
+    'Decision_Tree': ('sklearn.tree', 'DecisionTreeClassifier'),
+    'Random_Forest': ('sklearn.ensemble', 'RandomForestClassifier'),
+    'Extra_Trees': ('sklearn.ensemble', 'ExtraTreesClassifier'),
+    'Gradient_Boosting': ('sklearn.ensemble', 'GradientBoostingClassifier'),
+    'AdaBoost': ('sklearn.ensemble', 'AdaBoostClassifier'),
+    'XGBoost': ('xgboost', 'XGBClassifier'),
+    'LightGBM': ('lightgbm', 'LGBMClassifier'),
+    'CatBoost': ('catboost', 'CatBoostClassifier'),
+    'K_Nearest_Neighbors': ('sklearn.neighbors', 'KNeighborsClassifier'),
+    'Support_Vector_Machine': ('sklearn.svm', 'SVC'),
+    'Naive_Bayes': ('sklearn.naive_bayes', 'GaussianNB'),
+    'Neural_Network': ('sklearn.neural_network', 'MLPClassifier')
+}
+
+INSTALL_HINTS = {
+    'xgboost': 'pip install xgboost',
+    'lightgbm': 'pip install lightgbm',
+    'catboost': 'pip install catboost'
+}
+
+
+class ModelUnavailableError(ImportError):
+    """Model không dùng được vì thư viện chưa được cài"""
+
+
+@lru_cache(maxsize=None)
+def is_available(model_name: str) -> bool:
+    """Thư viện của model đã được cài chưa (không import thư viện)"""
+    if model_name not in MODEL_CLASSES:
+        raise KeyError(f"Model không có trong registry: {model_name}")
+    package = MODEL_CLASSES[model_name][0].split('.')[0]
+    return importlib.util.find_spec(package) is not None
+
+
+def get_model_class(model_name: str):
+    """Import (lần đầu) và trả về class của model"""
+    if not is_available(model_name):
+        package = MODEL_CLASSES[model_name][0].split('.')[0]
+        raise ModelUnavailableError(
+            f"{model_name} không khả dụng. Install: {INSTALL_HINTS.get(package, f'pip install {package}')}"
+        )
+    module_name, class_name = MODEL_CLASSES[model_name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def create_model(model_name: str, **params) -> Any:
+    """
+    Tạo estimator với DEFAULT_HYPERPARAMETERS, ghi đè bằng params
+
+    Args:
+        model_name: Tên model trong MODEL_CATEGORIES
+        **params: Hyperparameters ghi đè
+    """
+    return get_model_class(model_name)(**{**DEFAULT_HYPERPARAMETERS.get(model_name, {}), **params})
+
+
+def model_category(model_name: str) -> Optional[str]:
+    for category, info in MODEL_CATEGORIES.items():
+        if model_name in info['models']:
+            return category
+    return None
+
+
+def select_models(
+    names: Optional[List[str]] = None,
+    categories: Optional[List[str]] = None,
+    available_only: bool = True
+) -> List[str]:
+    """
+    Chọn tên models theo tên và/hoặc category (thứ tự như MODEL_CATEGORIES)
+
+    Args:
+        names: Tên models cần chọn (None = tất cả)
+        categories: Categories cần chọn, vd ['linear', 'boosting'] (None = tất cả)
+        available_only: Bỏ qua models chưa cài thư viện
+    """
+    unknown = [name for name in names or [] if name not in MODEL_CLASSES]
+    unknown += [category for category in categories or [] if category not in MODEL_CATEGORIES]
+    if unknown:
+        raise KeyError(f"Không có trong registry: {unknown}")
+
+    selected = []
+    for category, info in MODEL_CATEGORIES.items():
+        if categories and category not in categories:
+            continue
+        for name in info['models']:
+            if names and name not in names:
+                continue
+            if available_only and not is_available(name):
+                continue
+            selected.append(name)
+    return selected
+
+
+def build_models(
+    names: Optional[List[str]] = None,
+    categories: Optional[List[str]] = None,
+    overrides: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Tạo các estimator được chọn (chỉ import thư viện của những model này)
+
+    Args:
+        names: Tên models (None = tất cả)
+        categories: Categories (None = tất cả)
+        overrides: Dict tên model -> hyperparameters ghi đè
+
+    Returns:
+        Dict tên model -> estimator chưa fit
+    """
+    overrides = overrides or {}
+    return {
+        name: create_model(name, **overrides.get(name, {}))
+        for name in select_models(names, categories)
+    }
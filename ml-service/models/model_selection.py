@@ -0,0 +1,139 @@
+"""
+Successive Halving Model Selection
+Chọn model tốt nhất trong model zoo mà không phải chạy full CV cho mọi model
+
+Mỗi vòng, tất cả ứng viên còn lại được đánh giá (CV ROC-AUC) trên một tập con
+dữ liệu; chỉ 1/eta ứng viên tốt nhất được giữ lại và vòng sau nhận lượng dữ
+liệu gấp eta lần. Vòng cuối dùng toàn bộ tập train với đủ số fold.
+"""
+
+import math
+import time
+from typing import Any, Dict, List, Optional
+
+from sklearn.base import clone
+from sklearn.model_selection import StratifiedKFold, cross_val_score, train_test_split
+
+from cpu_budget import CpuBudget
+
+
+def _subsample(X, y, n_samples: int, random_state: int):
+    if n_samples >= len(y):
+        return X, y
+    X_sub, _, y_sub, _ = train_test_split(
+        X, y, train_size=n_samples, random_state=random_state, stratify=y
+    )
+    return X_sub, y_sub
+
+
+def successive_halving(
+    models: Dict[str, Any],
+    X,
+    y,
+    eta: int = 3,
+    min_samples: Optional[int] = None,
+    cv_folds: int = 5,
+    early_cv_folds: int = 3,
+    time_budget: Optional[float] = None,
+    scoring: str = 'roc_auc',
+    random_state: int = 42,
+    verbose: bool = True,
+    budget: Optional[CpuBudget] = None
+) -> Dict[str, Any]:
+    """
+    Successive halving trên một dict model chưa fit
+
+    Args:
+        models: Dict tên -> estimator
+        X, y: Tập train
+        eta: Hệ số loại bỏ (giữ ceil(n / eta) ứng viên mỗi vòng)
+        min_samples: Số dòng ở vòng đầu (mặc định n_train / eta^(số vòng - 1))
+        cv_folds: Số fold ở vòng cuối
+        early_cv_folds: Số fold ở các vòng trước
+        time_budget: Giới hạn thời gian (giây); hết giờ thì chọn model tốt nhất của vòng gần nhất
+        scoring: Scorer của scikit-learn
+        random_state: Seed cho subsample và fold
+        budget: CPU budget chia giữa các fold và luồng bên trong model (mặc định toàn bộ core)
+
+    Returns:
+        Dict với 'winner', 'rounds' (điểm từng ứng viên mỗi vòng), 'eliminated'
+        (vòng, số dòng, điểm lúc bị loại) và 'elapsed'
+    """
+    n_train = len(y)
+    n_rounds = max(1, math.ceil(math.log(len(models), eta))) if len(models) > 1 else 1
+    if min_samples is None:
+        min_samples = n_train / eta ** (n_rounds - 1)
+    min_samples = min(n_train, max(int(min_samples), 10 * early_cv_folds))
+
+    budget = budget or CpuBudget()
+    start = time.perf_counter()
+    survivors = list(models)
+    rounds: List[Dict[str, Any]] = []
+    eliminated: Dict[str, Dict[str, Any]] = {}
+    scores: Dict[str, float] = {}
+
+    for round_index in range(n_rounds):
+        if time_budget is not None and rounds and time.perf_counter() - start > time_budget:
+            if verbose:
+                print(f"⏱️  Hết time budget sau {len(rounds)} vòng")
+            break
+
+        last_round = round_index == n_rounds - 1
+        n_samples = n_train if last_round else min(n_train, int(min_samples * eta ** round_index))
+        folds = cv_folds if last_round else early_cv_folds
+        X_round, y_round = _subsample(X, y, n_samples, random_state + round_index)
+        cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=random_state)
+
+        if verbose:
+            print(f"\n🔁 Vòng {round_index + 1}/{n_rounds}: {len(survivors)} models, {len(y_round)} samples, {folds}-fold CV")
+
+        round_start = time.perf_counter()
+        scores = {}
+        errors = {}
+        for name in survivors:
+            try:
+                allocation = budget.split_for(models[name], folds)
+                model = budget.configure(clone(models[name]), allocation.inner)
+                with budget.limit(allocation):
+                    scores[name] = float(cross_val_score(
+                        model, X_round, y_round, cv=cv, scoring=scoring, n_jobs=allocation.outer
+                    ).mean())
+            except Exception as e:
+                scores[name] = float('-inf')
+                errors[name] = str(e)
+            if verbose:
+                print(f"  - {name}: {scores[name]:.4f}")
+
+        ranked = sorted(survivors, key=lambda name: scores[name], reverse=True)
+        keep = ranked[:max(1, math.ceil(len(ranked) / eta))] if not last_round else ranked[:1]
+        dropped = [name for name in ranked if name not in keep]
+        for name in dropped:
+            eliminated[name] = {
+                'round': round_index + 1,
+                'n_samples': len(y_round),
+                'score': scores[name],
+                **({'error': errors[name]} if name in errors else {})
+            }
+
+        rounds.append({
+            'round': round_index + 1,
+            'n_samples': len(y_round),
+            'cv_folds': folds,
+            'scores': scores,
+            'kept': keep,
+            'eliminated': dropped,
+            'elapsed': time.perf_counter() - round_start
+        })
+        survivors = keep
+        if verbose and dropped:
+            print(f"  ❌ Loại: {', '.join(dropped)}")
+
+    winner = max(survivors, key=lambda name: scores.get(name, float('-inf')))
+    return {
+        'winner': winner,
+        'winner_score': scores.get(winner),
+        'eta': eta,
+        'rounds': rounds,
+        'eliminated': eliminated,
+        'elapsed': time.perf_counter() - start
+    }
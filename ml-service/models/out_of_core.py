@@ -0,0 +1,299 @@
+"""
+Out-of-core Training
+Huấn luyện trên dataset lớn hơn RAM bằng cách duyệt dữ liệu theo từng khối
+
+    - Pass 1: median (reservoir sketch) cho giá trị 0 cần thay thế,
+      thống kê StandardScaler qua partial_fit, reference profile cho drift monitor,
+      mẫu nhỏ của tập test để đo chi phí serving
+    - Pass 2: huấn luyện incremental learners (SGD logistic, Naive Bayes) bằng partial_fit;
+      với 1 epoch, tập test được chấm điểm ngay trong pass này
+    - Đánh giá: confusion matrix, log loss và ROC-AUC (histogram điểm số) cộng dồn theo khối
+
+Với epochs=1 nguồn dữ liệu chỉ được đọc hai lần. Metrics khi đó là progressive
+validation: mỗi dòng test được chấm bởi model tại thời điểm khối của nó được đọc.
+
+Train/test split dựa trên hash nội dung của từng dòng nên tất định, không phụ
+thuộc thứ tự hay kích thước khối. Bộ nhớ tối đa chỉ phụ thuộc chunksize.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sklearn.base import clone
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import GaussianNB
+from sklearn.preprocessing import StandardScaler
+
+from model_config import DIABETES_FEATURES, ZERO_REPLACEABLE_FEATURES
+from data_loader import TARGET_COLUMN
+
+# Incremental learners hỗ trợ partial_fit
+INCREMENTAL_MODELS = {
+    'SGD_Logistic_Regression': SGDClassifier(
+        loss='log_loss', alpha=1e-4, learning_rate='optimal', random_state=42
+    ),
+    'Naive_Bayes': GaussianNB()
+}
+
+CLASSES = np.array([0, 1])
+HASH_BUCKETS = 10_000
+SCORE_BINS = 1000
+RESERVOIR_SIZE = 100_000
+
+
+class ReservoirSketch:
+    """
+    Reservoir sample cố định kích thước để ước lượng quantile của một luồng giá trị
+
+    Args:
+        size: Số phần tử giữ lại
+        seed: Seed cho việc lấy mẫu
+    """
+
+    def __init__(self, size: int = RESERVOIR_SIZE, seed: int = 42):
+        self.size = size
+        self.seen = 0
+        self._values = np.empty(size, dtype=np.float64)
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        fill = min(max(self.size - self.seen, 0), len(values))
+        self._values[self.seen:self.seen + fill] = values[:fill]
+
+        rest = values[fill:]
+        if len(rest):
+            # Phần tử thứ i (toàn cục) được giữ với xác suất size / (i + 1)
+            positions = self.seen + fill + np.arange(len(rest))
+            slots = self._rng.integers(0, positions + 1)
+            keep = slots < self.size
+            self._values[slots[keep]] = rest[keep]
+        self.seen += len(values)
+
+    def quantile(self, q: float) -> float:
+        n = min(self.seen, self.size)
+        return float(np.quantile(self._values[:n], q)) if n else float('nan')
+
+
+class StreamingMetrics:
+    """Metrics phân loại nhị phân cộng dồn theo khối (ROC-AUC xấp xỉ qua histogram điểm số)"""
+
+    def __init__(self, bins: int = SCORE_BINS):
+        self.bins = bins
+        self.confusion = np.zeros((2, 2), dtype=np.int64)
+        self.positive_hist = np.zeros(bins, dtype=np.int64)
+        self.negative_hist = np.zeros(bins, dtype=np.int64)
+        self.log_loss_sum = 0.0
+
+    def update(self, y_true: np.ndarray, proba: np.ndarray):
+        y_true = np.asarray(y_true).astype(np.int64)
+        y_pred = (proba >= 0.5).astype(np.int64)
+        np.add.at(self.confusion, (y_true, y_pred), 1)
+
+        score_bins = np.minimum((proba * self.bins).astype(np.int64), self.bins - 1)
+        self.positive_hist += np.bincount(score_bins[y_true == 1], minlength=self.bins)
+        self.negative_hist += np.bincount(score_bins[y_true == 0], minlength=self.bins)
+
+        clipped = np.clip(proba, 1e-15, 1 - 1e-15)
+        self.log_loss_sum -= float(np.sum(y_true * np.log(clipped) + (1 - y_true) * np.log(1 - clipped)))
+
+    def roc_auc(self) -> float:
+        positives, negatives = self.positive_hist.sum(), self.negative_hist.sum()
+        if not positives or not negatives:
+            return float('nan')
+        # P(score_pos > score_neg) + 0.5 * P(cùng bin)
+        negatives_below = np.cumsum(self.negative_hist) - self.negative_hist
+        pairs = np.sum(self.positive_hist * (negatives_below + 0.5 * self.negative_hist))
+        return float(pairs / (positives * negatives))
+
+    def result(self) -> Dict[str, float]:
+        (tn, fp), (fn, tp) = self.confusion
+        total = self.confusion.sum()
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        return {
+            'Test_Samples': int(total),
+            'Test_Accuracy': (tp + tn) / total if total else float('nan'),
+            'Test_Precision': precision,
+            'Test_Recall': recall,
+            'Test_F1': 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+            'Test_ROC_AUC': self.roc_auc(),
+            'Test_Log_Loss': self.log_loss_sum / total if total else float('nan')
+        }
+
+
+def is_test_row(chunk: pd.DataFrame, feature_cols: List[str], test_size: float, salt: str = 'diabetes') -> np.ndarray:
+    """Split tất định theo hash nội dung dòng (dòng trùng nhau luôn cùng một phía)"""
+    hashes = pd.util.hash_pandas_object(chunk[feature_cols], index=False, hash_key=salt.ljust(16, '0')[:16])
+    return (hashes.to_numpy() % HASH_BUCKETS) < int(test_size * HASH_BUCKETS)
+
+
+class OutOfCoreTrainer:
+    """
+    Huấn luyện out-of-core từ một nguồn khối dữ liệu
+
+    Args:
+        chunk_source: Hàm không tham số trả về iterator các DataFrame (gọi lại cho mỗi pass)
+        feature_cols: Các cột feature (mặc định DIABETES_FEATURES)
+        test_size: Tỷ lệ test set
+        handle_zeros: Thay giá trị 0 của ZERO_REPLACEABLE_FEATURES bằng median
+        models: Dict tên -> estimator hỗ trợ partial_fit (mặc định INCREMENTAL_MODELS)
+        epochs: Số pass huấn luyện
+    """
+
+    def __init__(
+        self,
+        chunk_source: Callable[[], Iterable[pd.DataFrame]],
+        feature_cols: Optional[List[str]] = None,
+        test_size: float = 0.2,
+        handle_zeros: bool = True,
+        models: Optional[Dict[str, Any]] = None,
+        epochs: int = 1
+    ):
+        self.chunk_source = chunk_source
+        self.feature_cols = feature_cols or DIABETES_FEATURES
+        self.test_size = test_size
+        self.zero_cols = [col for col in ZERO_REPLACEABLE_FEATURES if handle_zeros and col in self.feature_cols]
+        self.models = {name: clone(model) for name, model in (models or INCREMENTAL_MODELS).items()}
+        self.epochs = epochs
+
+        self.medians = {}
+        self.scaler = None
+        self.reference_profile = None
+        self.serving_sample = None
+        self.metrics = None
+        self.counts = {'train': 0, 'test': 0, 'zeros_replaced': 0}
+
+    def _split(self, chunk: pd.DataFrame):
+        test = is_test_row(chunk, self.feature_cols, self.test_size)
+        return chunk[~test], chunk[test]
+
+    def _features(self, chunk: pd.DataFrame) -> np.ndarray:
+        return self._impute(chunk[self.feature_cols].to_numpy(dtype=np.float64, copy=True))
+
+    def _impute(self, X: np.ndarray) -> np.ndarray:
+        """Thay giá trị 0 bằng median (tại chỗ)"""
+        for col_name, median in self.medians.items():
+            col = self.feature_cols.index(col_name)
+            X[X[:, col] == 0, col] = median
+        return X
+
+    def compute_statistics(self, reference_profile_fn: Optional[Callable] = None, sample_rows: int = 0):
+        """
+        Pass 1: median (bỏ qua giá trị 0), thống kê scaler và reference profile trên tập train
+
+        Args:
+            reference_profile_fn: Hàm (raw features) -> profile, có thể cộng dồn
+                bằng drift_monitor.merge_reference_profiles
+            sample_rows: Giữ tối đa số dòng test đầu tiên (đã xử lý và scale) vào serving_sample
+        """
+        from drift_monitor import merge_reference_profiles
+
+        sketches = {col: ReservoirSketch(seed=index) for index, col in enumerate(self.zero_cols)}
+        zero_counts = np.zeros(len(self.feature_cols), dtype=np.int64)
+        scaler = StandardScaler()
+        profile = None
+        sample_parts, sample_remaining = [], sample_rows
+
+        for chunk in self.chunk_source():
+            train, test = self._split(chunk)
+            if sample_remaining > 0 and len(test):
+                # Giữ dạng thô, xử lý giá trị 0 và scale sau khi có median
+                rows = test[self.feature_cols][:sample_remaining].to_numpy(dtype=np.float64)
+                sample_parts.append(rows)
+                sample_remaining -= len(rows)
+            if not len(train):
+                continue
+            raw = train[self.feature_cols].to_numpy(dtype=np.float64)
+            masked = raw.copy()
+            for col_name, sketch in sketches.items():
+                col = self.feature_cols.index(col_name)
+                zeros = raw[:, col] == 0
+                sketch.update(raw[~zeros, col])
+                zero_counts[col] += int(zeros.sum())
+                masked[zeros, col] = np.nan
+
+            # StandardScaler bỏ qua NaN; giá trị 0 được cộng lại sau khi biết median
+            scaler.partial_fit(masked)
+            if reference_profile_fn is not None:
+                profile = merge_reference_profiles(profile, reference_profile_fn(raw))
+            self.counts['train'] += len(train)
+
+        if not self.counts['train']:
+            raise ValueError("Không có dòng nào trong tập train")
+
+        self.medians = {col: sketch.quantile(0.5) for col, sketch in sketches.items()}
+        for col_name, median in self.medians.items():
+            col = self.feature_cols.index(col_name)
+            _fold_constant(scaler, col, median, int(zero_counts[col]))
+        self.counts['zeros_replaced'] = int(zero_counts.sum())
+
+        self.scaler = scaler
+        self.reference_profile = profile
+        if sample_parts:
+            self.serving_sample = self.scaler.transform(self._impute(np.vstack(sample_parts)))
+        else:
+            self.serving_sample = np.empty((0, len(self.feature_cols)))
+        return self
+
+    def train(self):
+        """Pass 2: partial_fit cho từng incremental learner (chấm điểm tập test luôn khi epochs=1)"""
+        score = self.epochs == 1
+        for epoch in range(self.epochs):
+            metrics = self._start_metrics() if score else None
+            fitted = False
+            for chunk in self.chunk_source():
+                train, test = self._split(chunk)
+                if len(train):
+                    X = self.scaler.transform(self._features(train))
+                    y = train[TARGET_COLUMN].to_numpy()
+                    for model in self.models.values():
+                        model.partial_fit(X, y, classes=CLASSES)
+                    fitted = True
+                # Dòng test đứng trước mọi dòng train chưa có model để chấm, bỏ qua
+                if score and fitted and len(test):
+                    self._score(metrics, test)
+            if score:
+                self.metrics = {name: metric.result() for name, metric in metrics.items()}
+        return self
+
+    def evaluate(self) -> Dict[str, Dict[str, float]]:
+        """Metrics trên tập test; đã có sẵn từ pass huấn luyện khi epochs=1, ngược lại đọc nguồn thêm một lần"""
+        if self.metrics is not None:
+            return self.metrics
+        metrics = self._start_metrics()
+        for chunk in self.chunk_source():
+            _, test = self._split(chunk)
+            if len(test):
+                self._score(metrics, test)
+        self.metrics = {name: metric.result() for name, metric in metrics.items()}
+        return self.metrics
+
+    def _start_metrics(self) -> Dict[str, StreamingMetrics]:
+        self.counts['test'] = 0
+        return {name: StreamingMetrics() for name in self.models}
+
+    def _score(self, metrics: Dict[str, StreamingMetrics], test: pd.DataFrame):
+        X = self.scaler.transform(self._features(test))
+        y = test[TARGET_COLUMN].to_numpy()
+        for name, model in self.models.items():
+            metrics[name].update(y, model.predict_proba(X)[:, 1])
+        self.counts['test'] += len(test)
+
+
+def _fold_constant(scaler: StandardScaler, col: int, value: float, count: int):
+    """Cộng `count` giá trị bằng `value` vào thống kê của một cột (Chan et al.)"""
+    if not count:
+        return
+    n = scaler.n_samples_seen_
+    n = n.astype(np.int64, copy=True) if np.ndim(n) else np.full(len(scaler.mean_), n, dtype=np.int64)
+    n_col = n[col]
+    total = n_col + count
+    delta = value - scaler.mean_[col]
+    m2 = scaler.var_[col] * n_col + delta ** 2 * n_col * count / total
+    scaler.mean_[col] += delta * count / total
+    scaler.var_[col] = m2 / total
+    n[col] = total
+    scaler.n_samples_seen_ = n
+    scaler.scale_[col] = np.sqrt(scaler.var_[col]) or 1.0
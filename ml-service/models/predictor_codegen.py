@@ -0,0 +1,359 @@
+"""
+Standalone Predictor Codegen
+Sinh module dự đoán tự chứa: tham số scaler và model được nhúng dưới dạng literal,
+chấm điểm chỉ dùng thư viện chuẩn của Python (không joblib/numpy/pandas/scikit-learn)
+
+Module sinh ra import trong vài millisecond, phù hợp cho worker sống ngắn và job
+kiểu serverless nơi thời gian khởi động chiếm phần lớn.
+
+Hỗ trợ:
+    - Scaler: StandardScaler, RobustScaler, MinMaxScaler (kể cả clip=True) hoặc không scale
+    - Linear: LogisticRegression / SGDClassifier(loss='log_loss') -> hệ số
+    - Pipeline(PolynomialFeatures, LogisticRegression) -> các số hạng tương tác khác 0
+    - Cây: DecisionTree, RandomForest, ExtraTrees, GradientBoosting (qua tree_arrays)
+      -> if/else lồng nhau khi model nhỏ, ngược lại mảng phẳng
+    - MLPClassifier -> ma trận trọng số
+"""
+
+from typing import List, Optional, Sequence
+
+from tree_arrays import ADDITIVE_LOGIT, flatten_tree_model, is_supported as is_tree_model
+
+# Model cây có tổng số node không quá mức này được sinh thành if/else lồng nhau
+NESTED_MAX_NODES = 1024
+NESTED_MAX_DEPTH = 30  # Giới hạn độ sâu thụt lề của trình biên dịch Python
+VALUES_PER_LINE = 6
+
+_LINEAR_MODELS = ('LogisticRegression', 'LogisticRegressionCV', 'SGDClassifier')
+_ACTIVATIONS = {
+    'identity': 'a',
+    'relu': 'a if a > 0.0 else 0.0',
+    'tanh': '_tanh(a)',
+    'logistic': '_sigmoid(a)'
+}
+
+
+def _is_linear(model) -> bool:
+    if type(model).__name__ not in _LINEAR_MODELS or not hasattr(model, 'coef_'):
+        return False
+    if type(model).__name__ == 'SGDClassifier' and model.loss not in ('log_loss', 'log'):
+        return False
+    return model.coef_.shape[0] == 1
+
+
+def _split_pipeline(model):
+    """(PolynomialFeatures hoặc None, model cuối) nếu là Pipeline được hỗ trợ"""
+    steps = [step for _, step in getattr(model, 'steps', [])]
+    if len(steps) == 2 and type(steps[0]).__name__ == 'PolynomialFeatures':
+        return steps[0], steps[1]
+    return None, model
+
+
+def is_supported(model, scaler=None) -> bool:
+    """Có sinh được predictor standalone cho cặp model / scaler này không"""
+    if scaler is not None and type(scaler).__name__ not in ('StandardScaler', 'RobustScaler', 'MinMaxScaler'):
+        return False
+    poly, final = _split_pipeline(model)
+    if poly is not None:
+        return _is_linear(final)
+    if type(model).__name__ == 'MLPClassifier':
+        return model.out_activation_ == 'logistic' and model.activation in _ACTIVATIONS
+    return _is_linear(model) or is_tree_model(model)
+
+
+def _literal(values: Sequence, indent: int = 4) -> str:
+    """Tuple literal (repr của float giữ nguyên giá trị khi đọc lại), xuống dòng cho dễ đọc"""
+    items = [repr(float(v)) if not isinstance(v, (int, tuple)) else repr(v) for v in values]
+    per_line = 1 if any(isinstance(v, tuple) for v in values) else VALUES_PER_LINE
+    if len(items) <= per_line:
+        return '(' + ', '.join(items) + (',)' if len(items) == 1 else ')')
+    pad = ' ' * indent
+    lines = [pad + ', '.join(items[i:i + per_line]) + ',' for i in range(0, len(items), per_line)]
+    return '(\n' + '\n'.join(lines) + '\n)'
+
+
+def _int_literal(values) -> str:
+    return _literal([int(v) for v in values])
+
+
+def _scaler_code(scaler, n_features: int) -> List[str]:
+    """Hằng số và hàm _scale(features) -> list đã scale"""
+    name = type(scaler).__name__ if scaler is not None else None
+    if name == 'MinMaxScaler':
+        lines = [
+            '# MinMaxScaler: x * SCALE + SHIFT',
+            f'SCALE = {_literal(scaler.scale_)}',
+            f'SHIFT = {_literal(scaler.min_)}',
+            '',
+            '',
+            'def _scale(features):',
+            '    return [x * s + m for x, s, m in zip(features, SCALE, SHIFT)]'
+        ]
+        if getattr(scaler, 'clip', False):
+            # clip=True: kết quả bị kẹp vào feature_range như MinMaxScaler.transform
+            low, high = (float(v) for v in scaler.feature_range)
+            lines[0] = f'# MinMaxScaler(clip=True): min(max(x * SCALE + SHIFT, {low!r}), {high!r})'
+            lines[-1] = f'    return [min(max(x * s + m, {low!r}), {high!r}) for x, s, m in zip(features, SCALE, SHIFT)]'
+        return lines
+    if name in ('StandardScaler', 'RobustScaler'):
+        # with_mean/with_std=False (hoặc with_centering/with_scaling của RobustScaler):
+        # mean_ vẫn được tính khi fit nhưng transform bỏ qua, nên phải dựa vào cờ
+        if name == 'StandardScaler':
+            center = scaler.mean_ if scaler.with_mean else None
+            scale = scaler.scale_ if scaler.with_std else None
+        else:
+            center = scaler.center_ if scaler.with_centering else None
+            scale = scaler.scale_ if scaler.with_scaling else None
+        return [
+            f'# {name}: (x - CENTER) / SCALE',
+            f'CENTER = {_literal(center if center is not None else [0.0] * n_features)}',
+            f'SCALE = {_literal(scale if scale is not None else [1.0] * n_features)}',
+            '',
+            '',
+            'def _scale(features):',
+            '    return [(x - c) / s for x, c, s in zip(features, CENTER, SCALE)]'
+        ]
+    return [
+        '# No scaling',
+        'def _scale(features):',
+        '    return [float(x) for x in features]'
+    ]
+
+
+def _linear_code(model, poly=None) -> List[str]:
+    coef = model.coef_[0]
+    intercept = float(model.intercept_[0])
+    if poly is None:
+        return [
+            '# Logistic: P = sigmoid(INTERCEPT + COEF . x)',
+            f'COEF = {_literal(coef)}',
+            f'INTERCEPT = {intercept!r}',
+            '',
+            '',
+            'def _probability(x):',
+            '    return _sigmoid(INTERCEPT + sum(w * v for w, v in zip(COEF, x)))'
+        ]
+
+    # Mỗi feature của PolynomialFeatures là tích các feature gốc theo powers_
+    terms = []
+    for weight, powers in zip(coef, poly.powers_):
+        if weight == 0.0:
+            continue
+        indices = tuple(i for i, power in enumerate(powers) for _ in range(int(power)))
+        terms.append((float(weight), indices))
+    return [
+        f'# Logistic over {poly.powers_.shape[0]} polynomial features ({len(terms)} non-zero terms):',
+        '# P = sigmoid(INTERCEPT + sum(w * prod(x[i] for i in indices)))',
+        f'TERMS = {_literal(terms)}',
+        f'INTERCEPT = {intercept!r}',
+        '',
+        '',
+        'def _probability(x):',
+        '    z = INTERCEPT',
+        '    for w, indices in TERMS:',
+        '        for i in indices:',
+        '            w *= x[i]',
+        '        z += w',
+        '    return _sigmoid(z)'
+    ]
+
+
+def _mlp_code(model) -> List[str]:
+    # Trọng số mỗi layer lưu theo từng unit đầu ra: WEIGHTS[l][j] = cột j của coefs_[l]
+    weights = ',\n'.join(
+        _literal([tuple(float(w) for w in column) for column in layer.T]) for layer in model.coefs_
+    )
+    biases = ',\n'.join(_literal(layer) for layer in model.intercepts_)
+    return [
+        f'# MLP ({model.activation}), layer sizes {[layer.shape[1] for layer in model.coefs_]}, logistic output',
+        f'WEIGHTS = (\n{weights},\n)',
+        f'BIASES = (\n{biases},\n)',
+        '',
+        '',
+        'def _probability(x):',
+        '    last = len(WEIGHTS) - 1',
+        '    for layer, (weights, biases) in enumerate(zip(WEIGHTS, BIASES)):',
+        '        x = [sum(w * v for w, v in zip(column, x)) + b for column, b in zip(weights, biases)]',
+        '        if layer < last:',
+        f'            x = [{_ACTIVATIONS[model.activation]} for a in x]',
+        '    return _sigmoid(x[0])'
+    ]
+
+
+def _nested_tree(flat, node: int, depth: int) -> List[str]:
+    pad = '    ' * depth
+    if flat.left[node] < 0:
+        return [f'{pad}return {float(flat.value[node])!r}']
+    return [
+        f'{pad}if x[{int(flat.feature[node])}] <= {float(flat.threshold[node])!r}:',
+        *_nested_tree(flat, int(flat.left[node]), depth + 1),
+        f'{pad}else:',
+        *_nested_tree(flat, int(flat.right[node]), depth + 1)
+    ]
+
+
+def _tree_code(model, layout: str) -> List[str]:
+    flat = flatten_tree_model(model)
+    n_nodes = len(flat.left)
+    if layout == 'auto':
+        layout = 'nested' if n_nodes <= NESTED_MAX_NODES and flat.max_depth <= NESTED_MAX_DEPTH else 'flat'
+    elif layout == 'nested' and flat.max_depth > NESTED_MAX_DEPTH:
+        raise ValueError(f"Cây sâu {flat.max_depth} > {NESTED_MAX_DEPTH}, dùng tree_layout='flat'")
+
+    if flat.kind == ADDITIVE_LOGIT:
+        finish = [f'    return _sigmoid({flat.offset!r} + {flat.scale!r} * total)']
+        description = f'P = sigmoid({flat.offset:.6g} + {flat.scale:.6g} * sum of leaf values)'
+    else:
+        finish = [f'    return total / {len(flat.roots)}']
+        description = 'P = mean of leaf P(diabetes)'
+
+    lines = [f'# {len(flat.roots)} tree(s), {n_nodes} nodes, max depth {flat.max_depth}: {description}',
+             '# scikit-learn compares features as float32 against the thresholds; array("f") rounds the same way']
+    if layout == 'nested':
+        for t, root in enumerate(flat.roots):
+            lines += ['', '', f'def _tree_{t}(x):', *_nested_tree(flat, int(root), 1)]
+        lines += [
+            '', '',
+            f'TREES = ({", ".join(f"_tree_{t}" for t in range(len(flat.roots)))},)',
+            '', '',
+            'def _probability(x):',
+            "    x = array('f', x)",
+            '    total = sum(tree(x) for tree in TREES)',
+            *finish
+        ]
+        return lines
+
+    return lines + [
+        f'FEATURE = {_int_literal(flat.feature)}',
+        f'THRESHOLD = {_literal(flat.threshold)}',
+        f'LEFT = {_int_literal(flat.left)}',
+        f'RIGHT = {_int_literal(flat.right)}',
+        f'VALUE = {_literal(flat.value)}',
+        f'ROOTS = {_int_literal(flat.roots)}',
+        '',
+        '',
+        'def _probability(x):',
+        "    x = array('f', x)",
+        '    total = 0.0',
+        '    for node in ROOTS:',
+        '        left = LEFT[node]',
+        '        while left >= 0:',
+        '            node = left if x[FEATURE[node]] <= THRESHOLD[node] else RIGHT[node]',
+        '            left = LEFT[node]',
+        '        total += VALUE[node]',
+        *finish
+    ]
+
+
+def generate_standalone_predictor(
+    model,
+    scaler,
+    feature_names: Sequence[str],
+    model_name: Optional[str] = None,
+    tree_layout: str = 'auto'
+) -> str:
+    """
+    Sinh mã nguồn module dự đoán standalone
+
+    Args:
+        model: Model đã fit (xem is_supported)
+        scaler: Scaler đã fit hoặc None
+        feature_names: Thứ tự feature đầu vào
+        model_name: Tên hiển thị trong docstring của module
+        tree_layout: 'auto', 'nested' (if/else lồng nhau) hoặc 'flat' (mảng phẳng)
+
+    Returns:
+        Mã nguồn Python; API giống DiabetesPredictor của create_prediction_function
+        cộng với các hàm predict_proba_one / predict_proba_many
+    """
+    if not is_supported(model, scaler):
+        raise ValueError(f"Không sinh được predictor standalone cho {type(model).__name__} / {type(scaler).__name__}")
+    if tree_layout not in ('auto', 'nested', 'flat'):
+        raise ValueError(f"tree_layout không hợp lệ: {tree_layout}")
+
+    poly, final = _split_pipeline(model)
+    if poly is not None or _is_linear(model):
+        model_code = _linear_code(final, poly)
+    elif type(model).__name__ == 'MLPClassifier':
+        model_code = _mlp_code(model)
+    else:
+        model_code = _tree_code(model, tree_layout)
+
+    model_name = model_name or type(model).__name__
+    header = f'''"""
+Diabetes Prediction Function (standalone)
+Generated automatically from ML pipeline
+Model: {model_name} ({type(model).__name__})
+
+Scaler and model parameters are embedded as literals and scoring uses only the
+Python standard library, so importing this module takes milliseconds. Large tree
+models compile slowly the first time: ship the cached bytecode (python -m compileall).
+"""
+
+from array import array
+from math import exp, tanh as _tanh
+
+FEATURE_NAMES = {tuple(feature_names)!r}
+'''
+    body = '\n'.join(_scaler_code(scaler, len(feature_names)) + ['', ''] + model_code)
+    footer = f'''
+
+def _sigmoid(z):
+    if z >= 0:
+        return 1.0 / (1.0 + exp(-z))
+    e = exp(z)
+    return e / (1.0 + e)
+
+
+def predict_proba_one(features):
+    """P(diabetes) for one row of raw features in FEATURE_NAMES order"""
+    return _probability(_scale(features))
+
+
+def predict_proba_many(rows):
+    """P(diabetes) for each row of raw features in FEATURE_NAMES order"""
+    return [_probability(_scale(row)) for row in rows]
+
+
+class DiabetesPredictor:
+    def __init__(self, model_path=None):
+        """Parameters are embedded in this module; model_path is accepted for compatibility"""
+        self.feature_names = list(FEATURE_NAMES)
+
+    def predict(self, input_data):
+        """
+        Predict diabetes risk
+
+        Parameters:
+        - input_data: dict hoặc list với {len(feature_names)} features:
+          {list(feature_names)}
+
+        Returns:
+        - dict với prediction và probability
+        """
+        if isinstance(input_data, dict):
+            features = [input_data[name] for name in FEATURE_NAMES]
+        else:
+            features = list(input_data)
+
+        diabetes_prob = predict_proba_one(features)
+        probability = (1.0 - diabetes_prob, diabetes_prob)
+
+        if diabetes_prob < 0.3:
+            risk_level = 'low'
+        elif diabetes_prob < 0.6:
+            risk_level = 'medium'
+        else:
+            risk_level = 'high'
+
+        return {{
+            'prediction': int(diabetes_prob > 0.5),
+            'probability': {{
+                'no_diabetes': probability[0],
+                'diabetes': probability[1]
+            }},
+            'risk_level': risk_level,
+            'confidence': max(probability)
+        }}
+'''
+    return header + '\n' + body + '\n' + footer
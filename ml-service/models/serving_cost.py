@@ -0,0 +1,167 @@
+"""
+Serving Cost
+Đo chi phí phục vụ của từng model: latency 1 dòng và theo batch, kích thước
+artifact và bộ nhớ sau khi load; chọn model theo ràng buộc và Pareto frontier
+
+Chọn model chỉ theo Test_ROC_AUC có thể chọn một ensemble 300 cây tốt hơn
+logistic regression 0.002 AUC nhưng chậm hơn 100 lần khi serve. Các số đo ở
+đây được ghi vào results của pipeline và vào model_metadata_*.json.
+"""
+
+import io
+import os
+import time
+import tracemalloc
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence
+
+import joblib
+
+# Các cột được thêm vào results của pipeline
+COST_COLUMNS = (
+    'Latency_Single_p50_ms', 'Latency_Single_p99_ms',
+    'Latency_Batch_ms', 'Batch_Rows_per_s',
+    'Artifact_Bytes', 'Memory_Bytes'
+)
+
+# Mục tiêu mặc định của Pareto frontier: (cột, True nếu càng lớn càng tốt)
+DEFAULT_OBJECTIVES = (
+    ('Test_ROC_AUC', True),
+    ('Latency_Single_p99_ms', False),
+    ('Artifact_Bytes', False)
+)
+
+
+def _rss_bytes() -> Optional[int]:
+    """RSS hiện tại của process (chỉ Linux)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _time_calls(fn, n: int) -> np.ndarray:
+    timings = np.empty(n)
+    for i in range(n):
+        start = time.perf_counter()
+        fn()
+        timings[i] = time.perf_counter() - start
+    return timings * 1000
+
+
+def measure_serving_cost(
+    model,
+    X,
+    single_iterations: int = 200,
+    batch_size: int = 1000,
+    batch_repeats: int = 5,
+    warmup: int = 10
+) -> Dict[str, Any]:
+    """
+    Đo chi phí phục vụ của một model đã fit
+
+    Args:
+        model: Model có predict_proba
+        X: Dữ liệu đã scale (lấy dòng đầu làm input 1 dòng, lặp lại để đủ batch_size)
+        single_iterations: Số lần gọi predict_proba với 1 dòng
+        batch_size: Số dòng mỗi batch
+        batch_repeats: Số lần đo batch (lấy trung vị)
+
+    Returns:
+        Dict với các cột COST_COLUMNS và rss_delta_bytes (RSS tăng thêm khi load, có thể nhiễu)
+    """
+    X = np.asarray(X, dtype=np.float64)
+    row = X[:1]
+    batch = X[np.arange(batch_size) % len(X)]
+
+    for _ in range(warmup):
+        model.predict_proba(row)
+    single = _time_calls(lambda: model.predict_proba(row), single_iterations)
+    model.predict_proba(batch)
+    batch_ms = float(np.median(_time_calls(lambda: model.predict_proba(batch), batch_repeats)))
+
+    # Kích thước artifact như khi joblib.dump ra đĩa
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    artifact = buffer.getvalue()
+    del buffer
+
+    # Bộ nhớ giữ lại sau khi load artifact (tracemalloc thấy cả buffer của numpy)
+    rss_before = _rss_bytes()
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        loaded = joblib.load(io.BytesIO(artifact))
+        memory = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+    rss_after = _rss_bytes()
+    del loaded
+
+    return {
+        'Latency_Single_p50_ms': float(np.percentile(single, 50)),
+        'Latency_Single_p99_ms': float(np.percentile(single, 99)),
+        'Latency_Batch_ms': batch_ms,
+        'Batch_Rows_per_s': batch_size / (batch_ms / 1000) if batch_ms else float('inf'),
+        'Artifact_Bytes': len(artifact),
+        'Memory_Bytes': max(int(memory), 0),
+        'rss_delta_bytes': (rss_after - rss_before) if rss_before is not None and rss_after is not None else None
+    }
+
+
+def satisfies(metrics: Dict[str, Any], constraints: Dict[str, Optional[float]]) -> bool:
+    """
+    Model có thoả tất cả ràng buộc không
+
+    Args:
+        constraints: Dict cột -> giá trị tối đa (None = không ràng buộc),
+            vd {'Latency_Single_p99_ms': 5, 'Artifact_Bytes': 10_000_000}
+    """
+    return all(
+        limit is None or (column in metrics and metrics[column] <= limit)
+        for column, limit in constraints.items()
+    )
+
+
+def select_constrained(
+    results: Dict[str, Dict[str, Any]],
+    metric: str = 'Test_ROC_AUC',
+    constraints: Optional[Dict[str, Optional[float]]] = None
+) -> Optional[str]:
+    """Model có metric cao nhất trong số các model thoả ràng buộc (None nếu không có)"""
+    feasible = [name for name, metrics in results.items() if satisfies(metrics, constraints or {})]
+    if not feasible:
+        return None
+    return max(feasible, key=lambda name: results[name][metric])
+
+
+def pareto_frontier(
+    results: Dict[str, Dict[str, Any]],
+    objectives: Sequence = DEFAULT_OBJECTIVES
+) -> List[str]:
+    """
+    Các model không bị model nào khác trội hơn trên mọi mục tiêu
+
+    Args:
+        objectives: Danh sách (cột, maximize)
+
+    Returns:
+        Tên các model trên frontier, sắp theo mục tiêu đầu tiên
+    """
+    names = [name for name in results if all(column in results[name] for column, _ in objectives)]
+    # Đổi dấu để mọi mục tiêu đều là "càng nhỏ càng tốt"
+    points = {
+        name: np.array([-results[name][column] if maximize else results[name][column] for column, maximize in objectives])
+        for name in names
+    }
+    frontier = [
+        name for name in names
+        if not any(np.all(points[other] <= points[name]) and np.any(points[other] < points[name])
+                   for other in names if other != name)
+    ]
+    column, maximize = objectives[0]
+    return sorted(frontier, key=lambda name: results[name][column], reverse=maximize)
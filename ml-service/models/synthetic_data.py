@@ -0,0 +1,282 @@
+"""
+Synthetic Cohort Generator
+Sinh dữ liệu giống Pima với số dòng tùy ý (hàng triệu, hàng tỷ) theo từng khối vector hóa
+
+    - Phân phối biên: quantile thực nghiệm của pima_clean.csv (inverse CDF)
+    - Cấu trúc tương quan: Gaussian copula trên normal scores của dữ liệu gốc
+    - Giá trị 0 (missing) tùy chọn cho ZERO_REPLACEABLE_FEATURES
+    - Nhãn từ mô hình ground-truth cấu hình được ('logistic', 'rule' hoặc hàm tùy ý)
+
+Mỗi khối dùng seed riêng sinh từ (seed, chỉ số khối), nên kết quả tái lập được
+và không phụ thuộc vào việc dữ liệu được tiêu thụ thế nào.
+
+Usage:
+    python synthetic_data.py --rows 10000000 --output ../data/synthetic.csv
+"""
+
+import json
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Union
+from scipy.special import ndtr, ndtri
+from scipy.stats import rankdata
+
+from model_config import DIABETES_FEATURES, ZERO_REPLACEABLE_FEATURES
+from data_loader import COLUMN_DTYPES, TARGET_COLUMN, load_dataframe
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+DEFAULT_SOURCE = Path(__file__).resolve().parent.parent / 'data' / 'pima_clean.csv'
+
+# Tỷ lệ giá trị 0 trong dataset Pima gốc (trước khi làm sạch)
+PIMA_ZERO_RATES = {
+    'Glucose': 0.0065,
+    'BloodPressure': 0.0456,
+    'SkinThickness': 0.2956,
+    'Insulin': 0.4870,
+    'BMI': 0.0143
+}
+
+INTEGER_FEATURES = [feature for feature in DIABETES_FEATURES if np.dtype(COLUMN_DTYPES[feature]).kind == 'i']
+QUANTILE_POINTS = 1025
+DEFAULT_CHUNKSIZE = 1_000_000
+
+Labeler = Callable[[np.ndarray], np.ndarray]
+
+
+def rule_labeler(features: np.ndarray) -> np.ndarray:
+    """Luật đơn giản như create_sample_data: P(diabetes) theo số yếu tố nguy cơ"""
+    glucose = features[:, DIABETES_FEATURES.index('Glucose')]
+    bmi = features[:, DIABETES_FEATURES.index('BMI')]
+    age = features[:, DIABETES_FEATURES.index('Age')]
+    risk = (glucose > 140).astype(int) + (bmi > 35).astype(int) + (age > 45).astype(int)
+    return np.select([risk >= 2, risk == 1], [0.9, 0.2], default=0.05)
+
+
+class CohortGenerator:
+    """
+    Gaussian-copula generator cho cohort giống Pima
+
+    Args:
+        quantiles: Giá trị quantile theo từng feature (QUANTILE_POINTS điểm)
+        correlation: Ma trận tương quan của normal scores
+        logistic: Tham số labeler logistic {'mean', 'scale', 'coef', 'intercept'}
+        labeler: 'logistic', 'rule' hoặc hàm features -> P(diabetes)
+        zero_rates: Tỷ lệ giá trị 0 cho từng feature (None = không chèn)
+        deterministic_labels: Gán nhãn bằng ngưỡng 0.5 thay vì lấy mẫu Bernoulli
+    """
+
+    def __init__(
+        self,
+        quantiles: Dict[str, np.ndarray],
+        correlation: np.ndarray,
+        logistic: Optional[Dict[str, Any]] = None,
+        labeler: Union[str, Labeler] = 'logistic',
+        zero_rates: Optional[Dict[str, float]] = None,
+        deterministic_labels: bool = False
+    ):
+        self.quantiles = {feature: np.asarray(quantiles[feature], dtype=np.float64) for feature in DIABETES_FEATURES}
+        self.correlation = np.asarray(correlation, dtype=np.float64)
+        self.logistic = logistic
+        self.zero_rates = {
+            feature: float(rate) for feature, rate in (zero_rates or {}).items()
+            if feature in ZERO_REPLACEABLE_FEATURES and rate > 0
+        }
+        self.deterministic_labels = deterministic_labels
+        self.labeler = self._resolve_labeler(labeler)
+
+        self._probabilities = np.linspace(0.0, 1.0, QUANTILE_POINTS)
+        self._cholesky = np.linalg.cholesky(_nearest_correlation(self.correlation))
+
+    # ==================== Fitting / persistence ====================
+
+    @classmethod
+    def fit(cls, df: Optional[pd.DataFrame] = None, **kwargs) -> 'CohortGenerator':
+        """
+        Học phân phối biên, tương quan và labeler logistic từ dữ liệu thật
+
+        Args:
+            df: DataFrame có DIABETES_FEATURES và Outcome (mặc định pima_clean.csv)
+            **kwargs: Tham số khác của CohortGenerator
+        """
+        if df is None:
+            df = load_dataframe(DEFAULT_SOURCE)
+
+        X = df[DIABETES_FEATURES].to_numpy(dtype=np.float64)
+        probabilities = np.linspace(0.0, 1.0, QUANTILE_POINTS)
+        quantiles = {feature: np.quantile(X[:, col], probabilities) for col, feature in enumerate(DIABETES_FEATURES)}
+
+        # Normal scores theo rank (xử lý giá trị trùng bằng rank trung bình)
+        scores = ndtri(np.column_stack([rankdata(X[:, col]) for col in range(X.shape[1])]) / (len(X) + 1))
+        correlation = np.corrcoef(scores, rowvar=False)
+
+        logistic = None
+        if TARGET_COLUMN in df.columns:
+            from sklearn.linear_model import LogisticRegression
+            mean, scale = X.mean(axis=0), X.std(axis=0)
+            scale[scale == 0] = 1.0
+            model = LogisticRegression(max_iter=1000).fit((X - mean) / scale, df[TARGET_COLUMN].to_numpy())
+            logistic = {
+                'mean': mean.tolist(),
+                'scale': scale.tolist(),
+                'coef': model.coef_[0].tolist(),
+                'intercept': float(model.intercept_[0])
+            }
+
+        return cls({f: q.tolist() for f, q in quantiles.items()}, correlation, logistic, **kwargs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Tham số đã học dạng JSON (không chứa dữ liệu bệnh nhân gốc)"""
+        return {
+            'features': DIABETES_FEATURES,
+            'quantiles': {feature: values.tolist() for feature, values in self.quantiles.items()},
+            'correlation': self.correlation.tolist(),
+            'logistic': self.logistic,
+            'zero_rates': self.zero_rates
+        }
+
+    def save(self, filepath):
+        with open(filepath, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, filepath, **kwargs) -> 'CohortGenerator':
+        with open(filepath, 'r') as f:
+            params = json.load(f)
+        kwargs.setdefault('zero_rates', params.get('zero_rates'))
+        return cls(params['quantiles'], params['correlation'], params.get('logistic'), **kwargs)
+
+    # ==================== Labeling ====================
+
+    def _resolve_labeler(self, labeler: Union[str, Labeler]) -> Labeler:
+        if callable(labeler):
+            return labeler
+        if labeler == 'rule':
+            return rule_labeler
+        if labeler == 'logistic':
+            if self.logistic is None:
+                raise ValueError("Labeler 'logistic' cần tham số logistic (fit từ dữ liệu có Outcome)")
+            mean = np.asarray(self.logistic['mean'])
+            coef = np.asarray(self.logistic['coef']) / np.asarray(self.logistic['scale'])
+            intercept = self.logistic['intercept'] - float(mean @ coef)
+            return lambda features: _sigmoid(features @ coef + intercept)
+        raise ValueError(f"Labeler không hợp lệ: {labeler}")
+
+    # ==================== Sampling ====================
+
+    def sample(self, n_rows: int, rng: np.random.Generator) -> pd.DataFrame:
+        """Sinh một khối n_rows dòng"""
+        z = rng.standard_normal((n_rows, len(DIABETES_FEATURES))) @ self._cholesky.T
+        u = ndtr(z)
+
+        features = np.empty_like(u)
+        for col, feature in enumerate(DIABETES_FEATURES):
+            features[:, col] = np.interp(u[:, col], self._probabilities, self.quantiles[feature])
+        for feature in INTEGER_FEATURES:
+            col = DIABETES_FEATURES.index(feature)
+            features[:, col] = np.rint(features[:, col])
+
+        # Nhãn được gán từ giá trị thật, trước khi chèn missing
+        probabilities = self.labeler(features)
+        if self.deterministic_labels:
+            labels = probabilities >= 0.5
+        else:
+            labels = rng.random(n_rows) < probabilities
+
+        for feature, rate in self.zero_rates.items():
+            col = DIABETES_FEATURES.index(feature)
+            features[rng.random(n_rows) < rate, col] = 0.0
+
+        frame = pd.DataFrame({
+            feature: features[:, col].astype(COLUMN_DTYPES[feature])
+            for col, feature in enumerate(DIABETES_FEATURES)
+        })
+        frame[TARGET_COLUMN] = labels.astype(COLUMN_DTYPES[TARGET_COLUMN])
+        return frame
+
+    def iter_chunks(self, n_rows: int, chunksize: int = DEFAULT_CHUNKSIZE, seed: int = 42) -> Iterator[pd.DataFrame]:
+        """
+        Sinh n_rows dòng theo từng khối (bộ nhớ chỉ phụ thuộc chunksize)
+
+        Khối thứ i luôn dùng seed (seed, i), nên cùng tham số cho cùng dữ liệu.
+        """
+        for index, start in enumerate(range(0, n_rows, chunksize)):
+            rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+            yield self.sample(min(chunksize, n_rows - start), rng)
+
+    def generate(self, n_rows: int, chunksize: int = DEFAULT_CHUNKSIZE, seed: int = 42) -> pd.DataFrame:
+        """Sinh toàn bộ cohort trong bộ nhớ (cho pipeline)"""
+        return pd.concat(list(self.iter_chunks(n_rows, chunksize, seed)), ignore_index=True)
+
+    def write_csv(self, filepath, n_rows: int, chunksize: int = DEFAULT_CHUNKSIZE, seed: int = 42) -> Path:
+        """Ghi cohort ra CSV theo từng khối"""
+        filepath = Path(filepath)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        with open(filepath, 'w', newline='') as f:
+            for index, chunk in enumerate(self.iter_chunks(n_rows, chunksize, seed)):
+                chunk.to_csv(f, header=index == 0, index=False, float_format='%.6g')
+        return filepath
+
+    def write_parquet(self, filepath, n_rows: int, chunksize: int = DEFAULT_CHUNKSIZE, seed: int = 42) -> Path:
+        """Ghi cohort ra Parquet, mỗi khối là một row group (cần pyarrow)"""
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Parquet output cần pyarrow. Install: pip install pyarrow")
+
+        filepath = Path(filepath)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        writer = None
+        try:
+            for chunk in self.iter_chunks(n_rows, chunksize, seed):
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(filepath, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return filepath
+
+
+def _sigmoid(logits: np.ndarray) -> np.ndarray:
+    """Sigmoid ổn định số học"""
+    return np.exp(-np.logaddexp(0.0, -logits))
+
+
+def _nearest_correlation(matrix: np.ndarray) -> np.ndarray:
+    """Đưa ma trận về xác định dương (cắt eigenvalue âm) để Cholesky không lỗi"""
+    values, vectors = np.linalg.eigh((matrix + matrix.T) / 2)
+    fixed = vectors @ np.diag(np.clip(values, 1e-8, None)) @ vectors.T
+    d = np.sqrt(np.diag(fixed))
+    return fixed / np.outer(d, d)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Sinh cohort tổng hợp giống Pima')
+    parser.add_argument('--rows', type=int, required=True, help='Số dòng cần sinh')
+    parser.add_argument('--output', required=True, help='File đầu ra (.csv hoặc .parquet)')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--labeler', choices=['logistic', 'rule'], default='logistic')
+    parser.add_argument('--zeros', action='store_true', help='Chèn giá trị 0 theo tỷ lệ của dataset Pima gốc')
+    parser.add_argument('--source', default=str(DEFAULT_SOURCE), help='Dataset dùng để học phân phối')
+    args = parser.parse_args()
+
+    generator = CohortGenerator.fit(
+        load_dataframe(args.source),
+        labeler=args.labeler,
+        zero_rates=PIMA_ZERO_RATES if args.zeros else None
+    )
+
+    print(f"🧬 Sinh {args.rows:,} dòng → {args.output}")
+    if args.output.endswith('.parquet'):
+        generator.write_parquet(args.output, args.rows, args.chunksize, args.seed)
+    else:
+        generator.write_csv(args.output, args.rows, args.chunksize, args.seed)
+    print("✅ Hoàn thành!")
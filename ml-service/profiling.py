@@ -0,0 +1,357 @@
+"""
+On-demand Profiling for ML Service
+Admin-triggered allocation tracing and CPU sampling for a live replica
+
+tracemalloc is only started when an operator asks for it and stopped again
+afterwards, so a replica that is never profiled pays nothing. While tracing,
+the top allocation sites can be listed by size or count, named snapshots can
+be diffed against each other, and each request's net allocation (bytes and
+blocks still live when the response is produced) is accumulated per endpoint.
+
+The CPU sampler runs in the admin request's own thread and periodically reads
+the stacks of the threads currently serving requests (sys._current_frames) and aggregates
+them into collapsed stacks, the input format of flamegraph.pl, speedscope and
+similar tools. Nothing is instrumented, so request latency is unaffected
+apart from the sampler briefly holding the GIL at each tick.
+"""
+
+import os
+import sys
+import time
+import threading
+import tracemalloc
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional
+
+GROUP_BY = ('lineno', 'filename', 'traceback')
+SORT_BY = ('size', 'count')
+
+# Frames from the tracer itself and the import machinery are noise
+_TRACE_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>')
+]
+
+
+class ProfilingError(ValueError):
+    """Raised for profiler requests that cannot be served in the current state"""
+
+
+def _format_stat(stat, group_by: str) -> Dict[str, Any]:
+    frames = stat.traceback.format() if group_by == 'traceback' else None
+    frame = stat.traceback[0]
+    site = frame.filename if group_by == 'filename' else f"{frame.filename}:{frame.lineno}"
+    return {
+        'site': site,
+        **({'traceback': frames} if frames is not None else {}),
+        'size_bytes': stat.size,
+        'count': stat.count,
+        'average_bytes': round(stat.size / stat.count, 1) if stat.count else 0
+    }
+
+
+def _format_diff(stat, group_by: str) -> Dict[str, Any]:
+    return {
+        **_format_stat(stat, group_by),
+        'size_diff_bytes': stat.size_diff,
+        'count_diff': stat.count_diff
+    }
+
+
+class EndpointAllocations:
+    """Per-endpoint totals of net allocation per request"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, endpoint: str, net_bytes: int, net_blocks: int):
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = {
+                    'requests': 0, 'net_bytes': 0, 'net_blocks': 0, 'max_net_bytes': 0
+                }
+            stats['requests'] += 1
+            stats['net_bytes'] += net_bytes
+            stats['net_blocks'] += net_blocks
+            stats['max_net_bytes'] = max(stats['max_net_bytes'], net_bytes)
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                endpoint: {
+                    'requests': stats['requests'],
+                    'mean_net_bytes': round(stats['net_bytes'] / stats['requests'], 1),
+                    'mean_net_blocks': round(stats['net_blocks'] / stats['requests'], 2),
+                    'max_net_bytes': stats['max_net_bytes']
+                }
+                for endpoint, stats in sorted(self._stats.items())
+            }
+
+
+class MemoryProfiler:
+    """
+    Start/stop allocation tracing and report on it
+
+    Per-request figures are deltas of process-wide counters taken at the
+    start and end of each request, so they are exact with one request in
+    flight and approximate (overlapping requests share their allocations)
+    under concurrency.
+
+    Args:
+        max_snapshots: Named snapshots kept in memory (oldest dropped first)
+        default_frames: Frames stored per allocation when start() is not given one
+    """
+
+    def __init__(self, max_snapshots: int = 4, default_frames: int = 1):
+        self.max_snapshots = max_snapshots
+        self.default_frames = default_frames
+        self.endpoints = EndpointAllocations()
+        self._snapshots: 'OrderedDict[str, tracemalloc.Snapshot]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._started_here = False
+
+    @property
+    def tracing(self) -> bool:
+        return self._started_here and tracemalloc.is_tracing()
+
+    def start(self, frames: Optional[int] = None) -> Dict[str, Any]:
+        frames = int(frames or self.default_frames)
+        if not 1 <= frames <= 64:
+            raise ProfilingError("frames must be between 1 and 64")
+        with self._lock:
+            if tracemalloc.is_tracing():
+                raise ProfilingError("Allocation tracing is already running")
+            self.endpoints.reset()
+            self._snapshots.clear()
+            tracemalloc.start(frames)
+            self._started_here = True
+        return self.get_status()
+
+    def stop(self) -> Dict[str, Any]:
+        with self._lock:
+            if not self.tracing:
+                raise ProfilingError("Allocation tracing is not running")
+            status = self.get_status()
+            # Stopping frees the traces; snapshots taken earlier stay diffable
+            tracemalloc.stop()
+            self._started_here = False
+        return {**status, 'tracing': False, 'endpoints': self.endpoints.report()}
+
+    def get_status(self) -> Dict[str, Any]:
+        tracing = self.tracing
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            'tracing': tracing,
+            'frames': tracemalloc.get_traceback_limit() if tracing else None,
+            'traced_bytes': current,
+            'peak_traced_bytes': peak,
+            'tracemalloc_overhead_bytes': tracemalloc.get_tracemalloc_memory() if tracing else 0,
+            'snapshots': list(self._snapshots)
+        }
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        if not self.tracing:
+            raise ProfilingError("Allocation tracing is not running")
+        return tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+
+    def top(self, limit: int = 20, group_by: str = 'lineno', sort_by: str = 'size') -> List[Dict[str, Any]]:
+        """Top allocation sites of the live heap"""
+        if group_by not in GROUP_BY:
+            raise ProfilingError(f"group_by must be one of {', '.join(GROUP_BY)}")
+        if sort_by not in SORT_BY:
+            raise ProfilingError(f"sort_by must be one of {', '.join(SORT_BY)}")
+
+        stats = self._snapshot().statistics(group_by)
+        if sort_by == 'count':
+            stats.sort(key=lambda stat: stat.count, reverse=True)
+        return [_format_stat(stat, group_by) for stat in stats[:limit]]
+
+    def take_snapshot(self, label: str) -> Dict[str, Any]:
+        """Keep a named snapshot for later diffs"""
+        if not label:
+            raise ProfilingError("Snapshot label is required")
+        snapshot = self._snapshot()
+        with self._lock:
+            self._snapshots.pop(label, None)
+            self._snapshots[label] = snapshot
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return {
+            'label': label,
+            'traced_bytes': sum(stat.size for stat in snapshot.statistics('filename')),
+            'snapshots': list(self._snapshots)
+        }
+
+    def diff(self, before: str, after: Optional[str] = None, limit: int = 20,
+             group_by: str = 'lineno') -> Dict[str, Any]:
+        """
+        Allocation growth between two named snapshots
+
+        Args:
+            before: Label of the older snapshot
+            after: Label of the newer snapshot (None = the live heap now)
+        """
+        if group_by not in GROUP_BY:
+            raise ProfilingError(f"group_by must be one of {', '.join(GROUP_BY)}")
+        if before not in self._snapshots:
+            raise ProfilingError(f"Unknown snapshot: {before}")
+        if after is not None and after not in self._snapshots:
+            raise ProfilingError(f"Unknown snapshot: {after}")
+
+        newer = self._snapshots[after] if after is not None else self._snapshot()
+        stats = newer.compare_to(self._snapshots[before], group_by)
+        return {
+            'before': before,
+            'after': after or 'now',
+            'size_diff_bytes': sum(stat.size_diff for stat in stats),
+            'count_diff': sum(stat.count_diff for stat in stats),
+            'top': [_format_diff(stat, group_by) for stat in stats[:limit]]
+        }
+
+    def begin_request(self) -> Optional[tuple]:
+        """Counters at request start (None when not tracing)"""
+        if not self.tracing:
+            return None
+        return tracemalloc.get_traced_memory()[0], sys.getallocatedblocks()
+
+    def end_request(self, endpoint: str, start: Optional[tuple]):
+        if start is None or not self.tracing:
+            return
+        self.endpoints.record(
+            endpoint,
+            tracemalloc.get_traced_memory()[0] - start[0],
+            sys.getallocatedblocks() - start[1]
+        )
+
+
+def _frame_label(code) -> str:
+    # Parent directory keeps same-named modules apart (flask/app.py vs ml-service/app.py)
+    filename = '/'.join(code.co_filename.replace('\\', '/').rsplit('/', 2)[-2:])
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(';', ':')
+
+
+def collapse_stack(frame) -> str:
+    """Root-first, semicolon-separated stack of a frame"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class CpuSampler:
+    """
+    Sampling profiler over the threads that are serving requests
+
+    Request threads register themselves through enter_request/exit_request;
+    only one profile runs at a time.
+
+    Args:
+        default_interval_ms: Sampling interval when profile() is not given one
+        max_seconds: Longest allowed profile
+    """
+
+    def __init__(self, default_interval_ms: float = 10.0, max_seconds: float = 60.0):
+        self.default_interval_ms = default_interval_ms
+        self.max_seconds = max_seconds
+        self._active_threads: Dict[int, str] = {}
+        self._endpoint_mix: Optional[Counter] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def enter_request(self, endpoint: str):
+        self._active_threads[threading.get_ident()] = endpoint
+
+    def exit_request(self):
+        endpoint = self._active_threads.pop(threading.get_ident(), None)
+        mix = self._endpoint_mix
+        if mix is not None and endpoint is not None:
+            mix[endpoint] += 1
+
+    def profile(self, seconds: float, interval_ms: Optional[float] = None,
+                all_threads: bool = False) -> Dict[str, Any]:
+        """
+        Sample for ``seconds`` and return the aggregated stacks
+
+        Args:
+            seconds: Profile duration
+            interval_ms: Sampling interval
+            all_threads: Also sample threads that are not serving a request
+                (background workers, idle server threads)
+
+        Returns:
+            Dict with 'stacks' (collapsed stack -> sample count), 'samples',
+            'endpoint_mix' (requests completed per endpoint) and timing
+        """
+        interval_ms = float(interval_ms or self.default_interval_ms)
+        seconds = float(seconds)
+        if not 0 < seconds <= self.max_seconds:
+            raise ProfilingError(f"seconds must be in (0, {self.max_seconds:g}]")
+        if not 1 <= interval_ms <= 1000:
+            raise ProfilingError("interval_ms must be between 1 and 1000")
+        if not self._lock.acquire(blocking=False):
+            raise ProfilingError("A CPU profile is already running")
+
+        try:
+            caller = threading.get_ident()
+            stacks: Counter = Counter()
+            self._endpoint_mix = Counter()
+            ticks = 0
+            sampling_seconds = 0.0
+            interval = interval_ms / 1000
+
+            start = time.perf_counter()
+            next_tick = start
+            while True:
+                now = time.perf_counter()
+                if now - start >= seconds:
+                    break
+                ticks += 1
+                frames = sys._current_frames()
+                wanted = frames.keys() if all_threads else list(self._active_threads)
+                for ident in wanted:
+                    frame = frames.get(ident)
+                    if frame is not None and ident != caller:
+                        stacks[collapse_stack(frame)] += 1
+                del frames
+                sampling_seconds += time.perf_counter() - now
+
+                next_tick += interval
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_tick = time.perf_counter()  # Fell behind; do not burst
+            elapsed = time.perf_counter() - start
+        finally:
+            mix, self._endpoint_mix = self._endpoint_mix, None
+            self._lock.release()
+
+        return {
+            'seconds': round(elapsed, 3),
+            'interval_ms': interval_ms,
+            'ticks': ticks,
+            'samples': sum(stacks.values()),
+            'sampler_cpu_share': round(sampling_seconds / elapsed, 5) if elapsed else 0,
+            'pid': os.getpid(),
+            'endpoint_mix': dict(mix.most_common()),
+            'stacks': dict(stacks.most_common())
+        }
+
+
+def format_collapsed(stacks: Dict[str, int], root: Optional[str] = None) -> str:
+    """Collapsed-stack text ("frame;frame;frame count" per line), optionally under a root frame"""
+    prefix = f"{root.replace(';', ':')};" if root else ''
+    return ''.join(f"{prefix}{stack} {count}\n" for stack, count in stacks.items())
@@ -0,0 +1,214 @@
+"""
+What-if Sensitivity Sweeps for ML Service
+Varies one or two features of a base record over a range or grid and scores
+every perturbed row in a single model call
+
+The perturbation matrix is built with NumPy broadcasting (base row repeated,
+swept columns overwritten from a meshgrid), so a 100-point sweep costs one
+predict_proba call on a 100-row matrix instead of 100 requests.
+"""
+
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class SweepError(ValueError):
+    """Raised for an invalid sweep specification"""
+
+
+def resolve_feature_name(name: str, feature_names: List[str]) -> str:
+    """Match a feature given as model, snake_case or camelCase name (e.g. 'bmi', 'blood_pressure')"""
+    key = str(name).replace('_', '').lower()
+    for feature in feature_names:
+        if feature.lower() == key:
+            return feature
+    raise SweepError(f"Unknown feature: {name}")
+
+
+def parse_axis(
+    spec: Dict[str, Any],
+    feature_names: List[str],
+    feature_ranges: Dict[str, tuple],
+    default_steps: int,
+    max_points: Optional[int] = None
+) -> Tuple[str, np.ndarray]:
+    """
+    Turn one sweep axis specification into the values to evaluate
+
+    Args:
+        spec: {"feature": "bmi", "min": 20, "max": 35, "steps": 31}
+              or {"feature": "glucose", "values": [90, 110, 130]};
+              min/max default to the feature's configured range
+        feature_names: Ordered list of feature names
+        feature_ranges: Mapping of feature name to (min, max)
+        default_steps: Number of points when neither steps nor values is given
+        max_points: Upper bound on the number of points of this axis, checked
+                    before anything is allocated
+
+    Returns:
+        Tuple of (feature name, sorted values)
+    """
+    if not isinstance(spec, dict) or 'feature' not in spec:
+        raise SweepError("Each sweep axis needs a 'feature'")
+
+    feature = resolve_feature_name(spec['feature'], feature_names)
+    low, high = feature_ranges[feature]
+
+    try:
+        if 'values' in spec:
+            if not isinstance(spec['values'], list):
+                raise SweepError(f"{feature}: 'values' must be a list")
+            if max_points and len(spec['values']) > max_points:
+                raise SweepError(f"{feature}: too many values: {len(spec['values'])} (max {max_points})")
+            values = np.unique(np.asarray(spec['values'], dtype=np.float64))
+        else:
+            start = float(spec.get('min', low))
+            stop = float(spec.get('max', high))
+            steps = int(spec.get('steps', default_steps))
+            if steps < 2 or start >= stop:
+                raise SweepError(f"{feature}: need min < max and at least 2 steps")
+            if max_points and steps > max_points:
+                raise SweepError(f"{feature}: too many steps: {steps} (max {max_points})")
+            values = np.linspace(start, stop, steps)
+    except (TypeError, ValueError, OverflowError) as e:
+        if isinstance(e, SweepError):
+            raise
+        raise SweepError(f"{feature}: invalid sweep values ({e})")
+
+    if values.size == 0 or not np.all(np.isfinite(values)):
+        raise SweepError(f"{feature}: sweep values must be finite numbers")
+    if values[0] < low or values[-1] > high:
+        raise SweepError(f"{feature}: sweep must stay within [{low}, {high}]")
+
+    return feature, values
+
+
+def build_sweep_matrix(
+    base_row: np.ndarray,
+    columns: List[int],
+    axis_values: List[np.ndarray]
+) -> np.ndarray:
+    """
+    Perturbation matrix for a one- or two-feature sweep
+
+    Args:
+        base_row: Raw feature row, shape (1, n_features)
+        columns: Column index of each swept feature
+        axis_values: Values per swept feature
+
+    Returns:
+        Matrix of shape (prod(len(values)), n_features); rows follow the grid
+        in C order (the last axis varies fastest)
+    """
+    grids = np.meshgrid(*axis_values, indexing='ij')
+    matrix = np.repeat(np.asarray(base_row, dtype=np.float64).reshape(1, -1), grids[0].size, axis=0)
+    for column, grid in zip(columns, grids):
+        matrix[:, column] = grid.ravel()
+    return matrix
+
+
+def find_band_transitions(
+    values: np.ndarray,
+    probabilities: np.ndarray,
+    risk_level_fn: Callable[[float], str]
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Risk band per point and the points where the band changes
+
+    Args:
+        values: Swept values along the curve
+        probabilities: P(diabetes) per value
+        risk_level_fn: Maps a probability to a risk band
+
+    Returns:
+        Tuple of (risk level per point, transitions between consecutive points)
+    """
+    levels = [risk_level_fn(float(p)) for p in probabilities]
+    transitions = [
+        {
+            'from_value': float(values[i - 1]),
+            'to_value': float(values[i]),
+            'from_level': levels[i - 1],
+            'to_level': levels[i],
+            'probability': float(probabilities[i])
+        }
+        for i in range(1, len(levels))
+        if levels[i] != levels[i - 1]
+    ]
+    return levels, transitions
+
+
+def run_sweep(
+    base_row: np.ndarray,
+    specs: List[Dict[str, Any]],
+    predict_fn: Callable[[np.ndarray], np.ndarray],
+    risk_level_fn: Callable[[float], str],
+    feature_names: List[str],
+    feature_ranges: Dict[str, tuple],
+    default_steps: int = 50,
+    max_points: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Score a what-if sweep around a base record
+
+    Args:
+        base_row: Validated raw feature row, shape (1, n_features)
+        specs: One or two axis specifications (see parse_axis)
+        predict_fn: Maps a raw feature matrix to P(diabetes) per row
+        risk_level_fn: Maps a probability to a risk band
+        feature_names: Ordered list of feature names
+        feature_ranges: Mapping of feature name to (min, max)
+        default_steps: Points per axis when not specified
+        max_points: Upper bound on the total number of grid points
+
+    Returns:
+        JSON-ready dict with the swept values, probability curve(s), risk levels
+        and band transitions. For two features, one curve over the first
+        feature is returned per value of the second.
+    """
+    if not isinstance(specs, list) or not 1 <= len(specs) <= 2:
+        raise SweepError("Sweep one or two features")
+
+    axes = [parse_axis(spec, feature_names, feature_ranges, default_steps, max_points) for spec in specs]
+    names = [feature for feature, _ in axes]
+    if len(set(names)) != len(names):
+        raise SweepError("Sweep features must be different")
+
+    n_points = int(np.prod([len(values) for _, values in axes]))
+    if max_points and n_points > max_points:
+        raise SweepError(f"Sweep too large: {n_points} points (max {max_points})")
+
+    # Second feature on the outer axis so each curve is contiguous in the matrix
+    ordered = axes[::-1]
+    matrix = build_sweep_matrix(
+        base_row,
+        [feature_names.index(feature) for feature, _ in ordered],
+        [values for _, values in ordered]
+    )
+    probabilities = predict_fn(np.vstack([base_row, matrix]))
+    base_probability = float(probabilities[0])
+
+    feature, values = axes[0]
+    curves = probabilities[1:].reshape(-1, len(values))
+    outer = axes[1] if len(axes) == 2 else None
+
+    result = {
+        'features': names,
+        'base_probability': base_probability,
+        'base_risk_level': risk_level_fn(base_probability),
+        'n_points': n_points,
+        'values': {name: vals.tolist() for name, vals in axes},
+        'curves': []
+    }
+    for row, curve in enumerate(curves):
+        levels, transitions = find_band_transitions(values, curve, risk_level_fn)
+        entry = {
+            'probabilities': curve.tolist(),
+            'risk_levels': levels,
+            'transitions': transitions
+        }
+        if outer is not None:
+            entry[outer[0]] = float(outer[1][row])
+        result['curves'].append(entry)
+
+    return result
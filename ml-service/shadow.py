@@ -0,0 +1,216 @@
+"""
+Shadow Model Evaluation for ML Service
+Scores a sampled copy of live traffic with a candidate model on a background
+worker and compares it against the active model
+
+The request thread only does a random draw and a non-blocking queue put; a
+full queue drops the sample. Large batches are reduced to a random row sample
+before they are queued, and the queue is bounded by bytes as well as by item
+count. Candidate failures never reach the primary path.
+
+Isolation from the primary is best-effort: the candidate runs on one
+background thread with its estimator thread parameters (n_jobs and the like)
+set to 1, but it still competes with the primary for the GIL and CPU time.
+"""
+
+import time
+import queue
+import random
+import threading
+from collections import deque
+from typing import Any, Callable, Dict
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Estimator parameters that set a thread count (scikit-learn/XGBoost/LightGBM/CatBoost)
+THREAD_PARAMS = ('n_jobs', 'thread_count', 'nthread')
+
+# Probability delta histogram: fixed bins over [-1, 1]
+DELTA_BINS = np.linspace(-1.0, 1.0, 41)
+
+
+def limit_estimator_threads(model: Any) -> Any:
+    """Set every thread-count parameter of an estimator (and nested ones) to 1"""
+    try:
+        params = model.get_params()
+    except Exception:
+        return model
+    single = {name: 1 for name in params if name.split('__')[-1] in THREAD_PARAMS}
+    if single:
+        try:
+            model.set_params(**single)
+        except Exception as e:
+            logger.warning(f"⚠️  Could not limit shadow model threads: {e}")
+    return model
+
+
+def _percentiles(values) -> Dict[str, float]:
+    if not values:
+        return {'p50_ms': None, 'p90_ms': None, 'p99_ms': None}
+    p50, p90, p99 = np.percentile(np.fromiter(values, dtype=np.float64), [50, 90, 99])
+    return {'p50_ms': round(float(p50), 3), 'p90_ms': round(float(p90), 3), 'p99_ms': round(float(p99), 3)}
+
+
+class ShadowEvaluator:
+    """
+    Background comparison of a candidate model against the active model
+
+    Args:
+        name: Candidate model name (for reporting)
+        model: Candidate model
+        scaler: Candidate scaler
+        risk_level_fn: Maps a probability to a risk band
+        sample_rate: Fraction of requests copied to the candidate (0-1)
+        queue_size: Maximum number of pending samples
+        max_queue_bytes: Maximum size of the pending feature matrices
+        max_rows: Rows kept from a batch request (a random sample of them)
+        latency_window: Number of recent latencies kept for percentiles
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model: Any,
+        scaler: Any,
+        risk_level_fn: Callable[[float], str],
+        sample_rate: float = 0.1,
+        queue_size: int = 1000,
+        max_queue_bytes: int = 16 * 1024 * 1024,
+        max_rows: int = 256,
+        latency_window: int = 10000
+    ):
+        self.name = name
+        self.model = limit_estimator_threads(model)
+        self.scaler = scaler
+        self.risk_level_fn = risk_level_fn
+        self.sample_rate = sample_rate
+        self.max_queue_bytes = max_queue_bytes
+        self.max_rows = max_rows
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._queued_bytes = 0
+        self._lock = threading.Lock()
+        self._primary_latency = deque(maxlen=latency_window)
+        self._candidate_latency = deque(maxlen=latency_window)
+        self._delta_counts = np.zeros(len(DELTA_BINS) - 1, dtype=np.int64)
+        self._stats = {
+            'sampled': 0,
+            'dropped': 0,
+            'subsampled': 0,
+            'errors': 0,
+            'compared_rows': 0,
+            'label_agreements': 0,
+            'risk_agreements': 0,
+            'abs_delta_sum': 0.0,
+            'delta_sum': 0.0,
+            'max_abs_delta': 0.0
+        }
+
+        self._thread = threading.Thread(target=self._run, name='shadow-evaluator', daemon=True)
+        self._thread.start()
+
+    def submit(self, features: np.ndarray, primary_probabilities: np.ndarray, primary_latency_ms: float):
+        """
+        Offer one request to the shadow worker (never blocks)
+
+        Args:
+            features: Raw feature matrix scored by the active model
+            primary_probabilities: Active model P(diabetes) per row
+            primary_latency_ms: Active model scoring latency
+        """
+        if random.random() >= self.sample_rate:
+            return
+
+        subsampled = len(features) > self.max_rows
+        if subsampled:
+            rows = np.random.default_rng().choice(len(features), self.max_rows, replace=False)
+            features, primary_probabilities = features[rows], primary_probabilities[rows]
+        size = features.nbytes + primary_probabilities.nbytes
+
+        with self._lock:
+            if self._queued_bytes + size > self.max_queue_bytes:
+                self._stats['dropped'] += 1
+                return
+            try:
+                self._queue.put_nowait((features, primary_probabilities, primary_latency_ms, size))
+            except queue.Full:
+                self._stats['dropped'] += 1
+                return
+            self._queued_bytes += size
+            self._stats['sampled'] += 1
+            self._stats['subsampled'] += int(subsampled)
+
+    def _run(self):
+        while True:
+            features, primary, primary_latency_ms, size = self._queue.get()
+            with self._lock:
+                self._queued_bytes -= size
+            try:
+                self._compare(features, primary, primary_latency_ms)
+            except Exception as e:
+                with self._lock:
+                    self._stats['errors'] += 1
+                logger.warning(f"⚠️  Shadow evaluation failed: {e}")
+
+    def _compare(self, features: np.ndarray, primary: np.ndarray, primary_latency_ms: float):
+        start = time.perf_counter()
+        candidate = self.model.predict_proba(self.scaler.transform(features))[:, 1]
+        candidate_latency_ms = (time.perf_counter() - start) * 1000
+
+        delta = candidate - primary
+        abs_delta = np.abs(delta)
+        label_agreements = int(((candidate > 0.5) == (primary > 0.5)).sum())
+        risk_agreements = sum(
+            self.risk_level_fn(float(c)) == self.risk_level_fn(float(p))
+            for c, p in zip(candidate, primary)
+        )
+        delta_counts, _ = np.histogram(np.clip(delta, -1.0, 1.0), bins=DELTA_BINS)
+
+        with self._lock:
+            self._primary_latency.append(primary_latency_ms)
+            self._candidate_latency.append(candidate_latency_ms)
+            self._delta_counts += delta_counts
+            self._stats['compared_rows'] += len(delta)
+            self._stats['label_agreements'] += label_agreements
+            self._stats['risk_agreements'] += risk_agreements
+            self._stats['abs_delta_sum'] += float(abs_delta.sum())
+            self._stats['delta_sum'] += float(delta.sum())
+            self._stats['max_abs_delta'] = max(self._stats['max_abs_delta'], float(abs_delta.max()))
+
+    def get_report(self) -> Dict[str, Any]:
+        """Agreement, probability-delta distribution and latency comparison"""
+        with self._lock:
+            stats = dict(self._stats)
+            delta_counts = self._delta_counts.copy()
+            primary_latency = list(self._primary_latency)
+            candidate_latency = list(self._candidate_latency)
+
+        rows = stats['compared_rows']
+        return {
+            'candidate': self.name,
+            'sample_rate': self.sample_rate,
+            'queue_depth': self._queue.qsize(),
+            'queued_bytes': self._queued_bytes,
+            'sampled_requests': stats['sampled'],
+            'dropped_requests': stats['dropped'],
+            'subsampled_requests': stats['subsampled'],
+            'errors': stats['errors'],
+            'compared_rows': rows,
+            'agreement_rate': stats['label_agreements'] / rows if rows else None,
+            'risk_level_agreement_rate': stats['risk_agreements'] / rows if rows else None,
+            'probability_delta': {
+                'mean': stats['delta_sum'] / rows if rows else None,
+                'mean_abs': stats['abs_delta_sum'] / rows if rows else None,
+                'max_abs': stats['max_abs_delta'],
+                'histogram': {
+                    'bin_edges': [round(float(edge), 3) for edge in DELTA_BINS],
+                    'counts': delta_counts.tolist()
+                }
+            },
+            'latency': {
+                'primary': _percentiles(primary_latency),
+                'candidate': _percentiles(candidate_latency)
+            }
+        }
@@ -0,0 +1,348 @@
+"""
+Shared-memory Model Weights for ML Service
+Places the served model's parameter arrays in one named shared-memory segment
+per model version so that every worker process maps the same physical pages
+
+The first worker to start unpickles the model, flattens it (coefficients for
+linear models, node arrays from tree_arrays for tree ensembles) and publishes
+the arrays. Later workers attach read-only views without ever unpickling the
+model, so per-worker RSS stays flat as workers are added.
+
+Exactly one worker creates each version's segment, and only that worker
+retires segments, and only those of older versions, so workers of old and
+new versions running side by side during a rolling deploy never unlink each
+other's weights. A segment whose publisher died before setting the ready
+flag is reclaimed once it is older than the attach timeout.
+
+Segment layout:
+    [8-byte preamble: magic, ready flag, header length][JSON header][64-byte aligned arrays]
+"""
+
+import os
+import sys
+import json
+import time
+import struct
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import tree_arrays
+
+MAGIC = b'MHMW'
+_PREAMBLE = struct.Struct('<4sB3xI')
+_READY_OFFSET = 4
+_ALIGNMENT = 64
+
+KIND_LINEAR = 'linear'
+KIND_TREES = 'trees'
+
+
+class SharedWeightsError(RuntimeError):
+    """Raised when a model cannot be published to or attached from shared memory"""
+
+
+class IncompleteSegmentError(SharedWeightsError):
+    """Raised when a segment's publisher has not set the ready flag within the timeout"""
+
+
+def segment_name(prefix: str, model_type: str, version: str) -> str:
+    """Shared-memory segment name for one model version"""
+    return f"{prefix}_{model_type}_{version}"
+
+
+def _open_segment(name: str, create: bool = False, size: int = 0) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+
+    shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+    # Lifetime is managed explicitly (retire); the resource tracker would
+    # otherwise unlink the segment as soon as any attaching worker exits
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+def _unlink(shm: shared_memory.SharedMemory):
+    if sys.version_info < (3, 13):
+        # unlink() unregisters from the resource tracker; balance the earlier unregister
+        resource_tracker.register(shm._name, 'shared_memory')
+    shm.unlink()
+
+
+def segment_age(name: str) -> Optional[float]:
+    """Seconds since a segment was last written (None when /dev/shm is not available)"""
+    try:
+        return time.time() - os.stat(os.path.join('/dev/shm', name)).st_mtime
+    except OSError:
+        return None
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def extract_arrays(model: Any) -> Tuple[str, Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Parameter arrays of a supported model
+
+    Returns:
+        Tuple of (kind, arrays, params)
+
+    Raises:
+        SharedWeightsError: For model types that cannot be flattened
+    """
+    coef = getattr(model, 'coef_', None)
+    if coef is not None and np.ndim(coef) == 2 and coef.shape[0] == 1 and hasattr(model, 'predict_proba'):
+        arrays = {
+            'coef': np.asarray(coef, dtype=np.float64),
+            'intercept': np.asarray(model.intercept_, dtype=np.float64).reshape(1)
+        }
+        return KIND_LINEAR, arrays, {'n_features': int(coef.shape[1])}
+
+    if tree_arrays.is_supported(model):
+        flat = tree_arrays.flatten_tree_model(model)
+        return KIND_TREES, flat.arrays(), flat.params()
+
+    raise SharedWeightsError(f"Shared weights not supported for {type(model).__name__}")
+
+
+def publish(name: str, model: Any) -> shared_memory.SharedMemory:
+    """
+    Create the segment for a model and copy its arrays in
+
+    Raises:
+        FileExistsError: If another worker already created the segment
+    """
+    kind, arrays, params = extract_arrays(model)
+
+    layout = {}
+    offset = 0
+    for key, array in arrays.items():
+        offset = _align(offset)
+        layout[key] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset += array.nbytes
+
+    header = json.dumps({
+        'kind': kind,
+        'model_class': type(model).__name__,
+        'params': params,
+        'arrays': layout
+    }).encode('utf-8')
+    data_start = _align(_PREAMBLE.size + len(header))
+
+    shm = _open_segment(name, create=True, size=data_start + max(offset, 1))
+    try:
+        buf = shm.buf
+        buf[_PREAMBLE.size:_PREAMBLE.size + len(header)] = header
+        for key, array in arrays.items():
+            start = data_start + layout[key]['offset']
+            buf[start:start + array.nbytes] = np.ascontiguousarray(array).tobytes()
+        # Ready flag last: attaching workers wait for it
+        _PREAMBLE.pack_into(buf, 0, MAGIC, 1, len(header))
+    except Exception:
+        shm.close()
+        _unlink(shm)
+        raise
+    return shm
+
+
+def attach(name: str, timeout: float = 30.0) -> Tuple[shared_memory.SharedMemory, Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Attach to a published segment and return read-only array views
+
+    Raises:
+        FileNotFoundError: If the segment does not exist
+        IncompleteSegmentError: If the segment is not completed within the
+            timeout, or is already older than the timeout without being ready
+        SharedWeightsError: If the segment is malformed
+    """
+    shm = _open_segment(name)
+    deadline = time.monotonic() + timeout
+    while shm.buf[_READY_OFFSET] != 1:
+        age = segment_age(name)
+        if time.monotonic() > deadline or (age is not None and age > timeout):
+            shm.close()
+            raise IncompleteSegmentError(f"Shared weights segment {name} was never completed")
+        time.sleep(0.01)
+
+    magic, _, header_len = _PREAMBLE.unpack_from(shm.buf, 0)
+    if magic != MAGIC:
+        shm.close()
+        raise SharedWeightsError(f"Segment {name} is not a model weights segment")
+
+    header = json.loads(bytes(shm.buf[_PREAMBLE.size:_PREAMBLE.size + header_len]))
+    data_start = _align(_PREAMBLE.size + header_len)
+
+    arrays = {}
+    for key, spec in header['arrays'].items():
+        view = np.ndarray(
+            tuple(spec['shape']), dtype=np.dtype(spec['dtype']),
+            buffer=shm.buf, offset=data_start + spec['offset']
+        )
+        view.flags.writeable = False
+        arrays[key] = view
+    return shm, header, arrays
+
+
+def retire(name: str) -> bool:
+    """Unlink a model version's segment (mapped views in running workers stay valid)"""
+    try:
+        shm = _open_segment(name)
+    except FileNotFoundError:
+        return False
+    shm.close()
+    _unlink(shm)
+    return True
+
+
+def reclaim_incomplete(name: str, max_age: float) -> bool:
+    """
+    Unlink a segment left unfinished by a publisher that died
+
+    Only a segment that is still not ready and has not been written for
+    ``max_age`` seconds is removed, so a publisher that is still copying
+    arrays is left alone.
+    """
+    try:
+        shm = _open_segment(name)
+    except FileNotFoundError:
+        return False
+    try:
+        age = segment_age(name)
+        if shm.buf[_READY_OFFSET] == 1 or age is None or age <= max_age:
+            return False
+    finally:
+        shm.close()
+    _unlink(shm)
+    return True
+
+
+def list_segments(prefix: str) -> List[str]:
+    """Names of existing segments with a prefix (POSIX shared memory under /dev/shm)"""
+    if not os.path.isdir('/dev/shm'):
+        return []
+    return sorted(name for name in os.listdir('/dev/shm') if name.startswith(f"{prefix}_"))
+
+
+def retire_older_versions(prefix: str, model_type: str, version: str) -> List[str]:
+    """
+    Retire the segments of a model type whose version sorts before ``version``
+
+    Versions are timestamps (YYYYMMDD_HHMMSS), so only segments superseded by
+    the given version are removed; newer versions (e.g. a rollout in progress
+    while an old worker restarts) are never touched.
+    """
+    base = f"{prefix}_{model_type}_"
+    retired = []
+    for name in list_segments(f"{prefix}_{model_type}"):
+        if name[len(base):] < version and retire(name):
+            retired.append(name)
+    return retired
+
+
+class SharedLinearModel:
+    """Binary linear classifier evaluated against shared coefficient views"""
+
+    classes_ = np.array([0, 1])
+
+    def __init__(self, arrays: Dict[str, np.ndarray], params: Dict[str, Any]):
+        self.coef_ = arrays['coef']
+        self.intercept_ = arrays['intercept']
+        self.n_features_in_ = params['n_features']
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        return np.asarray(X, dtype=np.float64) @ self.coef_[0] + self.intercept_[0]
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        p = 1 / (1 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1 - p, p])
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return (self.decision_function(X) > 0).astype(np.int64)
+
+
+class SharedTreeModel:
+    """Tree ensemble evaluated against shared flattened node arrays"""
+
+    classes_ = np.array([0, 1])
+
+    def __init__(self, arrays: Dict[str, np.ndarray], params: Dict[str, Any]):
+        self.flat_trees = tree_arrays.FlatTrees(**arrays, **params)
+        self.n_features_in_ = params['n_features']
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        p = tree_arrays.predict_proba(self.flat_trees, X)
+        return np.column_stack([1 - p, p])
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(np.int64)
+
+
+class SharedModelHandle:
+    """
+    A worker's attachment to a shared model version
+
+    Attributes:
+        model: sklearn-like model (predict_proba on scaled features) backed by shared views
+        model_class: Class name of the original model
+        created: Whether this worker published the segment
+    """
+
+    def __init__(self, name: str, shm: shared_memory.SharedMemory, header: Dict[str, Any],
+                 arrays: Dict[str, np.ndarray], created: bool):
+        self.name = name
+        self.created = created
+        self.model_class = header['model_class']
+        self.kind = header['kind']
+        self.size = shm.size
+        self._shm = shm
+        model_cls = SharedLinearModel if self.kind == KIND_LINEAR else SharedTreeModel
+        self.model = model_cls(arrays, header['params'])
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'segment': self.name,
+            'kind': self.kind,
+            'model_class': self.model_class,
+            'bytes': self.size,
+            'created_by_this_worker': self.created
+        }
+
+
+def load_shared_model(name: str, load_model: Callable[[], Any], timeout: float = 30.0) -> SharedModelHandle:
+    """
+    Attach to a model version's segment, publishing it first if it does not exist
+
+    Args:
+        name: Segment name (see segment_name)
+        load_model: Loads the original model; only called by the publishing worker
+        timeout: How long to wait for another worker to finish publishing
+    """
+    try:
+        return SharedModelHandle(name, *attach(name, timeout), created=False)
+    except FileNotFoundError:
+        pass
+    except IncompleteSegmentError:
+        # Publisher died mid-way: remove its segment and publish again
+        if not reclaim_incomplete(name, timeout):
+            return SharedModelHandle(name, *attach(name, timeout), created=False)
+
+    created = False
+    model = load_model()
+    try:
+        publish(name, model).close()
+        created = True
+    except FileExistsError:
+        pass  # Another worker won the race
+    del model
+    return SharedModelHandle(name, *attach(name, timeout), created=created)
+
+
+if __name__ == '__main__':
+    # Retire a model version's segment: python shared_weights.py <model_type> <version>
+    from config import Config
+
+    model_type = sys.argv[1] if len(sys.argv) > 1 else Config.MODEL_TYPE
+    version = sys.argv[2] if len(sys.argv) > 2 else Config.MODEL_VERSION
+    name = segment_name(Config.SHARED_WEIGHTS_PREFIX, model_type, version)
+    print(f"{'✅ Retired' if retire(name) else '⚠️  No segment'}: {name}")
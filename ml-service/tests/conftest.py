@@ -0,0 +1,10 @@
+"""Make the service modules (ml-service/) and training modules (ml-service/models/) importable"""
+
+import os
+import sys
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for path in (SERVICE_DIR, os.path.join(SERVICE_DIR, 'models')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
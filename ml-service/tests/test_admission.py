@@ -0,0 +1,97 @@
+import random
+import threading
+import time
+
+import pytest
+
+from admission import AdmissionController, AdmissionRejected
+
+
+def serve(controller, latency_ms):
+    in_flight = controller.acquire(timeout=0)
+    controller.release(latency_ms, in_flight)
+
+
+def test_limit_holds_under_jittery_unsaturated_load():
+    controller = AdmissionController('predict', max_concurrency=16, max_queue=0)
+    rng = random.Random(0)
+    for _ in range(5000):
+        serve(controller, 10 * rng.lognormvariate(0, 0.25))
+    assert controller.limit == 16
+    assert controller.get_stats()['limit_decreases'] == 0
+
+
+def test_unsaturated_latency_spike_does_not_shrink_limit():
+    controller = AdmissionController('predict', max_concurrency=16, max_queue=0)
+    for _ in range(100):
+        serve(controller, 10)
+    for _ in range(100):
+        serve(controller, 500)
+    assert controller.limit == 16
+
+
+def test_limit_shrinks_when_saturated_and_slow():
+    controller = AdmissionController('predict', max_concurrency=8, max_queue=0, min_concurrency=2)
+    for _ in range(50):
+        serve(controller, 10)
+
+    for _ in range(200):
+        slots = [controller.acquire(timeout=0) for _ in range(controller.limit)]
+        for in_flight in slots:
+            controller.release(100, in_flight)
+    assert controller.limit < 8
+    assert controller.limit >= 2
+
+
+def test_no_derived_target_before_baseline_is_known():
+    controller = AdmissionController('predict', max_concurrency=4, max_queue=0)
+    for _ in range(50):
+        slots = [controller.acquire(timeout=0) for _ in range(4)]
+        for in_flight in slots:
+            controller.release(100, in_flight)
+    assert controller.limit == 4
+    assert controller.get_stats()['target_latency_ms'] is None
+
+
+def test_explicit_target_applies_without_baseline():
+    controller = AdmissionController('predict', max_concurrency=4, max_queue=0, target_latency_ms=50)
+    for _ in range(50):
+        slots = [controller.acquire(timeout=0) for _ in range(controller.limit)]
+        for in_flight in slots:
+            controller.release(100, in_flight)
+    assert controller.limit < 4
+
+
+def test_queue_full_is_shed():
+    controller = AdmissionController('batch', max_concurrency=1, max_queue=0, adaptive=False)
+    controller.acquire()
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire()
+    assert rejected.value.reason == 'queue full'
+    assert controller.get_stats()['shed_queue_full'] == 1
+
+
+def test_queued_request_times_out():
+    controller = AdmissionController('batch', max_concurrency=1, max_queue=1, adaptive=False)
+    controller.acquire()
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire(timeout=0.01)
+    assert rejected.value.reason == 'queue timeout'
+
+
+def test_queued_request_takes_released_slot():
+    controller = AdmissionController('batch', max_concurrency=1, max_queue=1, adaptive=False)
+    controller.acquire()
+    timer = threading.Timer(0.05, controller.release, args=(1.0,))
+    timer.start()
+    controller.acquire(timeout=2)
+    timer.join()
+    assert controller.get_stats()['admitted'] == 2
+
+
+def test_expired_deadline_is_shed_before_admission():
+    controller = AdmissionController('predict', max_concurrency=4, max_queue=4)
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire(deadline=time.monotonic() - 1)
+    assert rejected.value.reason == 'deadline'
+    assert controller.get_stats()['active'] == 0
@@ -0,0 +1,66 @@
+import struct
+
+import numpy as np
+import pytest
+
+import binary_protocol
+from binary_protocol import ProtocolError, decode_request, decode_response, encode_request, encode_response
+
+
+def test_request_round_trip():
+    features = np.arange(16, dtype=np.float64).reshape(2, 8)
+    decoded = decode_request(encode_request(features), n_features=8)
+    assert decoded.dtype == np.float64
+    np.testing.assert_array_equal(decoded, features)
+
+
+def test_single_row_request():
+    decoded = decode_request(encode_request(np.ones(8)), n_features=8)
+    assert decoded.shape == (1, 8)
+
+
+def test_response_round_trip():
+    probabilities = np.array([0.1, 0.5, 0.9])
+    np.testing.assert_allclose(decode_response(encode_response(probabilities)), probabilities, rtol=1e-6)
+
+
+def test_rejects_short_payload():
+    with pytest.raises(ProtocolError, match='too short'):
+        decode_request(b'MHMQ', n_features=8)
+
+
+def test_rejects_wrong_magic():
+    payload = encode_response(np.array([0.5]))
+    with pytest.raises(ProtocolError, match='magic'):
+        decode_request(payload, n_features=1)
+
+
+def test_rejects_unknown_version():
+    payload = bytearray(encode_request(np.ones(8)))
+    payload[4] = binary_protocol.PROTOCOL_VERSION + 1
+    with pytest.raises(ProtocolError, match='version'):
+        decode_request(bytes(payload), n_features=8)
+
+
+def test_rejects_reserved_flags():
+    payload = bytearray(encode_request(np.ones(8)))
+    payload[5] = 1
+    with pytest.raises(ProtocolError, match='flags'):
+        decode_request(bytes(payload), n_features=8)
+
+
+def test_rejects_truncated_payload():
+    payload = encode_request(np.ones((2, 8)))
+    with pytest.raises(ProtocolError, match='size mismatch'):
+        decode_request(payload[:-4], n_features=8)
+
+
+def test_rejects_wrong_feature_count():
+    with pytest.raises(ProtocolError, match='Expected 8 features'):
+        decode_request(encode_request(np.ones(7)), n_features=8)
+
+
+def test_rejects_empty_request():
+    header = struct.pack('<4sBBHI', b'MHMQ', binary_protocol.PROTOCOL_VERSION, 0, 8, 0)
+    with pytest.raises(ProtocolError, match='No rows'):
+        decode_request(header, n_features=8)
@@ -0,0 +1,86 @@
+import threading
+
+import numpy as np
+import pytest
+
+from drift_monitor import (
+    DriftMonitor,
+    binned_ks_statistic,
+    compute_reference_profile,
+    merge_reference_profiles,
+    population_stability_index
+)
+
+FEATURES = ['Glucose', 'BMI']
+RANGES = {'Glucose': (0, 200), 'BMI': (10, 60)}
+
+
+def sample(n, glucose_mean=110, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.normal(glucose_mean, 25, n), rng.normal(32, 6, n)])
+
+
+def test_merged_profile_matches_profile_of_concatenation():
+    data = sample(1000)
+    whole = compute_reference_profile(data, FEATURES, RANGES)
+
+    merged = None
+    for chunk in np.array_split(data, [100, 450, 451]):
+        merged = merge_reference_profiles(merged, compute_reference_profile(chunk, FEATURES, RANGES))
+
+    assert merged['n_samples'] == whole['n_samples']
+    for name in FEATURES:
+        assert merged['features'][name]['counts'] == whole['features'][name]['counts']
+        assert merged['features'][name]['mean'] == pytest.approx(whole['features'][name]['mean'])
+        assert merged['features'][name]['std'] == pytest.approx(whole['features'][name]['std'])
+
+
+def test_psi_and_ks_are_zero_for_identical_histograms():
+    counts = np.array([5, 10, 20, 10, 5])
+    assert population_stability_index(counts, counts * 3) == pytest.approx(0, abs=1e-9)
+    assert binned_ks_statistic(counts, counts * 3) == pytest.approx(0)
+
+
+def test_psi_grows_with_shift():
+    reference = compute_reference_profile(sample(2000), FEATURES, RANGES)
+    ref_counts = np.array(reference['features']['Glucose']['counts'])
+    small = compute_reference_profile(sample(2000, 115, seed=1), FEATURES, RANGES)
+    large = compute_reference_profile(sample(2000, 160, seed=1), FEATURES, RANGES)
+    psi_small = population_stability_index(ref_counts, np.array(small['features']['Glucose']['counts']))
+    psi_large = population_stability_index(ref_counts, np.array(large['features']['Glucose']['counts']))
+    assert psi_small < psi_large
+    assert psi_large > 0.25
+
+
+def test_report_flags_shifted_feature_only():
+    monitor = DriftMonitor(FEATURES, RANGES, compute_reference_profile(sample(2000), FEATURES, RANGES))
+    live = sample(2000, glucose_mean=160, seed=1)
+    for chunk in np.array_split(live, 20):
+        monitor.update(chunk)
+
+    report = monitor.get_report()
+    assert report['observations'] == 2000
+    assert report['features']['Glucose']['status'] == 'significant'
+    assert report['features']['BMI']['status'] == 'stable'
+    assert report['features']['Glucose']['mean'] == pytest.approx(live[:, 0].mean())
+
+
+def test_updates_from_many_threads_are_all_counted():
+    monitor = DriftMonitor(FEATURES, RANGES)
+    data = sample(4000)
+
+    def work(rows):
+        for row in rows:
+            monitor.update(row.reshape(1, -1))
+
+    threads = [threading.Thread(target=work, args=(data[i::32],)) for i in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    report = monitor.get_report()
+    assert report['observations'] == 4000
+    assert sum(report['features']['BMI']['counts']) == 4000
+    assert report['features']['BMI']['mean'] == pytest.approx(data[:, 1].mean())
+    assert report['features']['BMI']['std'] == pytest.approx(data[:, 1].std())
@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import accuracy_score, f1_score, log_loss, precision_score, recall_score, roc_auc_score
+from sklearn.preprocessing import StandardScaler
+
+from model_config import DIABETES_FEATURES
+from out_of_core import OutOfCoreTrainer, ReservoirSketch, StreamingMetrics, _fold_constant, is_test_row
+
+
+def make_frame(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'Pregnancies': rng.integers(0, 12, n),
+        'Glucose': rng.normal(120, 30, n).round(),
+        'BloodPressure': rng.normal(70, 12, n).round(),
+        'SkinThickness': rng.normal(25, 8, n).round(),
+        'Insulin': rng.normal(100, 40, n).round(),
+        'BMI': rng.normal(32, 6, n).round(1),
+        'DiabetesPedigreeFunction': rng.uniform(0.1, 2, n).round(3),
+        'Age': rng.integers(21, 80, n)
+    })
+    # Missing measurements recorded as 0, as in the Pima data
+    for col in ['Glucose', 'SkinThickness', 'Insulin']:
+        frame.loc[rng.random(n) < 0.1, col] = 0
+    logit = (frame['Glucose'] - 120) / 20 + (frame['BMI'] - 32) / 6
+    frame['Outcome'] = (rng.random(n) < 1 / (1 + np.exp(-logit))).astype(int)
+    return frame
+
+
+def chunks_of(frame, size):
+    return lambda: (frame.iloc[start:start + size] for start in range(0, len(frame), size))
+
+
+def test_streaming_metrics_match_sklearn():
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 5000)
+    proba = np.clip(0.3 * y + rng.uniform(0, 0.7, 5000), 0, 1)
+
+    metrics = StreamingMetrics()
+    for part in np.array_split(np.arange(5000), 7):
+        metrics.update(y[part], proba[part])
+    result = metrics.result()
+
+    y_pred = (proba >= 0.5).astype(int)
+    assert result['Test_Samples'] == 5000
+    assert result['Test_Accuracy'] == pytest.approx(accuracy_score(y, y_pred))
+    assert result['Test_Precision'] == pytest.approx(precision_score(y, y_pred))
+    assert result['Test_Recall'] == pytest.approx(recall_score(y, y_pred))
+    assert result['Test_F1'] == pytest.approx(f1_score(y, y_pred))
+    assert result['Test_Log_Loss'] == pytest.approx(log_loss(y, proba))
+    # ROC-AUC is computed from a 1000-bin score histogram
+    assert result['Test_ROC_AUC'] == pytest.approx(roc_auc_score(y, proba), abs=1e-3)
+
+
+def test_streaming_roc_auc_undefined_for_single_class():
+    metrics = StreamingMetrics()
+    metrics.update(np.ones(10), np.full(10, 0.7))
+    assert np.isnan(metrics.roc_auc())
+
+
+def test_fold_constant_matches_standard_scaler():
+    rng = np.random.default_rng(0)
+    X = rng.normal(50, 10, (1000, 3))
+    missing = rng.random(1000) < 0.2
+    masked = X.copy()
+    masked[missing, 1] = np.nan
+
+    scaler = StandardScaler()
+    for part in np.array_split(masked, 4):
+        scaler.partial_fit(part)
+    _fold_constant(scaler, 1, 42.0, int(missing.sum()))
+
+    filled = X.copy()
+    filled[missing, 1] = 42.0
+    reference = StandardScaler().fit(filled)
+    np.testing.assert_allclose(scaler.mean_, reference.mean_)
+    np.testing.assert_allclose(scaler.var_, reference.var_)
+
+
+def test_fold_constant_without_count_is_a_no_op():
+    scaler = StandardScaler().fit(np.arange(10, dtype=float).reshape(-1, 1))
+    mean, var = scaler.mean_.copy(), scaler.var_.copy()
+    _fold_constant(scaler, 0, 100.0, 0)
+    np.testing.assert_array_equal(scaler.mean_, mean)
+    np.testing.assert_array_equal(scaler.var_, var)
+
+
+def test_split_does_not_depend_on_chunking():
+    frame = make_frame(500)
+    whole = is_test_row(frame, DIABETES_FEATURES, 0.2)
+    chunked = np.concatenate([is_test_row(frame.iloc[i:i + 64], DIABETES_FEATURES, 0.2) for i in range(0, 500, 64)])
+    np.testing.assert_array_equal(whole, chunked)
+    assert 0.1 < whole.mean() < 0.3
+
+
+def test_reservoir_quantile_is_exact_below_capacity():
+    sketch = ReservoirSketch(size=1000)
+    values = np.arange(501, dtype=float)
+    sketch.update(values[:200])
+    sketch.update(values[200:])
+    assert sketch.quantile(0.5) == 250.0
+
+
+def test_trainer_scaler_matches_in_memory_preprocessing():
+    frame = make_frame()
+    trainer = OutOfCoreTrainer(chunks_of(frame, 256), test_size=0.2)
+    trainer.compute_statistics()
+
+    train = frame[~is_test_row(frame, DIABETES_FEATURES, 0.2)]
+    X = train[DIABETES_FEATURES].to_numpy(dtype=float)
+    for col_name, median in trainer.medians.items():
+        col = DIABETES_FEATURES.index(col_name)
+        nonzero = X[X[:, col] != 0, col]
+        assert median == pytest.approx(np.median(nonzero))
+        X[X[:, col] == 0, col] = median
+
+    reference = StandardScaler().fit(X)
+    np.testing.assert_allclose(trainer.scaler.mean_, reference.mean_)
+    np.testing.assert_allclose(trainer.scaler.var_, reference.var_)
+    assert trainer.counts['train'] == len(train)
+
+
+class CountingSource:
+    def __init__(self, frame, size):
+        self.source = chunks_of(frame, size)
+        self.passes = 0
+
+    def __call__(self):
+        self.passes += 1
+        return self.source()
+
+
+@pytest.mark.filterwarnings('error:X does not have valid feature names')
+def test_trainer_single_epoch_reads_source_twice():
+    frame = make_frame()
+    source = CountingSource(frame, 256)
+    trainer = OutOfCoreTrainer(source, test_size=0.2)
+    trainer.compute_statistics(sample_rows=100)
+    trainer.train()
+    results = trainer.evaluate()
+    assert source.passes == 2
+
+    n_test = int(is_test_row(frame, DIABETES_FEATURES, 0.2).sum())
+    assert trainer.counts['test'] == n_test
+    for metrics in results.values():
+        assert metrics['Test_Samples'] == n_test
+        assert metrics['Test_ROC_AUC'] > 0.7
+    assert trainer.serving_sample.shape == (100, len(DIABETES_FEATURES))
+
+
+def test_trainer_multi_epoch_evaluates_final_model():
+    frame = make_frame()
+    source = CountingSource(frame, 256)
+    trainer = OutOfCoreTrainer(source, test_size=0.2, epochs=2)
+    trainer.compute_statistics(sample_rows=10 * len(frame))
+    trainer.train()
+    results = trainer.evaluate()
+    assert source.passes == 4
+
+    test = frame[is_test_row(frame, DIABETES_FEATURES, 0.2)]
+    assert trainer.serving_sample.shape[0] == len(test)
+    for name, model in trainer.models.items():
+        proba = model.predict_proba(trainer.serving_sample)[:, 1]
+        assert results[name]['Test_ROC_AUC'] == pytest.approx(roc_auc_score(test['Outcome'], proba), abs=1e-2)
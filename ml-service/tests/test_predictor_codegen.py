@@ -0,0 +1,101 @@
+import types
+from functools import partial
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import ExtraTreesClassifier, GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import MinMaxScaler, PolynomialFeatures, RobustScaler, StandardScaler
+from sklearn.svm import SVC
+from sklearn.tree import DecisionTreeClassifier
+
+from model_config import DIABETES_FEATURES
+from predictor_codegen import generate_standalone_predictor, is_supported
+
+CASES = {
+    'logistic_standard': (StandardScaler, lambda: LogisticRegression()),
+    'logistic_minmax': (MinMaxScaler, lambda: LogisticRegression()),
+    'logistic_robust': (RobustScaler, lambda: LogisticRegression()),
+    'logistic_standard_no_mean': (partial(StandardScaler, with_mean=False), lambda: LogisticRegression()),
+    'logistic_standard_no_std': (partial(StandardScaler, with_std=False), lambda: LogisticRegression(max_iter=1000)),
+    'logistic_minmax_clip': (partial(MinMaxScaler, clip=True), lambda: LogisticRegression()),
+    'sgd': (StandardScaler, lambda: SGDClassifier(loss='log_loss', random_state=0)),
+    'poly_logistic': (StandardScaler, lambda: make_pipeline(
+        PolynomialFeatures(2, interaction_only=True, include_bias=False),
+        LogisticRegression(penalty='l1', solver='liblinear', C=0.5)
+    )),
+    'decision_tree': (StandardScaler, lambda: DecisionTreeClassifier(max_depth=6, random_state=0)),
+    'random_forest': (StandardScaler, lambda: RandomForestClassifier(20, max_depth=8, random_state=0)),
+    'extra_trees_unscaled': (None, lambda: ExtraTreesClassifier(10, max_depth=6, random_state=0)),
+    'gradient_boosting': (StandardScaler, lambda: GradientBoostingClassifier(n_estimators=30, random_state=0)),
+    'mlp': (StandardScaler, lambda: MLPClassifier((8, 4), activation='tanh', max_iter=300, random_state=0))
+}
+
+
+@pytest.fixture(scope='module')
+def data():
+    X, y = make_classification(600, len(DIABETES_FEATURES), random_state=0)
+    X = X * [1, 30, 10, 5, 50, 4, 0.3, 10] + [3, 120, 70, 20, 80, 32, 0.5, 33]
+    return X, y
+
+
+def load_generated(code, name):
+    module = types.ModuleType(name)
+    exec(compile(code, f'<{name}>', 'exec'), module.__dict__)
+    return module
+
+
+def fit_case(case, data):
+    X, y = data
+    scaler_cls, make_model = CASES[case]
+    scaler = scaler_cls().fit(X) if scaler_cls is not None else None
+    X_scaled = scaler.transform(X) if scaler is not None else X
+    return scaler, make_model().fit(X_scaled, y), X_scaled
+
+
+@pytest.mark.filterwarnings('ignore::sklearn.exceptions.ConvergenceWarning')
+@pytest.mark.parametrize('case', sorted(CASES))
+def test_generated_predictor_matches_fitted_model(case, data):
+    X, _ = data
+    scaler, model, X_scaled = fit_case(case, data)
+    assert is_supported(model, scaler)
+
+    module = load_generated(generate_standalone_predictor(model, scaler, DIABETES_FEATURES), case)
+    expected = model.predict_proba(X_scaled)[:, 1]
+    np.testing.assert_allclose(module.predict_proba_many(X.tolist()), expected, atol=1e-9)
+
+    # Rows outside the fitted range exercise MinMaxScaler(clip=True)
+    X_wide = X * 1.5
+    X_wide_scaled = scaler.transform(X_wide) if scaler is not None else X_wide
+    np.testing.assert_allclose(
+        module.predict_proba_many(X_wide.tolist()), model.predict_proba(X_wide_scaled)[:, 1], atol=1e-9
+    )
+
+    result = module.DiabetesPredictor().predict(dict(zip(DIABETES_FEATURES, X[0])))
+    assert result['prediction'] == int(model.predict(X_scaled[:1])[0])
+
+
+@pytest.mark.parametrize('layout', ['nested', 'flat'])
+def test_tree_layouts_agree(layout, data):
+    X, _ = data
+    scaler, model, X_scaled = fit_case('random_forest', data)
+    code = generate_standalone_predictor(model, scaler, DIABETES_FEATURES, tree_layout=layout)
+    module = load_generated(code, f'rf_{layout}')
+    np.testing.assert_allclose(module.predict_proba_many(X.tolist()), model.predict_proba(X_scaled)[:, 1], atol=1e-9)
+
+
+def test_rejects_unsupported_model(data):
+    X, y = data
+    model = SVC().fit(X, y)
+    assert not is_supported(model, None)
+    with pytest.raises(ValueError):
+        generate_standalone_predictor(model, None, DIABETES_FEATURES)
+
+
+def test_rejects_unknown_tree_layout(data):
+    scaler, model, _ = fit_case('decision_tree', data)
+    with pytest.raises(ValueError, match='tree_layout'):
+        generate_standalone_predictor(model, scaler, DIABETES_FEATURES, tree_layout='spiral')
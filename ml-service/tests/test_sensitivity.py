@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from sensitivity import SweepError, parse_axis, run_sweep
+
+FEATURES = ['Glucose', 'BMI', 'Age']
+RANGES = {'Glucose': (0, 300), 'BMI': (0, 70), 'Age': (1, 120)}
+BASE = np.array([[120.0, 30.0, 40.0]])
+
+
+def predict(matrix):
+    # Monotone in glucose so band transitions are predictable
+    return matrix[:, 0] / 300
+
+
+def risk_level(probability):
+    return 'Low' if probability < 0.3 else 'Medium' if probability < 0.6 else 'High'
+
+
+def test_parse_axis_defaults_to_feature_range():
+    feature, values = parse_axis({'feature': 'glucose', 'steps': 4}, FEATURES, RANGES, 50)
+    assert feature == 'Glucose'
+    np.testing.assert_allclose(values, [0, 100, 200, 300])
+
+
+def test_parse_axis_sorts_and_deduplicates_values():
+    _, values = parse_axis({'feature': 'bmi', 'values': [30, 20, 30]}, FEATURES, RANGES, 50)
+    np.testing.assert_array_equal(values, [20, 30])
+
+
+@pytest.mark.parametrize('spec', [
+    {'feature': 'bmi', 'min': -1, 'max': 30},
+    {'feature': 'bmi', 'values': [20, 80]},
+    {'feature': 'bmi', 'min': 30, 'max': 20},
+    {'feature': 'bmi', 'steps': 1},
+    {'feature': 'bmi', 'steps': 0},
+    {'feature': 'bmi', 'steps': 'many'},
+    {'feature': 'bmi', 'values': []},
+    {'feature': 'bmi', 'values': 'abc'},
+    {'feature': 'height'},
+    {'min': 1}
+])
+def test_parse_axis_rejects_invalid_specs(spec):
+    with pytest.raises(SweepError):
+        parse_axis(spec, FEATURES, RANGES, 50)
+
+
+def test_parse_axis_caps_steps_before_allocating():
+    with pytest.raises(SweepError, match='too many steps'):
+        parse_axis({'feature': 'bmi', 'steps': 1_000_000_000}, FEATURES, RANGES, 50, max_points=2500)
+
+
+def test_parse_axis_caps_value_list():
+    with pytest.raises(SweepError, match='too many values'):
+        parse_axis({'feature': 'bmi', 'values': list(range(71))}, FEATURES, RANGES, 50, max_points=70)
+
+
+def test_parse_axis_rejects_overflowing_steps():
+    with pytest.raises(SweepError):
+        parse_axis({'feature': 'bmi', 'steps': float('inf')}, FEATURES, RANGES, 50, max_points=2500)
+
+
+def test_run_sweep_one_feature():
+    result = run_sweep(BASE, [{'feature': 'glucose', 'values': [60, 150, 240]}],
+                       predict, risk_level, FEATURES, RANGES)
+    assert result['n_points'] == 3
+    assert result['base_probability'] == pytest.approx(0.4)
+    curve = result['curves'][0]
+    np.testing.assert_allclose(curve['probabilities'], [0.2, 0.5, 0.8])
+    assert curve['risk_levels'] == ['Low', 'Medium', 'High']
+    assert [t['to_level'] for t in curve['transitions']] == ['Medium', 'High']
+
+
+def test_run_sweep_two_features_gives_one_curve_per_outer_value():
+    result = run_sweep(BASE, [{'feature': 'glucose', 'steps': 5}, {'feature': 'age', 'values': [30, 60]}],
+                       predict, risk_level, FEATURES, RANGES)
+    assert result['n_points'] == 10
+    assert len(result['curves']) == 2
+    assert all(len(curve['probabilities']) == 5 for curve in result['curves'])
+
+
+def test_run_sweep_rejects_grid_above_max_points():
+    specs = [{'feature': 'glucose', 'steps': 60}, {'feature': 'age', 'steps': 60}]
+    with pytest.raises(SweepError, match='too large'):
+        run_sweep(BASE, specs, predict, risk_level, FEATURES, RANGES, max_points=2500)
+
+
+def test_run_sweep_rejects_repeated_feature():
+    specs = [{'feature': 'glucose', 'steps': 3}, {'feature': 'Glucose', 'steps': 3}]
+    with pytest.raises(SweepError, match='different'):
+        run_sweep(BASE, specs, predict, risk_level, FEATURES, RANGES)
@@ -0,0 +1,194 @@
+"""
+Flattened Tree Arrays for ML Service
+Converts fitted scikit-learn tree models into flat NumPy arrays that can be
+evaluated (and attributed) for a whole batch in one vectorized pass
+
+Supported models:
+    - DecisionTreeClassifier, RandomForestClassifier, ExtraTreesClassifier
+      (output = mean of per-tree P(diabetes))
+    - GradientBoostingClassifier, binary
+      (output = sigmoid(init + learning_rate * sum of leaf values))
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+MEAN_PROBA = 'mean_proba'
+ADDITIVE_LOGIT = 'additive_logit'
+
+# Array fields in the order they are stored/exported
+ARRAY_FIELDS = ('feature', 'threshold', 'left', 'right', 'value', 'roots')
+
+
+@dataclass
+class FlatTrees:
+    """
+    All trees of a model concatenated into shared node arrays
+
+    feature/threshold/left/right/value are indexed by global node id;
+    leaves have left == right == -1. roots holds the root node id per tree.
+    """
+    kind: str
+    feature: np.ndarray
+    threshold: np.ndarray
+    left: np.ndarray
+    right: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    max_depth: int
+    n_features: int
+    scale: float = 1.0   # learning rate for additive models
+    offset: float = 0.0  # initial raw score for additive models
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in ARRAY_FIELDS}
+
+    def params(self) -> Dict[str, float]:
+        return {
+            'kind': self.kind,
+            'max_depth': self.max_depth,
+            'n_features': self.n_features,
+            'scale': self.scale,
+            'offset': self.offset
+        }
+
+
+def is_supported(model) -> bool:
+    """Whether flatten_tree_model can handle this model"""
+    if isinstance(getattr(model, 'flat_trees', None), FlatTrees):
+        return True
+    name = type(model).__name__
+    if name in ('DecisionTreeClassifier', 'RandomForestClassifier', 'ExtraTreesClassifier'):
+        return len(getattr(model, 'classes_', [])) == 2
+    if name == 'GradientBoostingClassifier':
+        return getattr(model, 'n_trees_per_iteration_', model.estimators_.shape[1]) == 1
+    return False
+
+
+def _positive_class_value(tree) -> np.ndarray:
+    value = tree.value[:, 0, :]
+    return value[:, 1] / value.sum(axis=1)
+
+
+def flatten_tree_model(model) -> FlatTrees:
+    """
+    Flatten a fitted tree model
+
+    Args:
+        model: Supported scikit-learn tree model (see is_supported)
+
+    Returns:
+        FlatTrees with all nodes in contiguous arrays
+    """
+    if isinstance(getattr(model, 'flat_trees', None), FlatTrees):
+        return model.flat_trees
+
+    name = type(model).__name__
+    if not is_supported(model):
+        raise ValueError(f"Unsupported tree model: {name}")
+
+    if name == 'GradientBoostingClassifier':
+        trees = [estimator.tree_ for estimator in model.estimators_[:, 0]]
+        values = [tree.value[:, 0, 0] for tree in trees]
+        kind, scale = ADDITIVE_LOGIT, float(model.learning_rate)
+        if model.init_ == 'zero':
+            offset = 0.0
+        else:
+            prior = float(model.init_.class_prior_[1])
+            offset = float(np.log(prior / (1 - prior)))
+    else:
+        estimators = [model] if name == 'DecisionTreeClassifier' else model.estimators_
+        trees = [estimator.tree_ for estimator in estimators]
+        values = [_positive_class_value(tree) for tree in trees]
+        kind, scale, offset = MEAN_PROBA, 1.0, 0.0
+
+    sizes = np.array([tree.node_count for tree in trees])
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    def _shift(children, start):
+        return np.where(children >= 0, children + start, -1)
+
+    return FlatTrees(
+        kind=kind,
+        feature=np.concatenate([np.maximum(tree.feature, 0) for tree in trees]).astype(np.int32),
+        threshold=np.concatenate([tree.threshold for tree in trees]).astype(np.float64),
+        left=np.concatenate([_shift(tree.children_left, s) for tree, s in zip(trees, starts)]).astype(np.int32),
+        right=np.concatenate([_shift(tree.children_right, s) for tree, s in zip(trees, starts)]).astype(np.int32),
+        value=np.concatenate(values).astype(np.float64),
+        roots=starts.astype(np.int32),
+        max_depth=int(max(tree.max_depth for tree in trees)),
+        n_features=int(model.n_features_in_),
+        scale=scale,
+        offset=offset
+    )
+
+
+def _prepare(X: np.ndarray) -> np.ndarray:
+    # scikit-learn compares float32 features against the split thresholds
+    return np.ascontiguousarray(X, dtype=np.float32)
+
+
+def _descend(flat: FlatTrees, X: np.ndarray, node: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Move every (row, tree) position one level down (leaves stay put)"""
+    left = flat.left[node]
+    go_left = X[rows, flat.feature[node]] <= flat.threshold[node]
+    child = np.where(go_left, left, flat.right[node])
+    return np.where(left >= 0, child, node)
+
+
+def _finish(flat: FlatTrees, raw: np.ndarray) -> np.ndarray:
+    if flat.kind == ADDITIVE_LOGIT:
+        return 1 / (1 + np.exp(-(flat.offset + flat.scale * raw)))
+    return raw / len(flat.roots)
+
+
+def predict_proba(flat: FlatTrees, X: np.ndarray) -> np.ndarray:
+    """
+    P(diabetes) for a batch of (already scaled) rows
+
+    All trees are walked together: node holds one position per (row, tree),
+    so the cost is max_depth vectorized steps regardless of the tree count.
+
+    Args:
+        flat: Flattened model
+        X: Feature matrix, shape (n_rows, n_features)
+
+    Returns:
+        numpy array of probabilities, shape (n_rows,)
+    """
+    X = _prepare(X)
+    rows = np.arange(X.shape[0])[:, None]
+    node = np.repeat(flat.roots[None, :], X.shape[0], axis=0)
+    for _ in range(flat.max_depth):
+        node = _descend(flat, X, node, rows)
+    return _finish(flat, flat.value[node].sum(axis=1))
+
+
+def path_contributions(flat: FlatTrees, X: np.ndarray) -> Tuple[float, np.ndarray]:
+    """
+    Path-based (Saabas) attribution for a batch of rows
+
+    Every split on a row's decision path credits the change in node value to
+    the split feature, so base_value + contributions.sum(axis=1) equals the
+    model's raw output (mean probability for forests, log-odds for boosting).
+
+    Returns:
+        Tuple of (base_value, contributions of shape (n_rows, n_features))
+    """
+    X = _prepare(X)
+    n_rows = X.shape[0]
+    rows = np.arange(n_rows)[:, None]
+    contributions = np.zeros((n_rows, flat.n_features))
+    base = float(flat.value[flat.roots].sum())
+
+    node = np.repeat(flat.roots[None, :], n_rows, axis=0)
+    row_index = np.broadcast_to(rows, node.shape)
+    for _ in range(flat.max_depth):
+        child = _descend(flat, X, node, rows)
+        np.add.at(contributions, (row_index, flat.feature[node]), flat.value[child] - flat.value[node])
+        node = child
+
+    if flat.kind == ADDITIVE_LOGIT:
+        return flat.offset + flat.scale * base, contributions * flat.scale
+    return base / len(flat.roots), contributions / len(flat.roots)
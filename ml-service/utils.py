@@ -93,6 +93,40 @@ def validate_request_data(data: Dict[str, Any], required_fields: list) -> tuple[
     return True, ""
 
 
+def validate_feature_matrix(
+    features: np.ndarray,
+    feature_names: list,
+    feature_ranges: Dict[str, tuple]
+) -> tuple[bool, str]:
+    """
+    Validate a raw feature matrix against the configured feature ranges
+    
+    Args:
+        features: Array of shape (n_rows, n_features) in feature_names order
+        feature_names: Ordered list of feature names
+        feature_ranges: Mapping of feature name to (min, max)
+        
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if not np.isfinite(features).all():
+        return False, "Features must be finite numbers"
+    
+    lower = np.array([feature_ranges[name][0] for name in feature_names], dtype=np.float64)
+    upper = np.array([feature_ranges[name][1] for name in feature_names], dtype=np.float64)
+    
+    out_of_range = (features < lower) | (features > upper)
+    if out_of_range.any():
+        row, col = np.argwhere(out_of_range)[0]
+        name = feature_names[col]
+        return False, (
+            f"Row {row}: {name} value {features[row, col]} is out of range "
+            f"[{feature_ranges[name][0]}, {feature_ranges[name][1]}]"
+        )
+    
+    return True, ""
+
+
 def safe_float_conversion(value: Any, field_name: str = "value") -> Union[float, None]:
     """
     Safely convert value to float
@@ -156,6 +190,32 @@ def _calculate_risk_level(probability: float) -> str:
         return 'Very High'
 
 
+def strip_feature_names(estimator):
+    """
+    Drop fitted feature names from an estimator and its nested steps
+    
+    Artifacts trained on DataFrames record ``feature_names_in_`` and sklearn
+    warns on every call that passes a plain array. The service always feeds
+    arrays in FEATURE_ORDER, so the names are removed once at load time.
+    
+    Args:
+        estimator: Fitted sklearn estimator, pipeline or ensemble
+        
+    Returns:
+        The same estimator, modified in place
+    """
+    pending = [estimator]
+    while pending:
+        current = pending.pop()
+        if 'feature_names_in_' in getattr(current, '__dict__', {}):
+            del current.feature_names_in_
+        pending.extend(step for _, step in getattr(current, 'steps', []))
+        nested = getattr(current, 'estimators_', None)
+        if isinstance(nested, list):
+            pending.extend(nested)
+    return estimator
+
+
 def log_prediction_request(features: Dict[str, float], ip_address: str = None):
     """
     Log prediction request for monitoring
@@ -164,7 +224,8 @@ def log_prediction_request(features: Dict[str, float], ip_address: str = None):
         features: Input features
         ip_address: Client IP address
     """
-    logger.info(
-        f"Prediction request from {ip_address or 'unknown'} - "
-        f"Glucose: {features.get('Glucose')}, BMI: {features.get('BMI')}, Age: {features.get('Age')}"
+    # Lazy %-formatting: no string work unless debug logging is enabled
+    logger.debug(
+        "Prediction request from %s - Glucose: %s, BMI: %s, Age: %s",
+        ip_address or 'unknown', features.get('Glucose'), features.get('BMI'), features.get('Age')
     )